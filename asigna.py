@@ -1,10 +1,86 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import norm
+
+from graficas import (
+    grafica_demandas, grafica_densidades, grafica_desbordamiento, grafica_ingreso, grafica_optimo_correlacion,
+    grafica_riesgo,
+)
+from modelo import bootstrap_compartido, costo_desplazamiento, emsr_b_ascenso, niveles_proteccion
+from correlacion import ingreso_correlacionado, matriz_correlacion, optimo_por_correlacion
+from ejemplos import rellenar
+from escenarios import BIBLIOTECA, comparar
+from exportar import FORMATOS, archivo_temporal, bloques_curva_ingreso, bloques_protecciones
+from perfilador import fase, fragmento, instrumentar, panel
+from precalentar import en_segundo_plano
+from riesgo import distribucion_ingreso, optimo_ajustado
+import sesion
+from simulador import (
+    comparar_ascenso, presupuesto_eventos, simular_politica, tabla_limites, ventanas_intercaladas, ventanas_secuenciales,
+)
+import trabajos
 
 st.logo("imagenes/El alma máter de Cancún-07.png", size="large")
 
+
+# Máximo de coincidencias que se ofrecen en el selector de escenarios
+OPCIONES_BIBLIOTECA = 200
+# Máximo de escenarios en la tabla de «Comparar todos»
+COMPARAR_BIBLIOTECA = 1000
+REPLICAS_SIMULACION = 2000
+# La simulación de llegadas de la exploración recorre cada solicitud: con C grande la
+# demanda crece con C, así que las réplicas y el lote se ajustan a un tope de eventos
+EVENTOS_SIMULACION = 4_000_000
+EVENTOS_LOTE = 500_000
+REPLICAS_MINIMAS = 20
+
+
+# Los widgets de los parámetros compartidos tienen una clave fija, así que conservan su
+# identidad aunque cambie el valor. Antes de dibujarlos se les copia el valor guardado en
+# sesion.py (el widget de otra página pudo cambiarlo) y cada cambio se guarda en on_change.
+def capacidad_total():
+    minimo, maximo, _ = sesion.CAPACIDAD
+    st.session_state["control_C"] = sesion.capacidad()
+    st.sidebar.number_input("Capacidad total (C)", min_value=minimo, max_value=maximo, step=10, key="control_C",
+                            on_change=lambda: sesion.cambiar_capacidad(st.session_state["control_C"]))
+    return int(sesion.capacidad())
+
+
+def parametro(widget, etiqueta, nombre, C):
+    # El valor se guarda fuera del widget (sesion.py): todas las páginas comparten el mismo
+    minimo, maximo, _ = sesion.rango(nombre, C)
+    clave = f"control_{nombre}"
+    st.session_state[clave] = sesion.valor(nombre, C)
+    return widget(etiqueta, minimo, maximo, key=clave,
+                  on_change=lambda: sesion.guardar(nombre, st.session_state[clave]))
+
+
+def backend_graficas():
+    # La elección se guarda fuera del widget para conservarla al cambiar de página
+    interactivas = st.sidebar.toggle(
+        "Gráficas interactivas (Vega-Lite)",
+        value=st.session_state.get("graficas_interactivas", False),
+        help="Dibuja las gráficas en el navegador: el zoom y el hover no recalculan la página.",
+    )
+    st.session_state["graficas_interactivas"] = interactivas
+    return "vega-lite" if interactivas else "matplotlib"
+
+
+def mostrar_grafica(grafica, backend):
+    if backend == "vega-lite":
+        with fase("st.vega_lite_chart"):
+            st.vega_lite_chart(grafica, width="stretch")
+    else:
+        with fase("st.pyplot"):
+            st.pyplot(grafica)
+
+def boton_exportar(etiqueta, archivo, bloques, clave):
+    # `bloques` es una función sin argumentos: el archivo se genera por bloques al hacer clic
+    formato = st.radio("Formato", list(FORMATOS), horizontal=True, key=f"formato_{clave}",
+                       help="CSV para hojas de cálculo; Parquet (columnar, comprimido) para análisis.")
+    mime, extension = FORMATOS[formato]
+    st.download_button(etiqueta, lambda: archivo_temporal(bloques(), formato),
+                       file_name=archivo + extension, mime=mime, key=f"descargar_{clave}")
+
 def intro():
 
     col1, col2, col3 = st.columns([2,2,2])
@@ -159,47 +235,33 @@ Los valores de $ \mu $ y $ \sigma $ para cada clase representan el comportamient
 """
     )
 
-    # Panel lateral para modificar parámetros
-    st.sidebar.header("📊 Parámetros de demanda")
-    mu_A = st.sidebar.slider("Media Clase A (μ_A)", 5, 80, 25)
-    sigma_A = st.sidebar.slider("Desviación estándar Clase A (σ_A)", 1, 30, 8)
-    mu_B = st.sidebar.slider("Media Clase B (μ_B)", 5, 150, 60)
-    sigma_B = st.sidebar.slider("Desviación estándar Clase B (σ_B)", 1, 30, 8)
-
-    # Parámetros fijos para la gráfica
-    C = 100
-    x_b = np.linspace(0, C, 1000)
-    pdf_B = norm.pdf(x_b, mu_B, sigma_B)
-
-    x_y = C - x_b
-    pdf_A = norm.pdf(x_y, mu_A, sigma_A)
-    x_A = C - x_y
-
-    # Crear gráfica
-    fig, ax1 = plt.subplots(figsize=(10, 5))
-    ax1.plot(x_b, pdf_B, label="Demanda Clase B", color='steelblue')
-    ax1.plot(x_A, pdf_A, label="Demanda Clase A", color='darkred')
-
-    # Anotar medias
-    ax1.axvline(mu_B, color='steelblue', linestyle='--', linewidth=1)
-    ax1.text(mu_B + 1, norm.pdf(mu_B, mu_B, sigma_B) + 0.001, r"$\mu_B$", color='steelblue')
-
-    b_mu_A = C - mu_A
-    ax1.axvline(b_mu_A, color='darkred', linestyle='--', linewidth=1)
-    ax1.text(b_mu_A - 8, norm.pdf(mu_A, mu_A, sigma_A) + 0.001, r"$\mu_A$", color='darkred')
-
-    # Ejes
-    ax2 = ax1.twiny()
-    ax2.set_xlim(ax1.get_xlim()[::-1])
-    #ax2.set_xlabel("Nivel de protección para clase A ($y$)")
-
-    #ax1.set_xlabel("Límite de reserva para clase B ($b$)")
-    ax1.set_ylabel("Densidad de probabilidad")
-    ax1.set_title("Distribuciones de demanda por segmento")
-    ax1.legend()
-    ax1.grid(True, linestyle='--', alpha=0.5)
-
-    st.pyplot(fig)
+    # Barra lateral: solo lo que afecta a toda la página
+    with fase("lectura de parámetros"):
+        C = capacidad_total()
+        backend = backend_graficas()
+
+    # Mover un slider vuelve a ejecutar solo este fragmento, no el texto de la lección
+    @fragmento
+    def region_interactiva():
+        with fase("lectura de parámetros"):
+            st.markdown("#### 📊 Parámetros de demanda")
+            col_A, col_B = st.columns(2)
+            parametro(col_A.slider, "Media Clase A (μ_A)", "mu_A", C)
+            parametro(col_A.slider, "Desviación estándar Clase A (σ_A)", "sigma_A", C)
+            parametro(col_B.slider, "Media Clase B (μ_B)", "mu_B", C)
+            parametro(col_B.slider, "Desviación estándar Clase B (σ_B)", "sigma_B", C)
+
+        # Malla adaptativa: densa cerca de las medias, dispersa en las colas
+        with fase("cálculo de curvas"):
+            e = sesion.escenario_sesion(C)
+            x_b, pdf_B, pdf_A = e.x_b, e.pdf_B, e.pdf_A
+
+        # Crear gráfica
+        with fase("construcción de figura"):
+            grafica = grafica_demandas(C, x_b, pdf_B, pdf_A, e.mu_A, e.sigma_A, e.mu_B, e.sigma_B, backend=backend)
+        mostrar_grafica(grafica, backend)
+
+    region_interactiva()
 
     st.markdown(
         """ 
@@ -298,56 +360,36 @@ Ambas distribuciones se grafican en el mismo eje horizontal, pero orientadas de
     )
     
     # Parámetros generales
-    st.sidebar.header("🎛 Parámetros del modelo")
-    #C = st.sidebar.slider("Capacidad total (C)", min_value=20, max_value=200, value=100, step=5)
-    C = 100
-    b = st.sidebar.slider("Límite de reserva para clase B (b)", min_value=0, max_value=C, value=int(C * 0.65))
-    y = C - b
-    st.sidebar.markdown(f"**Nivel de protección para clase A (y):** `{y}`")
-
-    # Parámetros de demanda
-    st.sidebar.subheader("📊 Parámetros de demanda")
-    mu_A = st.sidebar.slider("Demanda media (Clase A)", 5, 80, 25)
-    sigma_A = st.sidebar.slider("Desviación estándar (Clase A)", 1, 30, 8)
-    mu_B = st.sidebar.slider("Demanda media (Clase B)", 5, 150, 60)
-    sigma_B = st.sidebar.slider("Desviación estándar (Clase B)", 1, 30, 8)
-
-    # Dominio para b (izquierda a derecha)
-    x_b = np.linspace(0, C, 1000)
-    pdf_B = norm.pdf(x_b, mu_B, sigma_B)
-
-    # Dominio para y (de derecha a izquierda), reflejado sobre eje de b
-    x_y = C - x_b
-    pdf_A = norm.pdf(x_y, mu_A, sigma_A)
-    x_A = C - x_y  # para graficar contra eje de b
-
-    # Gráfica
-    fig, ax1 = plt.subplots(figsize=(10, 5))
-
-    # Curvas de densidad
-    ax1.plot(x_b, pdf_B, label="Demanda Clase B", color='steelblue')
-    ax1.plot(x_A, pdf_A, label="Demanda Clase A", color='darkred')
-
-    # Sombrear colas relevantes
-    ax1.fill_between(x_b, 0, pdf_B, where=(x_b >= b), color='steelblue', alpha=0.3)
-    ax1.fill_between(x_A, 0, pdf_A, where=(x_A <= b), color='darkred', alpha=0.3)
-
-    # Línea de umbral
-    ax1.axvline(b, linestyle='--', color='gray', label=f"Límite b = {b}")
-
-    # Eje superior invertido para y
-    ax2 = ax1.twiny()
-    ax2.set_xlim(ax1.get_xlim()[::-1])
-    ax2.set_xlabel("Nivel de protección para clase A ($y$)")
-
-    # Eje inferior
-    ax1.set_xlabel("Límite de reserva para clase B ($b$)")
-    ax1.set_ylabel("Densidad de probabilidad")
-    ax1.set_title("Distribuciones de probabilidad y áreas correspondientes a $P(D > b)$ y $P(D > y)$")
-    ax1.legend()
-    ax1.grid(True, linestyle='--', alpha=0.5)
-
-    st.pyplot(fig)
+    with fase("lectura de parámetros"):
+        C = capacidad_total()
+        backend = backend_graficas()
+
+    @fragmento
+    def region_interactiva():
+        with fase("lectura de parámetros"):
+            st.markdown("#### 🎛 Parámetros del modelo")
+            b = parametro(st.slider, "Límite de reserva para clase B (b)", "b", C)
+            y = C - b
+            st.markdown(f"**Nivel de protección para clase A (y):** `{y}`")
+
+            # Parámetros de demanda
+            col_A, col_B = st.columns(2)
+            parametro(col_A.slider, "Demanda media (Clase A)", "mu_A", C)
+            parametro(col_A.slider, "Desviación estándar (Clase A)", "sigma_A", C)
+            parametro(col_B.slider, "Demanda media (Clase B)", "mu_B", C)
+            parametro(col_B.slider, "Desviación estándar (Clase B)", "sigma_B", C)
+
+        with fase("cálculo de curvas"):
+            # Dominio para b (izquierda a derecha), denso cerca de las medias y de b; el de
+            # y = C - b (de derecha a izquierda) va reflejado sobre el mismo eje
+            e = sesion.escenario_sesion(C)
+
+        # Gráfica
+        with fase("construcción de figura"):
+            grafica = grafica_densidades(C, b, e.x_b, e.pdf_B, e.pdf_A, backend=backend)
+        mostrar_grafica(grafica, backend)
+
+    region_interactiva()
 
     st.markdown(
         """
@@ -438,52 +480,35 @@ Puedes mover el límite de reserva $ b $, ajustar las características de la dem
     """)
 
     # Parámetros interactivos
-    st.sidebar.header("🎚 Parámetros")
-    #C = st.sidebar.slider("Capacidad total (C)", 20, 200, 100, step=5)
-    C = 100
-    b = st.sidebar.slider("Límite de reserva para clase B (b)", 0, C, int(C * 0.65))
-    y = C - b
-    st.sidebar.markdown(f"**Nivel de protección para clase A (y):** `{y}`")
-
-    mu_A = st.sidebar.slider("Media Clase A (μ_A)", 5, 80, 25)
-    sigma_A = st.sidebar.slider("Desviación estándar Clase A (σ_A)", 1, 30, 8)
-
-    mu_B = st.sidebar.slider("Media Clase B (μ_B)", 5, 150, 60)
-    sigma_B = st.sidebar.slider("Desviación estándar Clase B (σ_B)", 1, 30, 8)
+    with fase("lectura de parámetros"):
+        C = capacidad_total()
+        backend = backend_graficas()
 
-    # Dominio
-    x_b = np.linspace(0, C, 1000)
-    fb = 1 - norm.cdf(x_b, mu_B, sigma_B)  # P(D_B > b)
-    fa = 1 - norm.cdf(C - x_b, mu_A, sigma_A)  # P(D_A > y)
+    @fragmento
+    def region_interactiva():
+        with fase("lectura de parámetros"):
+            st.markdown("#### 🎚 Parámetros")
+            b = parametro(st.slider, "Límite de reserva para clase B (b)", "b", C)
+            y = C - b
+            st.markdown(f"**Nivel de protección para clase A (y):** `{y}`")
 
-    prob_b = 1 - norm.cdf(b, mu_B, sigma_B)
-    prob_a = 1 - norm.cdf(y, mu_A, sigma_A)
+            col_A, col_B = st.columns(2)
+            parametro(col_A.slider, "Media Clase A (μ_A)", "mu_A", C)
+            parametro(col_A.slider, "Desviación estándar Clase A (σ_A)", "sigma_A", C)
 
-    # Gráfica
-    fig, ax1 = plt.subplots(figsize=(10, 5))
-    ax1.plot(x_b, fb, label=r"$P(D_B > b)$", color='steelblue')
-    ax1.plot(x_b, fa, label=r"$P(D_A > y)$", color='darkred')
+            parametro(col_B.slider, "Media Clase B (μ_B)", "mu_B", C)
+            parametro(col_B.slider, "Desviación estándar Clase B (σ_B)", "sigma_B", C)
 
-    ax1.axvline(b, linestyle='--', color='gray')
-    ax1.plot(b, prob_b, 'o', color='steelblue')
-    ax1.plot(b, prob_a, 'o', color='darkred')
+        # P(D_B > b) y P(D_A > y) en la malla y en el b actual
+        with fase("cálculo de curvas"):
+            e = sesion.escenario_sesion(C)
 
-    ax1.text(b + 1, prob_b + 0.02, f"$P(D_B>{b})={prob_b:.2f}$", color='steelblue')
-    ax1.text(b - 35, prob_a + 0.02, f"$P(D_A>{y})={prob_a:.2f}$", color='darkred')
+        # Gráfica
+        with fase("construcción de figura"):
+            grafica = grafica_desbordamiento(C, b, e.x_b, e.sf_B, e.sf_A, e.prob_B, e.prob_A, backend=backend)
+        mostrar_grafica(grafica, backend)
 
-    # Eje superior para y
-    ax2 = ax1.twiny()
-    ax2.set_xlim(ax1.get_xlim()[::-1])
-    ax2.set_xlabel("Nivel de protección para clase A ($y$)")
-
-    # Estética
-    ax1.set_xlabel("Límite de reserva para clase B ($b$)")
-    ax1.set_ylabel("Probabilidad de desbordamiento")
-    ax1.set_title(f"Probabilidades de desbordamiento para $b = {b}$ y $y = {y}$")
-    ax1.grid(True, linestyle='--', alpha=0.5)
-    ax1.legend()
-
-    st.pyplot(fig)
+    region_interactiva()
 
     st.markdown(
         """
@@ -549,71 +574,152 @@ Puedes modificar:
 
     """)
 
-    # Capacidad total
-    C = 100
-
-    # Parámetros en barra lateral
-    st.sidebar.markdown("## Parámetros de control")
-    b = st.sidebar.slider("Límite de reserva para clase B (b)", 0, C, 60)
-    y = C - b
-    st.sidebar.markdown(f"**Nivel de protección para clase A (y):** `{y}`")
-
-    st.sidebar.markdown("### Clase A (último momento)")
-    mu_A = st.sidebar.slider("Media demanda clase A (μ_A)", 5, 80, 40)
-    sigma_A = st.sidebar.slider("Desviación estándar clase A (σ_A)", 1, 30, 8)
-    p_A = st.sidebar.number_input("Precio clase A (p_A)", 1.0, 100.0, 5.0)
-
-    st.sidebar.markdown("### Clase B (anticipada)")
-    mu_B = st.sidebar.slider("Media demanda clase B (μ_B)", 5, 150, 60)
-    sigma_B = st.sidebar.slider("Desviación estándar clase B (σ_B)", 1, 30, 8)
-    p_B = st.sidebar.number_input("Precio clase B (p_B)", 1.0, 100.0, 2.0)
-
-    # ----------- Gráfica 1: Probabilidades de desbordamiento -----------
-    x_vals = np.linspace(0, C, 1000)
-    prob_B = 1 - norm.cdf(x_vals, mu_B, sigma_B)
-    prob_A = 1 - norm.cdf(C - x_vals, mu_A, sigma_A)
-
-    fig1, ax1 = plt.subplots(figsize=(10, 4))
-    ax1.plot(x_vals, prob_B, label=r"$P(D_B > b)$", color='steelblue')
-    ax1.plot(x_vals, prob_A, label=r"$P(D_A > y)$", color='darkred')
-    ax1.axvline(b, linestyle='--', color='gray')
-    ax1.plot(b, 1 - norm.cdf(b, mu_B, sigma_B), 'o', color='steelblue')
-    ax1.plot(b, 1 - norm.cdf(y, mu_A, sigma_A), 'o', color='darkred')
-    ax2 = ax1.twiny()
-    ax2.set_xlim(ax1.get_xlim()[::-1])
-    ax2.set_xlabel("Nivel de protección para clase A ($y$)")
-    ax1.set_xlabel("Límite de reserva para clase B ($b$)")
-    ax1.set_ylabel("Probabilidad de desbordamiento")
-    ax1.set_title("Probabilidades de desbordamiento para cada clase")
-    ax1.legend()
-    ax1.grid(True, linestyle='--', alpha=0.5)
-
-    st.pyplot(fig1)
-
-    # ----------- Gráfica 2: Ingreso incremental acumulado -----------
-    b_vals = np.arange(0, C + 1)
-    ingresos = [p_A * (C * norm.cdf((C - mu_A) / sigma_A))]
-
-    for b_iter in b_vals[1:]:
-        y_iter = C - b_iter
-        delta = (
-            p_B * (1 - norm.cdf(b_iter, mu_B, sigma_B)) * norm.cdf(y_iter, mu_A, sigma_A) +
-            (p_B - p_A) * (1 - norm.cdf(b_iter, mu_B, sigma_B)) * (1 - norm.cdf(y_iter, mu_A, sigma_A))
-        )
-        ingresos.append(ingresos[-1] + delta)
-
-    ingreso_actual = ingresos[b]
-
-    fig2, ax = plt.subplots(figsize=(10, 4))
-    ax.plot(b_vals, ingresos, label="Ingreso esperado", color='mediumblue')
-    ax.axvline(b, linestyle='--', color='gray', label=f"b = {b}")
-    ax.plot(b, ingreso_actual, 'o', color='mediumblue')
-    ax.set_xlabel("Límite de reserva para clase B ($b$)")
-    ax.set_ylabel("Ingreso esperado")
-    ax.set_title("Ingreso esperado en función de $b$")
-    ax.grid(True, linestyle='--', alpha=0.5)
-    ax.legend()
-    st.pyplot(fig2)   
+    # Barra lateral: solo lo que afecta a toda la página
+    with fase("lectura de parámetros"):
+        C = capacidad_total()
+        backend = backend_graficas()
+
+    # Los sliders viven dentro del fragmento: moverlos solo recalcula y reenvía las gráficas
+    @fragmento
+    def region_interactiva():
+        with fase("lectura de parámetros"):
+            st.markdown("#### Parámetros de control")
+            b = parametro(st.slider, "Límite de reserva para clase B (b)", "b", C)
+            y = C - b
+            st.markdown(f"**Nivel de protección para clase A (y):** `{y}`")
+
+            col_A, col_B = st.columns(2)
+            col_A.markdown("**Clase A (último momento)**")
+            mu_A = parametro(col_A.slider, "Media demanda clase A (μ_A)", "mu_A", C)
+            sigma_A = parametro(col_A.slider, "Desviación estándar clase A (σ_A)", "sigma_A", C)
+            p_A = parametro(col_A.number_input, "Precio clase A (p_A)", "p_A", C)
+
+            col_B.markdown("**Clase B (anticipada)**")
+            mu_B = parametro(col_B.slider, "Media demanda clase B (μ_B)", "mu_B", C)
+            sigma_B = parametro(col_B.slider, "Desviación estándar clase B (σ_B)", "sigma_B", C)
+            p_B = parametro(col_B.number_input, "Precio clase B (p_B)", "p_B", C)
+            e = sesion.escenario_sesion(C)
+
+        # ----------- Gráfica 1: Probabilidades de desbordamiento -----------
+        with fase("construcción de figura"):
+            grafica = grafica_desbordamiento(C, b, e.x_b, e.sf_B, e.sf_A, e.prob_B, e.prob_A,
+                                             detalle=False, backend=backend)
+        mostrar_grafica(grafica, backend)
+
+        # ----------- Gráfica 2: Ingreso incremental acumulado -----------
+        with fase("cálculo de curvas"):
+            # Suma acumulada de los incrementos marginales, en una malla entera adaptativa
+            b_vals, ingresos, ingreso_actual = e.b_vals, e.ingresos, e.ingreso_actual
+
+        with fase("construcción de figura"):
+            grafica = grafica_ingreso(C, b, b_vals, ingresos, ingreso_actual, backend=backend)
+        mostrar_grafica(grafica, backend)
+
+        # Con C = 100 y la tabla construida (python -m tablas) la respuesta es una consulta por índice
+        if st.toggle("🎯 Mostrar el b óptimo", key="mostrar_optimo"):
+            with fase("cálculo de curvas"):
+                r = e.optimo
+            col_b, col_actual, col_optimo = st.columns(3)
+            col_b.metric("b óptimo", r["b_optimo"], r["b_optimo"] - b)
+            col_actual.metric("Ingreso esperado con tu b", f"{r['ingreso']:.2f}")
+            col_optimo.metric("Ingreso esperado óptimo", f"{r['ingreso_optimo']:.2f}",
+                              f"{r['ingreso_optimo'] - r['ingreso']:.2f}")
+
+        with st.expander("📥 Exportar la curva completa (b = 0, …, C)"):
+            boton_exportar(
+                "Descargar curva de ingreso", f"curva_ingreso_C{C}",
+                lambda: bloques_curva_ingreso(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B), "curva_ingreso",
+            )
+
+        # El modelo supone que toda la demanda B llega antes que la A; en la práctica se mezclan
+        if st.toggle("🎲 Simular llegadas con el límite b actual", key="simular_llegadas"):
+            with fase("simulación"):
+                politica = tabla_limites([y], C)
+                mu = [mu_A, mu_B]
+                replicas = presupuesto_eventos(mu, EVENTOS_SIMULACION, REPLICAS_SIMULACION, REPLICAS_MINIMAS)
+                lote = presupuesto_eventos(mu, EVENTOS_LOTE, 1000)
+                filas = {}
+                for etiqueta, ventanas in (("B antes que A (supuesto del modelo)", ventanas_secuenciales(2)),
+                                           ("A y B intercaladas", ventanas_intercaladas(2))):
+                    r = simular_politica(politica, [p_A, p_B], mu, [sigma_A, sigma_B], ventanas,
+                                         replicas=replicas, semilla=0, lote=lote)
+                    filas[etiqueta] = r
+            st.table({
+                "Orden de llegada": list(filas),
+                "Ingreso promedio": [f"{r['ingreso'].mean():.1f}" for r in filas.values()],
+                "Ingreso (percentil 5)": [f"{np.percentile(r['ingreso'], 5):.1f}" for r in filas.values()],
+                "Clase A rechazada": [f"{r['rechazados'][:, 0].mean():.1f}" for r in filas.values()],
+                "Clase B rechazada": [f"{r['rechazados'][:, 1].mean():.1f}" for r in filas.values()],
+            })
+            st.caption(f"{replicas:,} réplicas; llegadas de Poisson con la media y la varianza "
+                       "de cada clase. La clase B se acepta mientras queden más de y lugares.")
+
+        # El valor esperado no dice cuánto puede variar el ingreso de un vuelo a otro
+        if st.toggle("📊 Riesgo del ingreso", key="riesgo_ingreso"):
+            aversion = st.slider("Aversión al riesgo (peso del CVaR frente a la media)", 0.0, 1.0, 0.5,
+                                 key="aversion_riesgo")
+            with fase("cálculo de curvas"):
+                d = distribucion_ingreso(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B)
+                i_opt = optimo_ajustado(d, aversion)
+                i_b = int(round(b / d["b"][1]))  # d["b"] va en pasos de C / puntos
+            with fase("construcción de figura"):
+                grafica = grafica_riesgo(C, b, d, d["b"][i_opt], backend=backend)
+            mostrar_grafica(grafica, backend)
+            st.table({
+                "": [f"b = {b}", f"b ajustado = {d['b'][i_opt]:.0f}"],
+                "Ingreso medio por vuelo": [f"{d['media'][i]:.1f}" for i in (i_b, i_opt)],
+                "Desviación estándar": [f"{d['desviacion'][i]:.1f}" for i in (i_b, i_opt)],
+                "Percentil 5": [f"{d['cuantil'][i]:.1f}" for i in (i_b, i_opt)],
+                "CVaR 5%": [f"{d['cvar'][i]:.1f}" for i in (i_b, i_opt)],
+            })
+            st.caption("Ingreso de un vuelo = p_B · min(D_B, b) + p_A · min(D_A, C − ventas de B), integrado "
+                       "sobre las dos demandas. El CVaR 5% es el ingreso promedio del 5% de los peores vuelos; el "
+                       "b ajustado maximiza (1 − aversión) · media + aversión · CVaR. No es la misma escala que la "
+                       "curva de ingreso de arriba: esa curva acumula los incrementos marginales a partir de una "
+                       "base fija, p_A · C · Φ((C − μ_A) / σ_A), así que solo sus diferencias entre dos valores de "
+                       "b se comparan con las de esta columna.")
+
+        # El modelo supone D_A y D_B independientes; el clima o un evento las mueven juntas
+        if st.toggle("🌦️ Demanda correlacionada", key="demanda_correlacionada"):
+            rho = st.slider("Correlación entre D_A y D_B (ρ)", -0.8, 0.8, 0.5, step=0.1, key="rho_demanda")
+            with fase("cálculo de curvas"):
+                rhos = np.round(np.linspace(-0.8, 0.8, 17), 1)
+                optimos, maximos = optimo_por_correlacion(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B, rhos)
+                i_rho = int(np.argmin(np.abs(rhos - rho)))
+                b_malla, ingreso_rho = ingreso_correlacionado(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B,
+                                                              float(rhos[i_rho]))
+                _, ingreso_indep = ingreso_correlacionado(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B, 0.0)
+                i_b = int(np.argmin(np.abs(b_malla - b)))
+            with fase("construcción de figura"):
+                grafica = grafica_optimo_correlacion(rhos, optimos, rhos[i_rho], optimos[i_rho], backend=backend)
+            mostrar_grafica(grafica, backend)
+            st.table({
+                "Demanda": ["Independiente (ρ = 0)", f"Correlacionada (ρ = {rhos[i_rho]:.1f})"],
+                "b óptimo": [f"{optimos[rhos == 0][0]:.0f}", f"{optimos[i_rho]:.0f}"],
+                "Ingreso máximo": [f"{maximos[rhos == 0][0]:.1f}", f"{maximos[i_rho]:.1f}"],
+                f"Ingreso con b = {b}": [f"{ingreso_indep[i_b]:.1f}", f"{ingreso_rho[i_b]:.1f}"],
+            })
+            st.caption("Ingreso esperado p_B · min(D_B, b) + p_A · min(D_A, C − ventas de B) con (D_A, D_B) normal "
+                       "bivariada, integrado con cuasi-Monte Carlo (secuencia de Sobol, 16 384 puntos).")
+
+        # Un grupo se lleva k lugares antes de que llegue la demanda individual
+        if st.toggle("👥 Cotizar un grupo", key="cotizar_grupo"):
+            col_k, col_precio = st.columns(2)
+            k = col_k.number_input("Tamaño del grupo (k)", 1, C, min(10, C), key="tamano_grupo")
+            precio = col_precio.number_input("Precio ofrecido por persona", 0.0, 100.0, p_B, key="precio_grupo")
+            with fase("cálculo de curvas"):
+                # Una sola vez por salida (C, demanda, precios); cada cotización es una consulta
+                costo = costo_desplazamiento([mu_A, mu_B], [sigma_A, sigma_B], [p_A, p_B], C)[k]
+            col_k.metric("Costo de desplazamiento", f"{costo:.2f}")
+            col_precio.metric("Precio mínimo por persona", f"{costo / k:.2f}")
+            if precio * k >= costo:
+                st.success(f"Conviene aceptar: el grupo paga {precio * k:.2f} y desplaza {costo:.2f} de ingreso esperado.")
+            else:
+                st.warning(f"No conviene: el grupo paga {precio * k:.2f} pero desplaza {costo:.2f} de ingreso esperado.")
+            st.caption("Costo de desplazamiento: ingreso esperado con C lugares menos el ingreso esperado "
+                       "con C − k, ambos con los niveles de protección óptimos.")
+
+    region_interactiva()
     
 
     st.markdown(
@@ -876,8 +982,8 @@ def pagina_ejemplo_resuelto_estatico():
     st.set_page_config(page_title="Ejemplo resuelto", layout="centered")
     st.title("Ejemplo resuelto: ¿Cuántos asientos debo reservar para clase B?")
 
-    st.markdown(r"""
-Estás a cargo de administrar un vuelo con **100 asientos disponibles**. Como parte de tu estrategia de precios, tienes dos segmentos de clientes:
+    st.markdown(rellenar(r"""
+Estás a cargo de administrar un vuelo con **«C» asientos disponibles**. Como parte de tu estrategia de precios, tienes dos segmentos de clientes:
 
 - ✈️ **Clase A**: personas que reservan tarde y están dispuestas a pagar un precio más alto.
 - 💼 **Clase B**: personas que compran con anticipación buscando un precio con descuento.
@@ -890,13 +996,13 @@ Tu objetivo es **maximizar el ingreso esperado**, decidiendo **cuántos asientos
 
 Se sabe que la **demanda de espacios para clase A** sigue una distribución normal con:
 
-- Media: $ \mu_A = 30 $
-- Desviación estándar: $ \sigma_A = 10 $
+- Media: $ \mu_A = «mu1» $
+- Desviación estándar: $ \sigma_A = «sigma1» $
 
 Además, la razón entre los precios es:
 
 $$
-\frac{p_d}{p_f} = 0.4
+\frac{p_d}{p_f} = «razon»
 $$
 
 donde $ p_d $ es el precio con descuento (clase B) y $ p_f $ el precio sin descuento (clase A).
@@ -916,24 +1022,24 @@ $$
 Es decir:
 
 $$
-F_A(y^*) = 1 - \frac{p_d}{p_f} = 1 - 0.4 = 0.6
+F_A(y^*) = 1 - \frac{p_d}{p_f} = 1 - «razon» = «cuantil1»
 $$
 
-Queremos encontrar el valor $ y^* $ tal que $ F_A(y^*) = 0.6 $.  
-Este valor corresponde al **cuantil 60%** de la distribución normal con media 30 y desviación estándar 10:
+Queremos encontrar el valor $ y^* $ tal que $ F_A(y^*) = «cuantil1» $.  
+Este valor corresponde al **cuantil «cuantil1_pct»%** de la distribución normal con media «mu1» y desviación estándar «sigma1»:
 
 ---
 
 ### 📐 Cálculo de $ y^* $:
 
 $$
-y^* = F_A^{-1}(0.6) = \text{qnorm}(0.6, \mu_A = 30, \sigma_A = 10) \approx 33
+y^* = F_A^{-1}(«cuantil1») = \text{qnorm}(«cuantil1», \mu_A = «mu1», \sigma_A = «sigma1») \approx «y1»
 $$
 
 Finalmente, el límite de reserva se calcula como:
 
 $$
-b^* = C - y^* = 100 - 33 = 67
+b^* = C - y^* = «C» - «y_emsr_a» = «limite_emsr_a»
 $$
 
 ---
@@ -942,11 +1048,11 @@ $$
 
 Para maximizar los ingresos:
 
-- Deberías reservar hasta **67 asientos** para la clase B (clientes con descuento).
-- Esto deja una **protección de 33 asientos** para los clientes de clase A (precio completo).
+- Deberías reservar hasta **«limite_emsr_a» asientos** para la clase B (clientes con descuento).
+- Esto deja una **protección de «y_emsr_a» asientos** para los clientes de clase A (precio completo).
 
 Así logras un equilibrio entre aprovechar las ventas anticipadas **sin dejar fuera a quienes pagan más**. 🎯
-    """)
+    """, "vuelo"))
     
     st.markdown("---")
     col1, col2, col3, col4 = st.columns([2,2,2,2])
@@ -960,13 +1066,13 @@ def pagina_ejemplo_editorial():
     st.set_page_config(page_title="Ejemplo editorial", layout="centered")
     st.title("Ejemplo 2: ¿Cuántos libros debo proteger para el mercado principal?")
 
-    st.markdown(r"""
-Estás a cargo de la gestión de ingresos de una **editorial** que está por lanzar un nuevo libro. El tiraje inicial es de **10,000 ejemplares** 📚.
+    st.markdown(rellenar(r"""
+Estás a cargo de la gestión de ingresos de una **editorial** que está por lanzar un nuevo libro. El tiraje inicial es de **«C» ejemplares** 📚.
 
 El plan de distribución considera dos mercados:
 
-- 🇺🇸 **Estados Unidos** (mercado principal): precio de venta de **\$150 USD**
-- 🌍 **Resto del mundo** (mercado internacional): precio de venta de **\$90 USD**
+- 🇺🇸 **Estados Unidos** (mercado principal): precio de venta de **\$«p1» USD**
+- 🌍 **Resto del mundo** (mercado internacional): precio de venta de **\$«p2» USD**
 
 Como en todo negocio, tu objetivo es claro:  
 🎯 **maximizar los ingresos** aprovechando la capacidad de impresión de la mejor manera posible.
@@ -975,11 +1081,11 @@ Como en todo negocio, tu objetivo es claro:
 
 ### 📦 Lo que sabemos:
 
-- Capacidad total de libros: $ C = 10{,}000 $
-- Precio en EE.UU.: $ p_f = 150 $
-- Precio internacional: $ p_d = 90 $
-- Demanda esperada en EE.UU.: $ \mu = 8000 $, $ \sigma = 1500 $
-- Demanda internacional: **más alta**: media de 23,000 libros (pero limitada por lo que no se proteja)
+- Capacidad total de libros: $ C = $ «C»
+- Precio en EE.UU.: $ p_f = «p1» $
+- Precio internacional: $ p_d = «p2» $
+- Demanda esperada en EE.UU.: $ \mu = $ «mu1», $ \sigma = $ «sigma1»
+- Demanda internacional: **más alta**: media de «mu2» libros (pero limitada por lo que no se proteja)
 
 ---
 
@@ -1000,17 +1106,17 @@ Recordamos que:
 $$
 \overline{F}_f(y^*) = \frac{p_d}{p_f}
 \Rightarrow
-F_f(y^*) = 1 - \frac{p_d}{p_f} = 1 - \frac{90}{150} = 0.4
+F_f(y^*) = 1 - \frac{p_d}{p_f} = 1 - \frac{«p2»}{«p1»} = «cuantil1»
 $$
 
-Queremos encontrar $ y^* $ tal que $ F_f(y^*) = 0.4 $, es decir, el **cuantil 40%** de una normal con media 8000 y desviación estándar 1500.
+Queremos encontrar $ y^* $ tal que $ F_f(y^*) = «cuantil1» $, es decir, el **cuantil «cuantil1_pct»%** de una normal con media «mu1» y desviación estándar «sigma1».
 
 ---
 
 ### 📐 Cálculo de $ y^* $:
 
 $$
-y^* = F_f^{-1}(0.4) = \text{qnorm}(0.4, \mu = 8000, \sigma = 1500) \approx 7680
+y^* = F_f^{-1}(«cuantil1») = \text{qnorm}(«cuantil1», \mu = «mu1», \sigma = «sigma1») \approx «y1»
 $$
 
 ---
@@ -1019,11 +1125,11 @@ $$
 
 Para maximizar los ingresos:
 
-- Se deben **proteger aproximadamente 7680 ejemplares** para su venta en los Estados Unidos.
-- El resto (unos 2320 ejemplares) puede destinarse a la venta internacional.
+- Se deben **proteger aproximadamente «y_emsr_a» ejemplares** para su venta en los Estados Unidos.
+- El resto (unos «limite_emsr_a» ejemplares) puede destinarse a la venta internacional.
 
 Así se garantiza que el mercado de mayor valor **no quede desatendido**, y al mismo tiempo se aprovecha el exceso de demanda global 🌍.
-    """)
+    """, "editorial"))
 
     st.markdown("---")
     col1, col2, col3, col4 = st.columns([2,2,2,2])
@@ -1112,8 +1218,8 @@ def pagina_ejemplo_emsr():
     st.set_page_config(page_title="Ejemplo EMSR", layout="centered")
     st.title("Ejemplo 3: Estrategia de precios para la final de Quidditch 🧹🏆")
 
-    st.markdown(r"""
-Se acerca la gran final de la **Copa de Quidditch**, y tú estás a cargo de gestionar la venta de **1000 boletos** para el partido que se jugará dentro de tres semanas.
+    st.markdown(rellenar(r"""
+Se acerca la gran final de la **Copa de Quidditch**, y tú estás a cargo de gestionar la venta de **«C» boletos** para el partido que se jugará dentro de tres semanas.
 
 Como buen gestor de ingresos, decides implementar una **estrategia escalonada de precios**, sabiendo que distintos tipos de fanáticos valoran de manera distinta el acceso al evento.
 
@@ -1123,17 +1229,17 @@ Como buen gestor de ingresos, decides implementar una **estrategia escalonada de
 
 Has decidido lo siguiente:
 
-1. **Esta semana**: boletos a **\$100**
-2. **La próxima semana**: boletos a **\$200**
-3. **Semana del juego**: boletos a **\$250**
+1. **Esta semana**: boletos a **\$«p3»**
+2. **La próxima semana**: boletos a **\$«p2»**
+3. **Semana del juego**: boletos a **\$«p1»**
 
 Cada grupo de compradores representa una **clase distinta**, con su propio comportamiento de compra y disposición a pagar:
 
 | Clase  | Descripción                       | Precio | $ \mu $ (demanda esperada) | $ \sigma $ |
 |--------|-----------------------------------|--------|-------------------------------|--------------|
-| $ c_3 $ | Aficionados normales (anticipados) | \$100  | 1000                          | 300          |
-| $ c_2 $ | Aficionados interesados (semana 2) | \$200  | 525                           | 50           |
-| $ c_1 $ | Seguidores fieles (último momento) | \$250  | 275                           | 75           |
+| $ c_3 $ | Aficionados normales (anticipados) | \$«p3»  | «mu3»                         | «sigma3»     |
+| $ c_2 $ | Aficionados interesados (semana 2) | \$«p2»  | «mu2»                         | «sigma2»     |
+| $ c_1 $ | Seguidores fieles (último momento) | \$«p1»  | «mu1»                         | «sigma1»     |
 
 ---
 
@@ -1154,13 +1260,13 @@ Primero comparamos la clase $ c_3 $ con las clases superiores:
 - Con clase $ c_1 $:
 
 $$
-y_{31} = F_1^{-1}\left(1 - \frac{100}{250} \right) = F_1^{-1}(0.6)
+y_{31} = F_1^{-1}\left(1 - \frac{«p3»}{«p1»} \right) = F_1^{-1}(«cuantil1»)
 $$
 
 - Con clase $ c_2 $:
 
 $$
-y_{32} = F_2^{-1}\left(1 - \frac{100}{200} \right) = F_2^{-1}(0.5)
+y_{32} = F_2^{-1}\left(1 - \frac{«p3»}{«p2»} \right) = F_2^{-1}(«cuantil2»)
 $$
 
 ---
@@ -1169,23 +1275,23 @@ $$
 
 Usamos los parámetros de las clases:
 
-- $ F_1^{-1}(0.6) \approx \text{qnorm}(0.6, 275, 75) \approx 294 $
-- $ F_2^{-1}(0.5) = \text{qnorm}(0.5, 525, 50) = 525 $
+- $ F_1^{-1}(«cuantil1») \approx \text{qnorm}(«cuantil1», «mu1», «sigma1») \approx «y1» $
+- $ F_2^{-1}(«cuantil2») \approx \text{qnorm}(«cuantil2», «mu2», «sigma2») \approx «y2» $
 
 Entonces, el total de boletos a proteger es:
 
 $$
-y = y_{31} + y_{32} = 294 + 525 = 819
+y = y_{31} + y_{32} = «y1» + «y2» = «y_emsr_a»
 $$
 
 ---
 
 ### ✅ Conclusión
 
-Debes proteger aproximadamente **819 boletos** para las clases que pagan más, y vender **hasta 181 boletos** esta semana a \$100.
+Debes proteger aproximadamente **«y_emsr_a» boletos** para las clases que pagan más, y vender **hasta «limite_emsr_a» boletos** esta semana a \$«p3».
 
 Esta estrategia te permite maximizar ingresos, **sin cerrar las puertas a quienes valoran más el evento**. 🎫💰
-    """)
+    """, "quidditch"))
     
     st.markdown("---")
     col1, col2, col3, col4 = st.columns([2,2,2,2])
@@ -1280,7 +1386,7 @@ def pagina_ejemplo_emsr_b():
     st.set_page_config(page_title="Ejemplo EMSR-b", layout="centered")
     st.title("Ejemplo 4: Aplicando EMSR-b para proteger boletos valiosos")
 
-    st.markdown(r"""
+    st.markdown(rellenar(r"""
 Continuamos con el ejemplo de la gran final de Quidditch 🧹🏆, pero ahora aplicaremos la **heurística EMSR-b** para calcular de manera eficiente el nivel de protección necesario antes de abrir la venta al público de menor precio.
 
 ---
@@ -1289,9 +1395,9 @@ Continuamos con el ejemplo de la gran final de Quidditch 🧹🏆, pero ahora ap
 
 | Clase  | Descripción                       | Precio | $ \mu $ (demanda esperada) | $ \sigma $ |
 |--------|-----------------------------------|--------|-------------------------------|--------------|
-| $ c_3 $ | Aficionados normales (anticipados) | \$100  | 1000                          | 300          |
-| $ c_2 $ | Aficionados interesados (semana 2) | \$200  | 525                           | 50           |
-| $ c_1 $ | Seguidores fieles (último momento) | \$250  | 275                           | 75           |
+| $ c_3 $ | Aficionados normales (anticipados) | \$«p3»  | «mu3»                         | «sigma3»     |
+| $ c_2 $ | Aficionados interesados (semana 2) | \$«p2»  | «mu2»                         | «sigma2»     |
+| $ c_1 $ | Seguidores fieles (último momento) | \$«p1»  | «mu1»                         | «sigma1»     |
 
 ---
 
@@ -1307,17 +1413,17 @@ Para ello, agrupamos las clases más caras $ c_1 $ y $ c_2 $ como una **clase fi
 
 - Media total:
 $$
-\mu = 275 + 525 = 800
+\mu = «suma_mu» = «mu_ficticia»
 $$
 
 - Desviación estándar combinada:
 $$
-\sigma = \sqrt{75^2 + 50^2} = \sqrt{5625 + 2500} = \sqrt{8125} \approx 90.14
+\sigma = \sqrt{«suma_sigma2»} = \sqrt{«suma_varianzas»} = \sqrt{«varianza_ficticia»} \approx «sigma_ficticia»
 $$
 
 - Precio promedio ponderado:
 $$
-p = \frac{275}{800} \cdot 250 + \frac{525}{800} \cdot 200 = 85.94 + 131.25 = 217.19
+p = «suma_precios» = «aportes_ficticio» = «p_ficticio»
 $$
 
 ---
@@ -1325,24 +1431,24 @@ $$
 ### 🧠 Paso 2: Aplicamos la regla de Littlewood
 
 $$
-y = F^{-1} \left( 1 - \frac{100}{217.19} \right ) = F^{-1}(0.5396)
+y = F^{-1} \left( 1 - \frac{«p3»}{«p_ficticio»} \right ) = F^{-1}(«cuantil_ficticio»)
 $$
 
-Buscamos el cuantil 53.96% de una normal con $ \mu = 800 $ y $ \sigma \approx 90.14 $:
+Buscamos el cuantil «cuantil_ficticio_pct»% de una normal con $ \mu = «mu_ficticia» $ y $ \sigma \approx «sigma_ficticia» $:
 
 $$
-y \approx \text{qnorm}(0.5396, 800, 90.14) \approx 815
+y \approx \text{qnorm}(«cuantil_ficticio», «mu_ficticia», «sigma_ficticia») \approx «y_emsr_b»
 $$
 
 ---
 
 ### ✅ Conclusión
 
-Para proteger el ingreso proveniente de las clases de mayor valor, debes **reservar alrededor de 815 boletos**.  
-Eso significa que esta semana (clase $ c_3 $) solo deberías vender **hasta 185 boletos** a \$100.
+Para proteger el ingreso proveniente de las clases de mayor valor, debes **reservar alrededor de «y_emsr_b» boletos**.  
+Eso significa que esta semana (clase $ c_3 $) solo deberías vender **hasta «limite_emsr_b» boletos** a \$«p3».
 
 EMSR-b te ofrece una forma rápida y efectiva de tomar esta decisión sin necesidad de múltiples comparaciones. 💡
-    """)
+    """, "quidditch"))
     
     st.markdown("---")
     col1, col2, col3, col4 = st.columns([2,2,2,2])
@@ -1439,36 +1545,36 @@ y compara el nivel de protección sugerido por **EMSR-a** y **EMSR-b**.
 
 """)
 
-    st.sidebar.markdown("## Parámetros de cada clase")
+    with fase("lectura de parámetros"):
+        st.sidebar.markdown("## Parámetros de cada clase")
 
-    with st.sidebar.expander("Clase 1 (precio más alto)"):
-        mu1 = st.number_input("μ₁", value=275)
-        sigma1 = st.number_input("σ₁", value=75)
-        p1 = st.number_input("Precio clase 1", value=250.0)
+        with st.sidebar.expander("Clase 1 (precio más alto)"):
+            mu1 = st.number_input("μ₁", value=275)
+            sigma1 = st.number_input("σ₁", value=75)
+            p1 = st.number_input("Precio clase 1", value=250.0)
 
-    with st.sidebar.expander("Clase 2 (precio medio)"):
-        mu2 = st.number_input("μ₂", value=525)
-        sigma2 = st.number_input("σ₂", value=50)
-        p2 = st.number_input("Precio clase 2", value=200.0)
+        with st.sidebar.expander("Clase 2 (precio medio)"):
+            mu2 = st.number_input("μ₂", value=525)
+            sigma2 = st.number_input("σ₂", value=50)
+            p2 = st.number_input("Precio clase 2", value=200.0)
 
-    with st.sidebar.expander("Clase 3 (precio más bajo)"):
-        mu3 = st.number_input("μ₃", value=1000)
-        sigma3 = st.number_input("σ₃", value=300)
-        p3 = st.number_input("Precio clase 3", value=100.0)
+        with st.sidebar.expander("Clase 3 (precio más bajo)"):
+            mu3 = st.number_input("μ₃", value=1000)
+            sigma3 = st.number_input("σ₃", value=300)
+            p3 = st.number_input("Precio clase 3", value=100.0)
 
     st.markdown("### 🔍 Resultados:")
 
-    # EMSR-a: suma de dos reglas Littlewood
-    y31 = norm.ppf(1 - (p3 / p1), loc=mu1, scale=sigma1)
-    y32 = norm.ppf(1 - (p3 / p2), loc=mu2, scale=sigma2)
-    y_emsr_a = y31 + y32
+    with fase("cálculo de niveles"):
+        niveles = niveles_proteccion([mu1, mu2, mu3], [sigma1, sigma2, sigma3], [p1, p2, p3])
+
+        # EMSR-a: suma de dos reglas Littlewood
+        y31, y32 = niveles["littlewood"]
+        y_emsr_a = niveles["emsr_a"][-1]
 
-    # EMSR-b: clase ficticia
-    mu_fict = mu1 + mu2
-    sigma_fict = np.sqrt(sigma1**2 + sigma2**2)
-    p_fict = (p1 * mu1 + p2 * mu2) / mu_fict
-    p_ratio_b = p3 / p_fict
-    y_emsr_b = norm.ppf(1 - p_ratio_b, loc=mu_fict, scale=sigma_fict)
+        # EMSR-b: clase ficticia
+        p_fict = (p1 * mu1 + p2 * mu2) / (mu1 + mu2)
+        y_emsr_b = niveles["emsr_b"][-1]
 
     st.latex(rf"""
     \text{{EMSR-a: }}\quad y = F_1^{{-1}}\left(1 - \frac{{{p3}}}{{{p1}}} \right)
@@ -1481,6 +1587,126 @@ y compara el nivel de protección sugerido por **EMSR-a** y **EMSR-b**.
 
     st.success(f"🔒 Nivel de protección recomendado:\n\n- EMSR-a: {y_emsr_a:.0f} unidades\n- EMSR-b: {y_emsr_b:.0f} unidades")
 
+    # EMSR-b supone que un cliente rechazado se va; muchos compran la clase de arriba
+    if st.toggle("🔼 ¿Y si los clientes rechazados compran una clase superior?", key="ascenso"):
+        st.markdown("""
+Si cerramos la clase 3, parte de esos clientes compra la clase 2 (o la 1) en lugar de irse.
+Cerrar una clase ya no pierde la venta completa, así que conviene **proteger más**:
+
+$$P(S_j > y_j) = \\frac{p_{j+1} - s_j\\,\\bar p_j}{(1 - s_j)\\,\\bar p_j}$$
+""")
+        col_s, col_C = st.columns(2)
+        s2 = col_s.slider("Probabilidad de ascenso de la clase 2 a la 1 (s₁)", 0.0, 0.9, 0.1, key="ascenso_2")
+        s3 = col_s.slider("Probabilidad de ascenso de la clase 3 a la 2 (s₂)", 0.0, 0.9, 0.3, key="ascenso_3")
+        C = int(col_C.number_input("Capacidad", 10, 10**5, 1000, step=10, key="capacidad_ascenso"))
+        rho = col_C.slider("Correlación entre las demandas de las clases (ρ)", -0.4, 0.8, 0.0, step=0.1,
+                           key="rho_ascenso")
+        replicas = int(st.number_input("Réplicas de la simulación", 1000, 500_000, REPLICAS_SIMULACION, step=1000,
+                                       key="replicas_ascenso"))
+        with fase("simulación"):
+            mu, sigma, p = [mu1, mu2, mu3], [sigma1, sigma2, sigma3], [p1, p2, p3]
+            politicas = {"EMSR-b": niveles["emsr_b"], "EMSR-b con ascenso": emsr_b_ascenso(mu, sigma, p, [s2, s3])}
+            correlacion = matriz_correlacion(rho, 3) if rho else None
+            # En segundo plano: mover un control relanza la simulación y cancela la anterior.
+            # Mismas semillas para las dos políticas: la diferencia no es ruido de muestreo
+            trabajo = trabajos.lanzar("ascenso", comparar_ascenso, politicas, p, mu, sigma, [s2, s3], C, replicas,
+                                      correlacion=correlacion)
+        if not trabajo.esperar(trabajos.ESPERA_S):
+            trabajos.mostrar_avance(trabajo, f"Simulando {replicas:,} réplicas…")
+        else:
+            ingresos = trabajo.resultado()
+            st.table({
+                "Política": list(politicas),
+                "y₁": [f"{min(y[0], C):.0f}" for y in politicas.values()],
+                "y₂": [f"{min(y[1], C):.0f}" for y in politicas.values()],
+                "Ingreso promedio": [f"{v.mean():,.0f}" for v in ingresos.values()],
+            })
+            diferencia = ingresos["EMSR-b con ascenso"] - ingresos["EMSR-b"]
+            st.metric("Diferencia de ingreso por vuelo", f"{diferencia.mean():,.0f}",
+                      f"± {1.96 * diferencia.std(ddof=1) / np.sqrt(diferencia.size):,.0f} (95%)")
+        st.caption(f"{replicas:,} réplicas; la clase más barata llega primero y un cliente rechazado "
+                   "sube una clase a la vez con la probabilidad indicada. Un nivel igual a la capacidad "
+                   "significa que conviene cerrar la clase.")
+    else:
+        trabajos.soltar("ascenso")
+
+    # Bandas de confianza: mu y sigma también son estimaciones con error
+    if st.toggle("Mostrar bandas de confianza (bootstrap)"):
+        st.markdown("""
+Los valores de $\\mu$ y $\\sigma$ se estiman a partir de datos históricos, así que también tienen incertidumbre.
+Remuestreamos esos parámetros muchas veces y recalculamos los niveles de protección en cada remuestra.
+""")
+        fuente = st.radio("Fuente de la incertidumbre", ["Parámetros estimados", "Historial de demanda"], horizontal=True)
+        n_remuestras = st.number_input("Número de remuestras", 100, 50000, 2000, step=100)
+
+        historia = None
+        n_obs = 30
+        if fuente == "Parámetros estimados":
+            n_obs = st.number_input("Observaciones usadas para estimar μ y σ", 2, 10000, 30)
+        else:
+            textos = [
+                st.text_area(f"Demanda histórica clase {k} (separada por comas)", key=f"historia_{k}")
+                for k in (1, 2, 3)
+            ]
+            try:
+                historia = [np.array([float(v) for v in t.split(",") if v.strip()]) for t in textos]
+            except ValueError:
+                historia = []
+            if len(historia) != 3 or min(h.size for h in historia) < 2:
+                st.info("Captura al menos dos observaciones numéricas por clase.")
+                historia = False
+
+        if historia is not False:
+            with fase("bootstrap"):
+                bandas = bootstrap_compartido(
+                    [mu1, mu2, mu3], [sigma1, sigma2, sigma3], [p1, p2, p3],
+                    n_obs=n_obs, n_remuestras=int(n_remuestras), historia=historia, semilla=0,
+                )
+            st.table({
+                "Percentil": ["5%", "50%", "95%"],
+                "EMSR-a": [f"{v:.0f}" for v in bandas["emsr_a"][:, -1]],
+                "EMSR-b": [f"{v:.0f}" for v in bandas["emsr_b"][:, -1]],
+            })
+
+    # Biblioteca: guardar la estructura actual y compararla con otras en un solo cálculo
+    st.markdown("### 📚 Biblioteca de escenarios")
+    with fase("biblioteca de escenarios"):
+        col_nombre, col_boton = st.columns([3, 1], vertical_alignment="bottom")
+        nombre = col_nombre.text_input("Nombre del escenario", key="nombre_escenario").strip()
+        if col_boton.button("Guardar", disabled=not nombre, width="stretch"):
+            BIBLIOTECA.guardar(nombre, [mu1, mu2, mu3], [sigma1, sigma2, sigma3], [p1, p2, p3])
+            st.toast(f"Escenario «{nombre}» guardado")
+
+        total = BIBLIOTECA.contar()
+        if total:
+            filtro = st.text_input(f"Buscar entre {total} escenarios guardados (inicio del nombre)",
+                                   key="filtro_escenarios")
+            if st.toggle("Comparar todos los que coinciden con la búsqueda", key="comparar_todos"):
+                ids = [f[0] for f in BIBLIOTECA.buscar(filtro, limite=COMPARAR_BIBLIOTECA + 1)]
+                if len(ids) > COMPARAR_BIBLIOTECA:
+                    ids = ids[:COMPARAR_BIBLIOTECA]
+                    st.caption(f"Se comparan los primeros {COMPARAR_BIBLIOTECA:,} por nombre; "
+                               "escribe más del nombre para acotar la búsqueda.")
+            else:
+                # Solo se ofrecen las primeras coincidencias; los ya elegidos se conservan
+                elegidos = st.session_state.get("escenarios_elegidos", [])
+                opciones = {f[0]: f[1] for f in BIBLIOTECA.cargar_nombres(elegidos)}
+                opciones.update((f[0], f[1]) for f in BIBLIOTECA.buscar(filtro, limite=OPCIONES_BIBLIOTECA))
+                ids = st.multiselect("Escenarios a comparar", list(opciones), format_func=opciones.get,
+                                     key="escenarios_elegidos")
+            if ids:
+                tabla = comparar(BIBLIOTECA.cargar(ids))
+                del tabla["id"]
+                st.dataframe(tabla, hide_index=True, width="stretch")
+
+                with st.expander("📥 Exportar niveles de protección y límites de reserva"):
+                    capacidad = st.number_input("Capacidad para los límites de reserva", 1, 10**7, 1500,
+                                                key="capacidad_exportar")
+                    boton_exportar(
+                        "Descargar niveles", "niveles_proteccion",
+                        lambda: bloques_protecciones(BIBLIOTECA.cargar(ids), C=capacidad), "niveles",
+                    )
+
     st.markdown("---")
     col1, col2, col3 = st.columns([2,2,2])
     with col2:
@@ -1488,23 +1714,23 @@ y compara el nivel de protección sugerido por **EMSR-a** y **EMSR-b**.
     
 
 
-home = st.Page(intro, title="Introducción", icon=":material/home:")
-p_segmentos = st.Page(segmentos, title="Segmentación del mercado", icon=":material/price_check:")
-p_supuestos = st.Page(supuestos, title="Supuestos del modelo", icon=":material/psychology:")
-p_elementos = st.Page(elementos, title="Elementos clave", icon=":material/settings:")
-p_distribuciones = st.Page(pagina_distribuciones, title="Distribuciones de demanda", icon=":material/grouped_bar_chart:")
-p_probabilidades = st.Page(pagina_probabilidades, title="Probabilidad de desbordamiento", icon=":material/stacked_line_chart:")
-p_ingreso_exploracion = st.Page(pagina_ingreso_exploracion, title="Ingreso esperado", icon=":material/paid:")
-p_formula_marginal = st.Page(pagina_formula_marginal, title="Construyendo la fórmula del ingreso marginal", icon=":material/psychology_alt:")
-p_optimo_teorico = st.Page(pagina_optimo_teorico, title="Condición óptima", icon=":material/flag:")
-p_ejemplo_resuelto_estatico = st.Page(pagina_ejemplo_resuelto_estatico, title="Ejemplo 1: Vuelo y límite de reserva óptimo", icon=":material/task_alt:")
-p_ejemplo_editorial = st.Page(pagina_ejemplo_editorial, title="Ejemplo 2: Editorial y protección óptima", icon=":material/menu_book:")
-p_emsr = st.Page(pagina_emsr, title="Múltiples clases (EMSR)", icon=":material/grouped_bar_chart:")
-p_ejemplo_emsr = st.Page(pagina_ejemplo_emsr, title="Ejemplo 3: Quidditch y EMSR-a", icon=":material/sports_esports:")
-p_emsr_b = st.Page(pagina_emsr_b, title="EMSR-b", icon=":material/insights:")
-p_ejemplo_emsr_b = st.Page(pagina_ejemplo_emsr_b, title="Ejemplo 4: EMSR-b aplicado al Quidditch", icon=":material/stars:")
-p_resumen = st.Page(pagina_resumen, title="Resumen", icon=":material/flag_circle:")
-p_practica_emsr = st.Page(pagina_practica_emsr, title="Ponlo en práctica (EMSR)", icon=":material/science:")
+home = st.Page(instrumentar(intro), title="Introducción", icon=":material/home:")
+p_segmentos = st.Page(instrumentar(segmentos), title="Segmentación del mercado", icon=":material/price_check:")
+p_supuestos = st.Page(instrumentar(supuestos), title="Supuestos del modelo", icon=":material/psychology:")
+p_elementos = st.Page(instrumentar(elementos), title="Elementos clave", icon=":material/settings:")
+p_distribuciones = st.Page(instrumentar(pagina_distribuciones), title="Distribuciones de demanda", icon=":material/grouped_bar_chart:")
+p_probabilidades = st.Page(instrumentar(pagina_probabilidades), title="Probabilidad de desbordamiento", icon=":material/stacked_line_chart:")
+p_ingreso_exploracion = st.Page(instrumentar(pagina_ingreso_exploracion), title="Ingreso esperado", icon=":material/paid:")
+p_formula_marginal = st.Page(instrumentar(pagina_formula_marginal), title="Construyendo la fórmula del ingreso marginal", icon=":material/psychology_alt:")
+p_optimo_teorico = st.Page(instrumentar(pagina_optimo_teorico), title="Condición óptima", icon=":material/flag:")
+p_ejemplo_resuelto_estatico = st.Page(instrumentar(pagina_ejemplo_resuelto_estatico), title="Ejemplo 1: Vuelo y límite de reserva óptimo", icon=":material/task_alt:")
+p_ejemplo_editorial = st.Page(instrumentar(pagina_ejemplo_editorial), title="Ejemplo 2: Editorial y protección óptima", icon=":material/menu_book:")
+p_emsr = st.Page(instrumentar(pagina_emsr), title="Múltiples clases (EMSR)", icon=":material/grouped_bar_chart:")
+p_ejemplo_emsr = st.Page(instrumentar(pagina_ejemplo_emsr), title="Ejemplo 3: Quidditch y EMSR-a", icon=":material/sports_esports:")
+p_emsr_b = st.Page(instrumentar(pagina_emsr_b), title="EMSR-b", icon=":material/insights:")
+p_ejemplo_emsr_b = st.Page(instrumentar(pagina_ejemplo_emsr_b), title="Ejemplo 4: EMSR-b aplicado al Quidditch", icon=":material/stars:")
+p_resumen = st.Page(instrumentar(pagina_resumen), title="Resumen", icon=":material/flag_circle:")
+p_practica_emsr = st.Page(instrumentar(pagina_practica_emsr), title="Ponlo en práctica (EMSR)", icon=":material/science:")
 
 pages = [
     home, 
@@ -1527,6 +1753,17 @@ pages = [
 ]
 
 pg = st.navigation(pages)
+# ?pagina=<url_path> abre esa página. Así navega la prueba de carga
+# (benchmarks/carga.py): AppTest.switch_page solo admite páginas en archivos y las de
+# esta app son funciones.
+destino = {p.url_path: p for p in pages}.get(st.query_params.pop("pagina", None))
+if destino is not None and destino.url_path != pg.url_path:
+    st.switch_page(destino)
+# Al salir de la práctica de EMSR su simulación ya no tiene quién la espere
+if pg.url_path != "pagina_practica_emsr":
+    trabajos.soltar("ascenso")
+en_segundo_plano(pages)
 pg.run()
+panel()
 
 
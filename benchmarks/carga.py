@@ -0,0 +1,145 @@
+"""Prueba de carga con muchas sesiones intercaladas usando el modo headless de Streamlit (AppTest).
+
+Cada sesión simulada recorre las páginas en el orden de `pages` y, en
+pagina_ingreso_exploracion, arrastra los sliders de b y μ_A. Al final se reportan
+percentiles de latencia por rerun, RSS máximo y, por sesión, los objetos y figuras de
+matplotlib que quedan vivos después de cerrar las sesiones.
+
+AppTest usa un Runtime global por proceso, así que no admite reruns simultáneos en
+hilos. Por eso cada proceso trabajador mantiene `--sesiones-por-proceso` sesiones
+vivas a la vez y las avanza por turnos en un solo hilo: dentro de un proceso las
+sesiones se intercalan, no corren a la vez (como un servidor con muchas pestañas
+abiertas que piden reruns uno tras otro). La concurrencia real viene de los
+`--procesos` trabajadores, que corren en paralelo para generar presión de CPU.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.carga --procesos 8 --sesiones-por-proceso 25 --arrastres 10
+"""
+import argparse
+import gc
+import logging
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from matplotlib.figure import Figure
+from streamlit.testing.v1 import AppTest
+
+APP = str(Path(__file__).resolve().parent.parent / "asigna.py")
+PAGINA_SLIDERS = "pagina_ingreso_exploracion"
+SLIDER_B = "Límite de reserva para clase B (b)"
+SLIDER_MU_A = "Media demanda clase A (μ_A)"
+
+# Recorrido de la navegación: mismo orden que `pages` en asigna.py (sin la portada)
+PAGINAS = [
+    "segmentos", "supuestos", "elementos", "pagina_distribuciones", "pagina_probabilidades",
+    "pagina_ingreso_exploracion", "pagina_formula_marginal", "pagina_optimo_teorico",
+    "pagina_ejemplo_resuelto_estatico", "pagina_ejemplo_editorial", "pagina_emsr",
+    "pagina_ejemplo_emsr", "pagina_emsr_b", "pagina_ejemplo_emsr_b", "pagina_resumen",
+    "pagina_practica_emsr",
+]
+
+
+def _ir_a(at, url_pathname):
+    # AppTest.switch_page solo admite páginas definidas en archivos; las de esta app son
+    # funciones, así que se navega con el parámetro ?pagina= que atiende asigna.py
+    at.query_params["pagina"] = url_pathname
+
+
+def _slider(at, etiqueta):
+    return next(s for s in at.slider if s.label == etiqueta)
+
+
+def _rerun(at):
+    inicio = time.perf_counter()
+    at.run()
+    return time.perf_counter() - inicio, len(at.exception)
+
+
+def sesion(arrastres, semilla):
+    # Generador: produce (latencia, errores) por cada rerun de la sesión
+    rng = np.random.default_rng(semilla)
+    at = AppTest.from_file(APP, default_timeout=300)
+    yield _rerun(at)
+
+    for pagina in PAGINAS:
+        _ir_a(at, pagina)
+        yield _rerun(at)
+        if pagina != PAGINA_SLIDERS:
+            continue
+        for _ in range(arrastres):
+            for etiqueta in (SLIDER_B, SLIDER_MU_A):
+                slider = _slider(at, etiqueta)
+                slider.set_value(int(rng.integers(slider.min, slider.max + 1)))
+                yield _rerun(at)
+
+
+def contar_vivos():
+    gc.collect()
+    objetos = gc.get_objects()
+    return len(objetos), sum(isinstance(o, Figure) for o in objetos)
+
+
+def trabajador(n_sesiones, arrastres, semilla):
+    logging.disable(logging.WARNING)
+    # Una sesión de calentamiento para que imports y cachés no cuenten como fuga
+    for _ in sesion(1, semilla):
+        pass
+    objetos_ini, figuras_ini = contar_vivos()
+
+    activas = [sesion(arrastres, semilla + k + 1) for k in range(n_sesiones)]
+    latencias, errores = [], 0
+    while activas:
+        for s in list(activas):
+            try:
+                latencia, n_errores = next(s)
+            except StopIteration:
+                activas.remove(s)
+                continue
+            latencias.append(latencia)
+            errores += n_errores
+
+    objetos_fin, figuras_fin = contar_vivos()
+    return {
+        "latencias": latencias,
+        "errores": errores,
+        "objetos": objetos_fin - objetos_ini,
+        "figuras": figuras_fin - figuras_ini,
+        "rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--procesos", type=int, default=4)
+    parser.add_argument("--sesiones-por-proceso", type=int, default=25)
+    parser.add_argument("--arrastres", type=int, default=5)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.procesos) as pool:
+        resultados = list(pool.map(
+            trabajador,
+            [args.sesiones_por_proceso] * args.procesos,
+            [args.arrastres] * args.procesos,
+            [1000 * k for k in range(args.procesos)],
+        ))
+    duracion = time.perf_counter() - inicio
+
+    sesiones = args.procesos * args.sesiones_por_proceso
+    latencias = np.array([t for r in resultados for t in r["latencias"]]) * 1000
+    p50, p90, p99 = np.percentile(latencias, [50, 90, 99])
+    print(f"sesiones: {sesiones} ({args.procesos} procesos × {args.sesiones_por_proceso})  "
+          f"reruns: {latencias.size}  duración: {duracion:.1f} s  "
+          f"errores: {sum(r['errores'] for r in resultados)}")
+    print(f"latencia por rerun (ms)  p50: {p50:.0f}  p90: {p90:.0f}  p99: {p99:.0f}  max: {latencias.max():.0f}")
+    print(f"RSS máximo por proceso: {max(r['rss_kib'] for r in resultados) / 1024:.0f} MiB")
+    print(f"retenidos por sesión  objetos: {sum(r['objetos'] for r in resultados) / sesiones:.1f}  "
+          f"figuras: {sum(r['figuras'] for r in resultados) / sesiones:.2f}")
+
+
+if __name__ == "__main__":
+    main()
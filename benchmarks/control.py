@@ -0,0 +1,70 @@
+"""Decisiones por segundo del motor de aceptación en línea (control.MotorReservas).
+
+Genera un flujo de solicitudes (salida, clase, personas) sobre `--salidas` salidas con
+niveles EMSR-b y lo reparte entre 1, 2, 4 y 8 hilos. Al final comprueba que lo vendido
+en cada salida coincide con lo descontado: las decisiones fueron atómicas.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.control --salidas 10000 --solicitudes 2000000
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from control import MotorReservas
+
+MU, SIGMA, P = [275, 525, 1000], [75, 50, 300], [250.0, 200.0, 100.0]
+
+
+def procesar(motor, solicitudes, aceptadas):
+    vendidos = 0
+    for salida, clase, personas in solicitudes:
+        if motor.solicitar(salida, clase, personas):
+            vendidos += personas
+    aceptadas.append(vendidos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--salidas", type=int, default=10000)
+    parser.add_argument("--solicitudes", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    capacidades = rng.integers(1000, 2000, args.salidas)
+    escala = rng.uniform(0.5, 1.5, (args.salidas, 1))
+    solicitudes = list(zip(
+        rng.integers(0, args.salidas, args.solicitudes).tolist(),
+        rng.integers(0, 3, args.solicitudes).tolist(),
+        rng.choice([1, 1, 1, 2, 2, 3, 4], args.solicitudes).tolist(),
+    ))
+
+    inicio = time.perf_counter()
+    MotorReservas.desde_demanda(capacidades, escala * MU, escala * SIGMA, P)
+    print(f"compilación de {args.salidas} salidas: {1000 * (time.perf_counter() - inicio):.1f} ms")
+
+    print(f"{'hilos':>5} {'decisiones/s':>14} {'ns/decisión':>12}  consistente")
+    for hilos in (1, 2, 4, 8):
+        motor = MotorReservas.desde_demanda(capacidades, escala * MU, escala * SIGMA, P)
+        aceptadas = []
+        trabajadores = [
+            threading.Thread(target=procesar, args=(motor, solicitudes[k::hilos], aceptadas))
+            for k in range(hilos)
+        ]
+        inicio = time.perf_counter()
+        for t in trabajadores:
+            t.start()
+        for t in trabajadores:
+            t.join()
+        duracion = time.perf_counter() - inicio
+
+        descontado = int(capacidades.sum()) - sum(motor.restante(s) for s in range(args.salidas))
+        print(f"{hilos:>5} {args.solicitudes / duracion:>14,.0f} {1e9 * duracion / args.solicitudes:>12.0f}  "
+              f"{'sí' if descontado == sum(aceptadas) else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
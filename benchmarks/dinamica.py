@@ -0,0 +1,42 @@
+"""Tiempo y memoria de la programación dinámica con tiempo discreto (dinamica.resolver).
+
+Resuelve el escenario de pagina_practica_emsr (3 clases, la más barata llega primero)
+con varias combinaciones de lugares × periodos y reporta el tiempo y la memoria
+máxima asignada durante la recursión (tracemalloc).
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.dinamica
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from dinamica import resolver, tasas_por_ventanas
+from simulador import ventanas_secuenciales
+
+MU, P = np.array([275, 525, 1000]), [250.0, 200.0, 100.0]
+TAMANOS = ((100, 1_000), (1_000, 10_000), (1_000, 100_000), (10_000, 100_000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    print(f"{'lugares':>8} {'periodos':>9} {'segundos':>9} {'memoria (MB)':>13} {'umbrales (MB)':>14}")
+    for C, T in TAMANOS:
+        # Demanda escalada con la capacidad (1800 solicitudes por cada 1000 lugares)
+        tasas = tasas_por_ventanas(MU * C / 1000, T, ventanas_secuenciales(3))
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        r = resolver(P, tasas, C)
+        duracion = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{C:>8} {T:>9} {duracion:>9.2f} {pico / 2**20:>13.1f} {r['umbrales'].nbytes / 2**20:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Tiempos de los textos de las páginas de ejemplo.
+
+Mide el tiempo de armar los textos de cada ejemplo de ejemplos.EJEMPLOS en frío (caché
+vacía) y con la caché caliente, que es lo que paga cada rerun. Sale con código 1 si el
+tiempo en caliente pasa de --limite-ms. Que los resultados coincidan con su
+"esperado" lo revisa tests/test_ejemplos.py.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.ejemplos --repeticiones 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Los tiempos en frío no deben depender de lo que haya en la caché en disco
+os.environ["ASIGNA_CACHE_DIR"] = ""
+
+from ejemplos import EJEMPLOS, valores  # noqa: E402
+from recursos import CACHE  # noqa: E402
+
+
+def medir(funcion, repeticiones, antes=lambda: None):
+    tiempos = []
+    for _ in range(repeticiones):
+        antes()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return 1000 * np.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=200)
+    parser.add_argument("--limite-ms", type=float, default=1.0,
+                        help="tiempo máximo (mediana) de los textos de una página con la caché caliente")
+    args = parser.parse_args()
+
+    lentos = 0
+    print(f"{'ejemplo':<11} {'en frío (ms)':>13} {'en caliente (ms)':>17}")
+    for nombre in EJEMPLOS:
+        frio = medir(lambda: valores(nombre), args.repeticiones, antes=CACHE.limpiar)
+        valores(nombre)
+        caliente = medir(lambda: valores(nombre), args.repeticiones)
+        lento = caliente > args.limite_ms
+        lentos += lento
+        print(f"{nombre:<11} {frio:>13.3f} {caliente:>17.3f}" + ("  LENTO" if lento else ""))
+
+    if lentos:
+        print(f"\n{lentos} ejemplos pasan de {args.limite_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
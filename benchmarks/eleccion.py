@@ -0,0 +1,46 @@
+"""Tiempo de la enumeración de conjuntos de oferta y de la DP con elección (eleccion.py).
+
+Para n tarifas con pesos de preferencia aleatorios (semilla fija) enumera los 2^n
+conjuntos, calcula R(S) y Q(S), busca los conjuntos eficientes y resuelve la DP con
+elección para 1000 lugares × 10000 periodos.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.eleccion [--tarifas 5 10 15]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from eleccion import conjuntos, eficientes, ingreso_y_venta, resolver_eleccion
+
+C, T = 1_000, 10_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tarifas", type=int, nargs="+", default=[5, 10, 12, 15])
+    args = parser.parse_args()
+
+    print(f"{'tarifas':>8} {'conjuntos':>10} {'R y Q (ms)':>11} {'eficientes (ms)':>16} {'K':>3} {'DP (s)':>7}")
+    for n in args.tarifas:
+        rng = np.random.default_rng(n)
+        p = np.sort(rng.uniform(50, 500, n))[::-1]
+        v = rng.uniform(0.2, 2.0, n)
+        inicio = time.perf_counter()
+        ofertas = conjuntos(n)
+        ingreso_y_venta(p, v, 1.0, ofertas)
+        t_rq = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        e = eficientes(p, v, 1.0, ofertas)
+        t_ef = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        # Una llegada por periodo con probabilidad 0.2: unas 2000 llegadas por 1000 lugares
+        resolver_eleccion(p, v, 1.0, np.full(T, 0.2), C)
+        t_dp = time.perf_counter() - inicio
+        print(f"{n:>8} {2**n:>10} {1000 * t_rq:>11.1f} {1000 * t_ef:>16.1f} {len(e['R']):>3} {t_dp:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
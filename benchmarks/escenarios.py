@@ -0,0 +1,59 @@
+"""Tiempos de la biblioteca de escenarios con muchos escenarios guardados.
+
+Llena una base temporal con `--escenarios` estructuras aleatorias de 2 a 6 clases y
+mide lo que hace pagina_practica_emsr en cada rerun: contar, buscar por nombre,
+cargar la selección y resolver EMSR-a/EMSR-b en lote.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.escenarios --escenarios 100000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from escenarios import BibliotecaEscenarios, comparar
+
+
+def aleatorios(n, rng):
+    for k in range(n):
+        clases = int(rng.integers(2, 7))
+        p = np.sort(rng.uniform(50, 500, clases))[::-1]
+        yield f"tarifa {k:06d}", rng.uniform(50, 800, clases), rng.uniform(10, 200, clases), p
+
+
+def medir(nombre, funcion, repeticiones=5):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    print(f"{nombre:<42} {1000 * min(tiempos):9.1f} ms")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escenarios", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        biblioteca = BibliotecaEscenarios(Path(tmp) / "escenarios.sqlite")
+        inicio = time.perf_counter()
+        biblioteca.guardar_varios(aleatorios(args.escenarios, np.random.default_rng(0)))
+        print(f"{'inserción de ' + str(args.escenarios) + ' escenarios':<42} "
+              f"{1000 * (time.perf_counter() - inicio):9.1f} ms")
+
+        medir("contar", biblioteca.contar)
+        medir("buscar 'tarifa 0123' (prefijo, 200)", lambda: biblioteca.buscar("tarifa 0123", limite=200))
+        ids = [f[0] for f in medir("buscar '' (todos)", lambda: biblioteca.buscar(""))]
+        for m in (10, 1000, len(ids)):
+            grupos = medir(f"cargar {m}", lambda: biblioteca.cargar(ids[:m]))
+            medir(f"comparar {m} (EMSR-a y EMSR-b en lote)", lambda: comparar(grupos))
+
+
+if __name__ == "__main__":
+    main()
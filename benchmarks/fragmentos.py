@@ -0,0 +1,158 @@
+"""Rerun completo contra rerun del fragmento: tiempo y bytes por websocket al mover b.
+
+Levanta `streamlit run asigna.py` en un puerto local y se conecta como lo haría el
+navegador (websocket /_stcore/stream, mensajes protobuf BackMsg/ForwardMsg). En cada
+página con región interactiva mueve el slider de b (o de μ_A si la página no tiene b)
+y mide dos formas de pedir el rerun con el mismo estado de widgets:
+
+- completo: sin fragment_id, como antes de separar la región interactiva;
+- fragmento: con el fragment_id de la región, como lo pide ahora el navegador.
+
+Se reporta la latencia hasta script_finished y los bytes de ForwardMsg recibidos. El
+cliente anuncia los mensajes que ya recibió (cached_message_hashes), igual que el
+navegador, así que el texto que no cambia cuenta solo como referencia. Con matplotlib
+el PNG se descarga aparte por HTTP (/media) y no entra en la cuenta; con
+--interactivas la especificación Vega-Lite sí viaja por el websocket.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.fragmentos --reruns 20 [--interactivas]
+"""
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.util import calc_hash
+
+RAIZ = Path(__file__).resolve().parent.parent
+PAGINAS = ["supuestos", "pagina_distribuciones", "pagina_probabilidades", "pagina_ingreso_exploracion"]
+SLIDERS = ("Límite de reserva para clase B (b)", "Media Clase A (μ_A)")
+TOGGLE = "Gráficas interactivas (Vega-Lite)"
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def iniciar_servidor(puerto):
+    servidor = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "asigna.py", "--server.headless", "true",
+         "--server.port", str(puerto), "--browser.gatherUsageStats", "false"],
+        cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(300):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{puerto}/_stcore/health", timeout=1)
+            return servidor
+        except OSError:
+            time.sleep(0.1)
+    servidor.kill()
+    raise RuntimeError("El servidor de Streamlit no respondió")
+
+
+class Cliente:
+    def __init__(self, ws):
+        self.ws = ws
+        self.cache = set()  # hashes de mensajes que el "navegador" ya tiene
+
+    async def rerun(self, pagina, widgets, fragmento=""):
+        estado = ClientState(page_script_hash=calc_hash(pagina), fragment_id=fragmento,
+                             cached_message_hashes=sorted(self.cache))
+        estado.widget_states.widgets.extend(widgets.values())
+        inicio = time.perf_counter()
+        await self.ws.send(BackMsg(rerun_script=estado).SerializeToString())
+
+        recibidos, mensajes = 0, []
+        while True:
+            datos = await self.ws.recv()
+            msg = ForwardMsg.FromString(datos)
+            recibidos += len(datos)
+            mensajes.append(msg)
+            if msg.metadata.cacheable:
+                self.cache.add(msg.hash)
+            if msg.WhichOneof("type") == "script_finished":
+                return time.perf_counter() - inicio, recibidos, mensajes
+
+
+def buscar_widgets(mensajes):
+    # Ids de los widgets por etiqueta y fragment_id de la región interactiva
+    ids, fragmento = {}, ""
+    for msg in mensajes:
+        if msg.WhichOneof("type") != "delta" or msg.delta.WhichOneof("type") != "new_element":
+            continue
+        elemento = msg.delta.new_element
+        tipo = elemento.WhichOneof("type")
+        if tipo in ("slider", "checkbox"):
+            widget = getattr(elemento, tipo)
+            ids[widget.label] = (widget.id, list(widget.default) if tipo == "slider" else widget.default)
+            if widget.label in SLIDERS and msg.delta.fragment_id:
+                fragmento = msg.delta.fragment_id
+    return ids, fragmento
+
+
+async def medir_pagina(url, pagina, reruns, interactivas, rng):
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        cliente = Cliente(ws)
+        widgets = {}
+        _, _, mensajes = await cliente.rerun(pagina, widgets)
+        ids, fragmento = buscar_widgets(mensajes)
+        if interactivas:
+            widgets[TOGGLE] = WidgetState(id=ids[TOGGLE][0], bool_value=True)
+            _, _, mensajes = await cliente.rerun(pagina, widgets)
+            ids, fragmento = buscar_widgets(mensajes)
+
+        etiqueta = next(e for e in SLIDERS if e in ids)
+        id_slider, (valor,) = ids[etiqueta]
+        resultados = {}
+        for modo, fid in (("completo", ""), ("fragmento", fragmento)):
+            tiempos, bytes_ = [], []
+            for _ in range(reruns):
+                valor = float(np.clip(valor + rng.choice([-1, 1]), 1, 99))
+                widgets[etiqueta] = WidgetState(id=id_slider)
+                widgets[etiqueta].double_array_value.data[:] = [valor]
+                t, n, _ = await cliente.rerun(pagina, widgets, fid)
+                tiempos.append(t)
+                bytes_.append(n)
+            resultados[modo] = (1000 * np.median(tiempos), np.median(bytes_))
+        return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--interactivas", action="store_true", help="Usar el backend Vega-Lite")
+    args = parser.parse_args()
+
+    puerto = puerto_libre()
+    servidor = iniciar_servidor(puerto)
+    url = f"ws://127.0.0.1:{puerto}/_stcore/stream"
+    rng = np.random.default_rng(0)
+    try:
+        print(f"{'página':<28} {'modo':<10} {'ms (mediana)':>13} {'bytes (mediana)':>16}")
+        for pagina in PAGINAS:
+            resultados = asyncio.run(medir_pagina(url, pagina, args.reruns, args.interactivas, rng))
+            for modo, (ms, n) in resultados.items():
+                print(f"{pagina:<28} {modo:<10} {ms:13.1f} {n:16.0f}")
+            completo, frag = resultados["completo"], resultados["fragmento"]
+            print(f"{'':<28} {'ahorro':<10} {100 * (1 - frag[0] / completo[0]):12.0f}% "
+                  f"{100 * (1 - frag[1] / completo[1]):15.0f}%")
+    finally:
+        servidor.terminate()
+        servidor.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Costo por rerun de cada backend de gráficas: CPU del servidor y bytes enviados.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.graficas --repeticiones 20 --capacidad 100
+"""
+import argparse
+import io
+import json
+import time
+
+import numpy as np
+from scipy.stats import norm
+
+from graficas import BACKENDS, grafica_demandas, grafica_densidades, grafica_desbordamiento, grafica_ingreso
+from modelo import curva_ingreso, malla_adaptativa
+
+
+def graficas_por_pagina(C):
+    # Valores por defecto de cada página, escalados a la capacidad C
+    f = C / 100
+    mu_A, sigma_A, mu_B, sigma_B = 25 * f, 8 * f, 60 * f, 8 * f
+    b = round(0.65 * C)
+    x = malla_adaptativa(C, (mu_B, C - mu_A, b), (sigma_B, sigma_A, sigma_A), incluir=(b,))
+    pdf_B, pdf_A = norm.pdf(x, mu_B, sigma_B), norm.pdf(C - x, mu_A, sigma_A)
+    fb, fa = norm.sf(x, mu_B, sigma_B), norm.sf(C - x, mu_A, sigma_A)
+    prob_b, prob_a = norm.sf(b, mu_B, sigma_B), norm.sf(C - b, mu_A, sigma_A)
+
+    mu_A2 = 40 * f
+    b2 = round(0.6 * C)
+    b_vals = malla_adaptativa(C, (mu_B, C - mu_A2, b2), (sigma_B, sigma_A, sigma_A),
+                              incluir=(0, b2, C), enteros=True)
+    ingresos = curva_ingreso(b_vals, C, mu_A2, sigma_A, 5.0, mu_B, sigma_B, 2.0)
+    actual = ingresos[np.searchsorted(b_vals, b2)]
+    fb2, fa2 = norm.sf(x, mu_B, sigma_B), norm.sf(C - x, mu_A2, sigma_A)
+
+    return {
+        "supuestos": [lambda be: grafica_demandas(C, x, pdf_B, pdf_A, mu_A, sigma_A, mu_B, sigma_B, backend=be)],
+        "pagina_distribuciones": [lambda be: grafica_densidades(C, b, x, pdf_B, pdf_A, backend=be)],
+        "pagina_probabilidades": [lambda be: grafica_desbordamiento(C, b, x, fb, fa, prob_b, prob_a, backend=be)],
+        "pagina_ingreso_exploracion": [
+            lambda be: grafica_desbordamiento(C, b2, x, fb2, fa2, norm.sf(b2, mu_B, sigma_B),
+                                              norm.sf(C - b2, mu_A2, sigma_A), detalle=False, backend=be),
+            lambda be: grafica_ingreso(C, b2, b_vals, ingresos, actual, backend=be),
+        ],
+    }
+
+
+def serializar(grafica, backend):
+    # Lo mismo que hace Streamlit antes de enviar el mensaje al navegador
+    if backend == "vega-lite":
+        return json.dumps(grafica).encode()
+    buffer = io.BytesIO()
+    grafica.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+    return buffer.getvalue()
+
+
+def medir(constructores, backend, repeticiones):
+    bytes_rerun = 0
+    inicio = time.process_time()
+    for _ in range(repeticiones):
+        bytes_rerun = sum(len(serializar(c(backend), backend)) for c in constructores)
+    return (time.process_time() - inicio) / repeticiones, bytes_rerun
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--capacidad", type=int, default=100)
+    args = parser.parse_args()
+
+    paginas = graficas_por_pagina(args.capacidad)
+    # Un primer render fuera de la medición (caché de fuentes de matplotlib)
+    for constructores in paginas.values():
+        for backend in BACKENDS:
+            medir(constructores, backend, 1)
+
+    print(f"{'página':<28} {'backend':<11} {'CPU/rerun (ms)':>15} {'bytes/rerun':>12}")
+    for pagina, constructores in paginas.items():
+        for backend in BACKENDS:
+            cpu, n_bytes = medir(constructores, backend, args.repeticiones)
+            print(f"{pagina:<28} {backend:<11} {cpu * 1000:>15.1f} {n_bytes:>12,}")
+
+
+if __name__ == "__main__":
+    main()
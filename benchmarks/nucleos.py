@@ -0,0 +1,83 @@
+"""NumPy contra numba en los núcleos de nucleos.py, con capacidades de 100 a 10^6.
+
+Para cada capacidad C (demanda escalada con C) mide la acumulación de la curva de
+ingreso (C+1 incrementos) y el recorrido de eventos del simulador (réplicas con unas
+C llegadas cada una) con cada backend disponible, y verifica que los resultados sean
+idénticos. La programación dinámica estática (modelo.valor_estatico) se reporta como
+referencia: cada etapa es una convolución, igual en ambos backends.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.nucleos --repeticiones 3
+"""
+import argparse
+import time
+
+import numpy as np
+
+from modelo import emsr_b, incremento_ingreso, valor_estatico
+from nucleos import NUCLEOS
+from simulador import generar_llegadas, tabla_limites
+
+CAPACIDADES = (100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def medir(funcion, repeticiones):
+    mejor, resultado = np.inf, None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def casos(C):
+    mu, sigma, p = np.array([0.4 * C, 0.6 * C]), np.array([0.08 * C, 0.08 * C]), np.array([5.0, 2.0])
+    tramo = incremento_ingreso(np.arange(1, C + 2), C, mu[0], sigma[0], p[0], mu[1], sigma[1], p[1])
+
+    replicas = max(4, 10**6 // C)
+    clases, _ = generar_llegadas(mu, sigma, replicas=replicas, semilla=0)
+    acepta = tabla_limites(emsr_b(mu, sigma, p), C)
+    plano = np.concatenate((acepta, np.zeros((1, C + 1), dtype=bool))).ravel()
+    filas = np.where(clases < 0, 2, clases).astype(np.int64) * (C + 1)
+    inicial = np.full(replicas, C, dtype=np.int64)
+    eventos = int((clases >= 0).sum())
+
+    return {
+        "acumulación": (C + 1, lambda n: n["acumular"](100.0, tramo)),
+        "simulación": (eventos, lambda n: n["recorrer_eventos"](plano, filas, inicial.copy())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    # Compilación fuera de la medición
+    for nucleos in NUCLEOS.values():
+        for _, funcion in casos(100).values():
+            funcion(nucleos)
+
+    backends = list(NUCLEOS)
+    print(f"backends: {', '.join(backends)}")
+    print(f"{'C':>9} {'núcleo':<12} {'elementos':>11} " + " ".join(f"{b + ' (ms)':>12}" for b in backends)
+          + "  idénticos")
+    for C in CAPACIDADES:
+        for nombre, (elementos, funcion) in casos(C).items():
+            tiempos, resultados = [], []
+            for b in backends:
+                t, r = medir(lambda: funcion(NUCLEOS[b]), args.repeticiones)
+                tiempos.append(t)
+                resultados.append(r)
+            iguales = all(np.array_equal(resultados[0], r) for r in resultados[1:])
+            print(f"{C:>9} {nombre:<12} {elementos:>11} " + " ".join(f"{1000 * t:>12.1f}" for t in tiempos)
+                  + f"  {'sí' if iguales else 'NO'}")
+
+        mu, sigma = [0.4 * C, 0.6 * C], [0.08 * C, 0.08 * C]
+        t, _ = medir(lambda: valor_estatico.__wrapped__(mu, sigma, [5.0, 2.0], C), 1)
+        print(f"{C:>9} {'DP estática':<12} {C + 1:>11} {1000 * t:>12.1f}  (convolución, mismo código)")
+
+
+if __name__ == "__main__":
+    main()
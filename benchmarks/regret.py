@@ -0,0 +1,104 @@
+"""Pérdida de EMSR-a y EMSR-b frente al óptimo en miles de escenarios de n clases.
+
+Genera estructuras de tarifas aleatorias (2 a --max-clases clases, factores de carga
+de 0.7 a 1.8) y agrega los ejemplos del texto (ejemplos.py: vuelo, editorial y
+Quidditch). En cada escenario la programación dinámica estática (modelo.valor_estatico)
+da el ingreso óptimo y el ingreso esperado de los límites de EMSR-a y EMSR-b con el
+mismo modelo; la pérdida (regret) es la fracción del óptimo que deja cada heurística.
+Los escenarios se reparten en lotes entre un pool de procesos.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.regret --escenarios 2000 --procesos 4
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Miles de escenarios que no se repiten: no se guardan en la caché en disco
+os.environ["ASIGNA_CACHE_DIR"] = ""
+
+from ejemplos import EJEMPLOS  # noqa: E402
+from modelo import emsr_a, emsr_b, valor_estatico  # noqa: E402
+
+HEURISTICAS = {"EMSR-a": emsr_a, "EMSR-b": emsr_b}
+
+
+def generar(escenarios, max_clases, semilla):
+    """Escenarios aleatorios: precios decrecientes, demanda total = carga * C."""
+    rng = np.random.default_rng(semilla)
+    lista = []
+    for k in range(escenarios):
+        n = int(rng.integers(2, max_clases + 1))
+        C = int(rng.integers(50, 501))
+        p = np.sort(rng.uniform(50, 500, n))[::-1]
+        pesos = rng.dirichlet(np.ones(n))
+        mu = pesos * C * rng.uniform(0.7, 1.8)
+        sigma = mu * rng.uniform(0.1, 0.5, n)
+        lista.append({"nombre": f"aleatorio {k}", "C": C, "mu": mu, "sigma": sigma, "p": p})
+    return lista
+
+
+def evaluar(lote):
+    # En cada proceso del pool: óptimo y heurísticas de cada escenario del lote
+    filas = []
+    for e in lote:
+        inicio = time.perf_counter()
+        optimo = valor_estatico.__wrapped__(e["mu"], e["sigma"], e["p"], e["C"])["dv"][1:].sum()
+        perdidas = {}
+        for nombre, heuristica in HEURISTICAS.items():
+            y = heuristica(e["mu"], e["sigma"], e["p"])
+            valor = valor_estatico.__wrapped__(e["mu"], e["sigma"], e["p"], e["C"], y)["dv"][1:].sum()
+            perdidas[nombre] = (optimo - valor) / optimo
+        filas.append((e["nombre"], len(e["p"]), perdidas, time.perf_counter() - inicio))
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escenarios", type=int, default=2000)
+    parser.add_argument("--max-clases", type=int, default=6)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count())
+    parser.add_argument("--lote", type=int, default=50)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    escenarios = [dict(e, mu=np.array(e["mu"]), sigma=np.array(e["sigma"]), p=np.array(e["p"]))
+                  for e in EJEMPLOS.values()]
+    escenarios += generar(args.escenarios, args.max_clases, args.semilla)
+    lotes = [escenarios[k:k + args.lote] for k in range(0, len(escenarios), args.lote)]
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(args.procesos) as pool:
+        filas = [f for resultado in pool.map(evaluar, lotes) for f in resultado]
+    total = time.perf_counter() - inicio
+
+    print("Ejemplos del texto (pérdida frente al óptimo):")
+    for nombre, _, perdidas, _ in filas[:len(EJEMPLOS)]:
+        print(f"  {nombre:<42}" + "".join(f" {h}: {100 * v:6.3f}%" for h, v in perdidas.items()))
+
+    aleatorios = filas[len(EJEMPLOS):]
+    print(f"\n{len(aleatorios)} escenarios aleatorios — pérdida en % del ingreso óptimo:")
+    print(f"{'':>8} {'media':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'máx':>8} {'> 1%':>7}")
+    for h in HEURISTICAS:
+        v = 100 * np.array([f[2][h] for f in aleatorios])
+        print(f"{h:>8} {v.mean():>8.3f} {np.percentile(v, 50):>8.3f} {np.percentile(v, 90):>8.3f} "
+              f"{np.percentile(v, 99):>8.3f} {v.max():>8.3f} {np.mean(v > 1):>7.1%}")
+
+    print("\nPérdida media de EMSR-b por número de clases:")
+    clases = np.array([f[1] for f in aleatorios])
+    v = 100 * np.array([f[2]["EMSR-b"] for f in aleatorios])
+    for n in np.unique(clases):
+        print(f"  {n} clases: {v[clases == n].mean():.3f}% ({np.count_nonzero(clases == n)} escenarios)")
+
+    tiempos = np.array([f[3] for f in filas])
+    print(f"\nTiempo por escenario (óptimo + 2 heurísticas): media {1000 * tiempos.mean():.1f} ms, "
+          f"p99 {1000 * np.percentile(tiempos, 99):.1f} ms")
+    print(f"Total: {total:.1f} s con {args.procesos} procesos ({len(filas) / total:.0f} escenarios/s)")
+
+
+if __name__ == "__main__":
+    main()
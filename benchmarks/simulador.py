@@ -0,0 +1,40 @@
+"""Eventos por segundo del simulador de reservas en un núcleo.
+
+Escenario de pagina_practica_emsr (3 clases, capacidad 1500, unos 1800 eventos por
+réplica) con límites EMSR-b y con precio oferta constante, para varios tamaños de lote.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.simulador --replicas 20000
+"""
+import argparse
+import time
+
+from modelo import emsr_b
+from simulador import simular_politica, tabla_limites, tabla_precio_oferta
+
+MU, SIGMA, P, C = [275, 525, 1000], [75, 50, 300], [250.0, 200.0, 100.0], 1500
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replicas", type=int, default=20000)
+    args = parser.parse_args()
+
+    politicas = {
+        "límites EMSR-b": tabla_limites(emsr_b(MU, SIGMA, P), C),
+        "precio oferta 150": tabla_precio_oferta(P, 150.0, C),
+    }
+    print(f"{'política':<20} {'lote':>6} {'eventos':>12} {'M eventos/s':>12} {'ingreso medio':>14}")
+    for nombre, acepta in politicas.items():
+        for lote in (250, 1000, 5000):
+            inicio = time.perf_counter()
+            r = simular_politica(acepta, P, MU, SIGMA, replicas=args.replicas, semilla=0, lote=lote)
+            duracion = time.perf_counter() - inicio
+            eventos = r["vendidos"].sum() + r["rechazados"].sum()
+            print(f"{nombre:<20} {lote:>6} {eventos:>12} {eventos / duracion / 1e6:>12.1f} "
+                  f"{r['ingreso'].mean():>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+# Segundo nivel de caché, en disco: sobrevive a los reinicios del contenedor y se
+# comparte entre procesos del mismo host. El orden de búsqueda es memoria (recursos.CACHE)
+# -> disco -> cálculo. ASIGNA_CACHE_DIR vacío desactiva este nivel.
+#
+# Las claves llevan la versión del código (un hash de los módulos de la app): después de
+# un despliegue que cambia una fórmula no se sirven resultados viejos, y al abrir una
+# caché escrita por otra versión se vacía en lugar de esperar a que expire.
+DIRECTORIO = os.environ.get("ASIGNA_CACHE_DIR", str(Path(__file__).resolve().parent / ".cache"))
+PRESUPUESTO_MB = int(os.environ.get("ASIGNA_CACHE_DISCO_MB", "1024"))
+TTL_HORAS = float(os.environ.get("ASIGNA_CACHE_TTL_H", str(24 * 7)))
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    clave TEXT PRIMARY KEY,
+    valor BLOB NOT NULL,
+    bytes INTEGER NOT NULL,
+    creado REAL NOT NULL,
+    usado REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resultados_usado ON resultados (usado);
+CREATE TABLE IF NOT EXISTS meta (
+    nombre TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+"""
+_FALTA = object()
+
+
+def version_codigo():
+    """Huella de los módulos .py de la app; ASIGNA_CACHE_VERSION la reemplaza."""
+    h = hashlib.sha256()
+    for archivo in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        h.update(archivo.name.encode())
+        h.update(archivo.read_bytes())
+    return h.hexdigest()[:16]
+
+
+VERSION = os.environ.get("ASIGNA_CACHE_VERSION") or version_codigo()
+
+
+class CacheDisco:
+    def __init__(self, ruta, presupuesto_bytes, ttl_s, version=VERSION):
+        self.ruta = Path(ruta)
+        self.version = version
+        self.presupuesto_bytes = presupuesto_bytes
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._conexion = None
+        self.aciertos = 0
+        self.fallos = 0
+
+    def _db(self):
+        # Conexión perezosa: importar el módulo no crea archivos
+        if self._conexion is None:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            con = sqlite3.connect(self.ruta, timeout=30, check_same_thread=False, isolation_level=None)
+            # WAL permite lectores concurrentes de otros procesos mientras uno escribe
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            con.executescript(ESQUEMA)
+            fila = con.execute("SELECT valor FROM meta WHERE nombre = 'version'").fetchone()
+            if fila is None or fila[0] != self.version:
+                # Resultados de otra versión del código: ya no se pueden servir
+                con.execute("DELETE FROM resultados")
+                con.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (self.version,))
+            self._conexion = con
+        return self._conexion
+
+    def leer(self, clave, faltante=None):
+        """Valor guardado para `clave`, o `faltante` si no existe o ya expiró."""
+        clave = f"{self.version}:{clave}"
+        ahora = time.time()
+        with self._lock:
+            db = self._db()
+            fila = db.execute("SELECT valor, creado FROM resultados WHERE clave = ?", (clave,)).fetchone()
+            if fila is None or ahora - fila[1] > self.ttl_s:
+                if fila is not None:
+                    db.execute("DELETE FROM resultados WHERE clave = ?", (clave,))
+                self.fallos += 1
+                return faltante
+            db.execute("UPDATE resultados SET usado = ? WHERE clave = ?", (ahora, clave))
+            self.aciertos += 1
+        return pickle.loads(fila[0])
+
+    def escribir(self, clave, valor):
+        clave = f"{self.version}:{clave}"
+        datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(datos) > self.presupuesto_bytes:
+            return
+        ahora = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?)",
+                    (clave, datos, len(datos), ahora, ahora),
+                )
+                self._recortar(db, ahora)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _recortar(self, db, ahora):
+        # Primero lo expirado; después, lo usado hace más tiempo hasta caber en el presupuesto
+        db.execute("DELETE FROM resultados WHERE creado < ?", (ahora - self.ttl_s,))
+        total = db.execute("SELECT COALESCE(SUM(bytes), 0) FROM resultados").fetchone()[0]
+        if total <= self.presupuesto_bytes:
+            return
+        for clave, tam in db.execute("SELECT clave, bytes FROM resultados ORDER BY usado").fetchall():
+            db.execute("DELETE FROM resultados WHERE clave = ?", (clave,))
+            total -= tam
+            if total <= self.presupuesto_bytes:
+                break
+
+    def obtener(self, clave, calcular):
+        # Con un centinela: None también es un resultado válido
+        valor = self.leer(clave, _FALTA)
+        if valor is _FALTA:
+            valor = calcular()
+            self.escribir(clave, valor)
+        return valor
+
+    def metricas(self):
+        with self._lock:
+            entradas, total = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM resultados"
+            ).fetchone()
+            return {
+                "entradas": entradas,
+                "bytes": total,
+                "presupuesto_bytes": self.presupuesto_bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+            }
+
+    def limpiar(self):
+        with self._lock:
+            self._db().execute("DELETE FROM resultados")
+
+
+DISCO = (CacheDisco(Path(DIRECTORIO) / "resultados.sqlite", PRESUPUESTO_MB * 2**20, TTL_HORAS * 3600)
+         if DIRECTORIO else None)
@@ -0,0 +1,5 @@
+import os
+
+# Las pruebas no deben leer ni llenar la caché en disco del repositorio. Este archivo en
+# la raíz también pone la raíz en sys.path para importar los módulos de la app.
+os.environ.setdefault("ASIGNA_CACHE_DIR", "")
@@ -0,0 +1,101 @@
+import threading
+from array import array
+
+import numpy as np
+
+from modelo import emsr_a, emsr_b
+
+
+# Motor de aceptación en línea. Los niveles de protección anidados de cada salida
+# (vuelo, función, fecha...) se compilan a un umbral entero por clase: una solicitud de
+# k lugares de la clase j se acepta si después de venderla quedan al menos y_{j-1}
+# lugares (y_0 = 0, la clase 1 solo necesita que haya lugar). Con y fraccionario se
+# protegen floor(y) lugares, la misma regla que simulador.tabla_limites (la clase se
+# vende mientras queden más de y lugares). Decidir es una resta y
+# una comparación sobre arreglos planos, sin importar cuántas clases o salidas haya.
+#
+# Las clases se numeran desde 0 y de mayor a menor precio, como en modelo.py.
+
+
+class MotorReservas:
+    def __init__(self, capacidades, protecciones, bloqueos=64):
+        """`capacidades` tiene forma (s,); `protecciones`, forma (s, n-1) o (n-1,) para todas."""
+        capacidades = np.asarray(capacidades, dtype=np.int64)
+        self.n_salidas = capacidades.size
+        protecciones = np.broadcast_to(np.asarray(protecciones, dtype=float),
+                                       (self.n_salidas, np.shape(protecciones)[-1]))
+        self.n_clases = protecciones.shape[1] + 1
+
+        # array('q'): enteros contiguos de 8 bytes, y leer un elemento es más barato que en numpy
+        self._capacidad = array("q", capacidades.tolist())
+        self._restante = array("q", capacidades.tolist())
+        self._umbral = array("q", self._compilar(protecciones, capacidades).ravel().tolist())
+        # Un candado por franja de salidas: dos salidas distintas rara vez compiten
+        self._bloqueos = [threading.Lock() for _ in range(bloqueos)]
+
+    @classmethod
+    def desde_demanda(cls, capacidades, mu, sigma, p, metodo="emsr_b", **kwargs):
+        """Compila los niveles EMSR de todas las salidas en una sola llamada vectorizada."""
+        protecciones = {"emsr_a": emsr_a, "emsr_b": emsr_b}[metodo](mu, sigma, p)
+        return cls(capacidades, protecciones, **kwargs)
+
+    def _compilar(self, protecciones, capacidades):
+        # Umbral por clase: lugares que deben quedar libres después de aceptar. Se recorta a
+        # [0, C] antes de convertir: emsr_b_ascenso devuelve inf cuando conviene cerrar la clase
+        y = np.floor(np.clip(protecciones, 0, np.asarray(capacidades, dtype=float)[:, None])).astype(np.int64)
+        return np.concatenate((np.zeros((y.shape[0], 1), dtype=np.int64), y), axis=1)
+
+    def _validar(self, salida, clase=0):
+        # Fuera de rango, array('q') acepta índices negativos y una clase de más cae en
+        # los umbrales de la salida siguiente: se decidiría contra otro vuelo
+        if not 0 <= salida < self.n_salidas:
+            raise IndexError(f"salida {salida} fuera de rango (hay {self.n_salidas})")
+        if not 0 <= clase < self.n_clases:
+            raise IndexError(f"clase {clase} fuera de rango (hay {self.n_clases})")
+
+    def solicitar(self, salida, clase, personas=1):
+        """Acepta (y descuenta) o rechaza una solicitud de forma atómica."""
+        self._validar(salida, clase)
+        if personas < 1:
+            raise ValueError(f"personas debe ser al menos 1 (se pidió {personas})")
+        with self._bloqueos[salida % len(self._bloqueos)]:
+            # El umbral se lee con el candado: actualizar lo reescribe con el mismo
+            umbral = self._umbral[salida * self.n_clases + clase]
+            restante = self._restante[salida] - personas
+            if restante < umbral:
+                return False
+            self._restante[salida] = restante
+            return True
+
+    def cancelar(self, salida, personas=1):
+        """Devuelve lugares vendidos; no se puede devolver más de lo que se vendió."""
+        self._validar(salida)
+        if personas < 1:
+            raise ValueError(f"personas debe ser al menos 1 (se pidió {personas})")
+        with self._bloqueos[salida % len(self._bloqueos)]:
+            restante = self._restante[salida] + personas
+            if restante > self._capacidad[salida]:
+                raise ValueError(f"la salida {salida} solo tiene {self._capacidad[salida] - self._restante[salida]} "
+                                 f"lugares vendidos; no se pueden cancelar {personas}")
+            self._restante[salida] = restante
+
+    def actualizar(self, salida, protecciones):
+        """Reemplaza los niveles de protección de una salida (p. ej. tras reoptimizar)."""
+        self._validar(salida)
+        fila = self._compilar(np.asarray(protecciones, dtype=float)[None, :], [self._capacidad[salida]])[0]
+        with self._bloqueos[salida % len(self._bloqueos)]:
+            inicio = salida * self.n_clases
+            self._umbral[inicio:inicio + self.n_clases] = array("q", fila.tolist())
+
+    def restante(self, salida):
+        self._validar(salida)
+        return self._restante[salida]
+
+    def disponibles(self, salida):
+        """Lugares que se pueden vender hoy a cada clase."""
+        self._validar(salida)
+        inicio = salida * self.n_clases
+        with self._bloqueos[salida % len(self._bloqueos)]:
+            restante = self._restante[salida]
+            umbrales = self._umbral[inicio:inicio + self.n_clases]
+        return [max(0, restante - u) for u in umbrales]
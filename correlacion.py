@@ -0,0 +1,53 @@
+import numpy as np
+from scipy.stats import norm, qmc
+
+from recursos import compartido
+
+
+# Ingreso esperado del modelo de dos clases cuando D_A y D_B no son independientes
+# (el clima o un evento empujan a las dos clases a la vez). (D_A, D_B) es normal
+# bivariada con correlación rho y se integra con cuasi-Monte Carlo: una secuencia de
+# Sobol aleatorizada con semilla fija. Los mismos puntos sirven para todos los b y
+# todas las rho, así que las curvas son suaves y el b óptimo se mueve sin ruido.
+
+
+def normales_qmc(dimension, puntos=2**14, semilla=0):
+    """Normales estándar independientes (puntos, dimension) a partir de una secuencia de Sobol."""
+    u = qmc.Sobol(dimension, scramble=True, seed=semilla).random(puntos)
+    return norm.ppf(u)
+
+
+def matriz_correlacion(rho, n=2):
+    """Matriz n × n con la misma correlación rho entre todas las clases."""
+    return np.full((n, n), rho) + (1 - rho) * np.eye(n)
+
+
+@compartido(disco=True)
+def ingreso_correlacionado(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B, rho, candidatos=1000, puntos=2**14):
+    """Ingreso esperado E[p_B min(D_B, b) + p_A min(D_A, C - min(D_B, b))] con corr(D_A, D_B) = rho.
+
+    Se evalúa en b = 0, C / K, ..., C con K = min(C, candidatos). Devuelve (b, ingreso).
+    """
+    z = normales_qmc(2, puntos)
+    d_A = np.maximum(mu_A + sigma_A * z[:, 0], 0.0)
+    d_B = np.maximum(mu_B + sigma_B * (rho * z[:, 0] + np.sqrt(1 - rho**2) * z[:, 1]), 0.0)
+    b = np.linspace(0, C, min(C, candidatos) + 1)
+
+    ingreso = np.empty(b.size)
+    # Por bloques de b para no armar la matriz completa (b × puntos)
+    for inicio in range(0, b.size, 64):
+        bloque = b[inicio:inicio + 64, None]
+        vendidos_B = np.minimum(d_B, bloque)
+        ingreso[inicio:inicio + 64] = (p_B * vendidos_B + p_A * np.minimum(d_A, C - vendidos_B)).mean(axis=1)
+    return b, ingreso
+
+
+def optimo_por_correlacion(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B, rhos, candidatos=1000):
+    """b óptimo e ingreso máximo para cada correlación de `rhos`."""
+    optimos, maximos = [], []
+    for rho in rhos:
+        b, ingreso = ingreso_correlacionado(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B, float(rho), candidatos)
+        i = np.argmax(ingreso)
+        optimos.append(b[i])
+        maximos.append(ingreso[i])
+    return np.array(optimos), np.array(maximos)
@@ -0,0 +1,53 @@
+import numpy as np
+
+
+# Programación dinámica con tiempo discreto (modelo de llegadas): en cada periodo
+# llega a lo más una solicitud, de la clase j con probabilidad lambda_j(t). Con x
+# lugares y el valor del siguiente periodo V_{t+1}:
+#
+#     V_t(x) = V_{t+1}(x) + sum_j lambda_j(t) * max(p_j - dV_{t+1}(x), 0)
+#
+# donde dV(x) = V(x) - V(x-1) es el costo de oportunidad de un lugar. Se recorre el
+# horizonte hacia atrás con un solo vector de valor (memoria O(C)) y de cada periodo
+# solo se guarda el umbral de cada clase: se acepta la clase j si x > umbral.
+#
+# Las clases se ordenan de mayor a menor precio, como en modelo.py.
+
+
+def tasas_por_ventanas(mu, T, ventanas):
+    """Probabilidades de llegada (T, n): la demanda media mu_j repartida en su ventana.
+
+    `ventanas` da el inicio y fin de cada clase como fracción del horizonte, igual que
+    en simulador.py (p. ej. simulador.ventanas_secuenciales).
+    """
+    mu = np.asarray(mu, dtype=float)
+    t = (np.arange(T) + 0.5) / T
+    dentro = (t[:, None] >= ventanas[:, 0]) & (t[:, None] < ventanas[:, 1])
+    periodos = np.maximum(dentro.sum(axis=0), 1)
+    return dentro * (mu / periodos)
+
+
+def resolver(p, tasas, C):
+    """Valor esperado V_0(x) para x = 0..C y umbrales (T, n) de aceptación por periodo.
+
+    tasas[t, j] es la probabilidad de que en el periodo t llegue una solicitud de la
+    clase j. En el periodo t, con x lugares, la clase j se acepta si x > umbrales[t, j].
+    """
+    p = np.asarray(p, dtype=float)
+    tasas = np.asarray(tasas, dtype=float)
+    T, n = tasas.shape
+    if np.any(tasas.sum(axis=1) > 1 + 1e-9):
+        raise ValueError("La probabilidad de llegada por periodo no puede pasar de 1: usa más periodos")
+
+    valor = np.zeros(C + 1)
+    dv = np.empty(C)
+    ganancia = np.empty((n, C))
+    umbrales = np.empty((T, n), dtype=np.int32)
+    for t in range(T - 1, -1, -1):
+        np.subtract(valor[1:], valor[:-1], out=dv)
+        # dV decrece con x: el umbral es cuántos lugares cuestan más que p_j
+        umbrales[t] = np.searchsorted(-dv, -p, side="left")
+        np.subtract(p[:, None], dv, out=ganancia)
+        np.maximum(ganancia, 0.0, out=ganancia)
+        valor[1:] += tasas[t] @ ganancia
+    return {"valor": valor, "umbrales": umbrales}
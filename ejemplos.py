@@ -0,0 +1,114 @@
+import re
+
+import numpy as np
+
+from modelo import niveles_proteccion
+from recursos import compartido
+
+
+# Ejemplos del texto como escenarios de n clases, de mayor a menor precio (como en
+# modelo.py). Donde el texto no da un dato porque no cambia la regla de Littlewood
+# (la demanda de la clase barata), se usa una demanda que sobra para la capacidad.
+#
+# Las páginas de ejemplo toman sus números de aquí: cada texto tiene marcas «clave» que
+# se sustituyen con valores(nombre), calculados con el mismo motor que el resto de la
+# app. "esperado" son los resultados redondeados que el texto debe mostrar; los revisa
+# tests/test_ejemplos.py.
+EJEMPLOS = {
+    "vuelo": {
+        "nombre": "Vuelo de 100 asientos (ejemplo resuelto)",
+        "pagina": "pagina_ejemplo_resuelto_estatico",
+        "C": 100,
+        "mu": [30.0, 100.0],  # mu_B no aparece en el texto
+        "sigma": [10.0, 20.0],
+        "p": [1.0, 0.4],  # el texto solo da la razón p_d / p_f = 0.4
+        "esperado": {"littlewood": [33], "emsr_a": 33, "emsr_b": 33},
+    },
+    "editorial": {
+        "nombre": "Editorial: EE.UU. y resto del mundo",
+        "pagina": "pagina_ejemplo_editorial",
+        "C": 10_000,
+        "mu": [8000.0, 23000.0],
+        "sigma": [1500.0, 3000.0],  # la desviación internacional no aparece en el texto
+        "p": [150.0, 90.0],
+        "esperado": {"littlewood": [7620], "emsr_a": 7620, "emsr_b": 7620},
+    },
+    "quidditch": {
+        "nombre": "Final de Quidditch",
+        "pagina": "pagina_ejemplo_emsr",
+        "C": 1000,
+        "mu": [275.0, 525.0, 1000.0],
+        "sigma": [75.0, 50.0, 300.0],
+        "p": [250.0, 200.0, 100.0],
+        "esperado": {"littlewood": [294, 525], "emsr_a": 819, "emsr_b": 809},
+    },
+}
+
+
+@compartido
+def _resolver(mu, sigma, p):
+    niveles = niveles_proteccion(mu, sigma, p)
+    mu, sigma, p = (np.asarray(v, dtype=float) for v in (mu, sigma, p))
+    # Clase ficticia de EMSR-b frente a la clase más barata
+    mu_f = mu[:-1].sum()
+    p_f = (p[:-1] * mu[:-1]).sum() / mu_f
+    return {
+        "littlewood": niveles["littlewood"],
+        "cuantiles": 1 - p[-1] / p[:-1],
+        "emsr_a": float(niveles["emsr_a"][-1]),
+        "emsr_b": float(niveles["emsr_b"][-1]),
+        "mu_ficticia": mu_f,
+        "varianza_ficticia": (sigma[:-1] ** 2).sum(),
+        "p_ficticio": p_f,
+        "aportes_ficticio": mu[:-1] / mu_f * p[:-1],
+        "cuantil_ficticio": 1 - p[-1] / p_f,
+    }
+
+
+def resolver(nombre):
+    """Niveles de protección del ejemplo (Littlewood por clase, EMSR-a y EMSR-b) y la clase ficticia."""
+    e = EJEMPLOS[nombre]
+    return _resolver(e["mu"], e["sigma"], e["p"])
+
+
+def _numero(x):
+    # 8000 -> "8,000", 0.4 -> "0.4", 90.0 -> "90"
+    return f"{x:,.0f}" if float(x).is_integer() else f"{x:,.4g}"
+
+
+def valores(nombre):
+    """Textos de cada «clave» del ejemplo: datos, cuantiles y resultados ya redondeados."""
+    e, r = EJEMPLOS[nombre], resolver(nombre)
+    v = {"C": _numero(e["C"])}
+    for j, (mu, sigma, p) in enumerate(zip(e["mu"], e["sigma"], e["p"]), start=1):
+        v.update({f"mu{j}": _numero(mu), f"sigma{j}": _numero(sigma), f"p{j}": _numero(p)})
+    # Regla de Littlewood de cada clase superior j frente a la última
+    for j, (q, y) in enumerate(zip(r["cuantiles"], r["littlewood"]), start=1):
+        v.update({f"cuantil{j}": f"{q:.4g}", f"cuantil{j}_pct": f"{100 * q:.4g}", f"y{j}": _numero(round(y))})
+    v["razon"] = f"{e['p'][-1] / e['p'][0]:.4g}"
+    for metodo in ("emsr_a", "emsr_b"):
+        y = round(r[metodo])
+        v[f"y_{metodo}"] = _numero(y)
+        v[f"limite_{metodo}"] = _numero(e["C"] - y)
+    # Clase ficticia de EMSR-b (van dentro de fórmulas: sin separador de miles)
+    mu, sigma, p = e["mu"][:-1], e["sigma"][:-1], e["p"][:-1]
+    v.update({
+        "suma_mu": " + ".join(f"{m:g}" for m in mu),
+        "suma_sigma2": " + ".join(f"{s:g}^2" for s in sigma),
+        "suma_varianzas": " + ".join(f"{s**2:g}" for s in sigma),
+        "suma_precios": " + ".join(rf"\frac{{{m:g}}}{{{r['mu_ficticia']:g}}} \cdot {q:g}" for m, q in zip(mu, p)),
+        "mu_ficticia": f"{r['mu_ficticia']:g}",
+        "varianza_ficticia": f"{r['varianza_ficticia']:g}",
+        "sigma_ficticia": f"{np.sqrt(r['varianza_ficticia']):.2f}",
+        "p_ficticio": f"{r['p_ficticio']:.2f}",
+        "aportes_ficticio": " + ".join(f"{a:.2f}" for a in r["aportes_ficticio"]),
+        "cuantil_ficticio": f"{r['cuantil_ficticio']:.4f}",
+        "cuantil_ficticio_pct": f"{100 * r['cuantil_ficticio']:.2f}",
+    })
+    return v
+
+
+def rellenar(texto, nombre):
+    """Sustituye cada «clave» del texto por su valor en el ejemplo `nombre`."""
+    v = valores(nombre)
+    return re.sub(r"«(\w+)»", lambda m: v[m.group(1)], texto)
@@ -0,0 +1,96 @@
+import numpy as np
+
+from dinamica import resolver
+from modelo import emsr_b
+
+
+# Demanda basada en elección (logit multinomial). Cada tarifa j tiene un peso de
+# preferencia v_j y la opción de no comprar pesa v0; si se ofrece el conjunto S, un
+# cliente compra j en S con probabilidad v_j / (v0 + sum_{i en S} v_i). A diferencia
+# de las clases independientes, abrir una tarifa barata le quita ventas a las caras.
+#
+# Los 2^n conjuntos de oferta se enumeran como una matriz booleana y todo se evalúa
+# con productos matriciales, así que 10-15 tarifas siguen siendo rápidas.
+
+
+def conjuntos(n):
+    """Todos los conjuntos de oferta como matriz booleana (2^n, n); la fila 0 es el vacío."""
+    return (np.arange(2**n)[:, None] >> np.arange(n)) & 1 == 1
+
+
+def probabilidades(v, v0, ofertas):
+    """P_j(S) para cada conjunto: forma (..., m, n) con v de forma (..., n)."""
+    v = np.asarray(v, dtype=float)
+    pesos = np.where(ofertas, v[..., None, :], 0.0)
+    return pesos / (np.asarray(v0, dtype=float)[..., None, None] + pesos.sum(axis=-1, keepdims=True))
+
+
+def ingreso_y_venta(p, v, v0, ofertas):
+    """Ingreso esperado R(S) y probabilidad de venta Q(S) por llegada, para cada conjunto."""
+    p, v = (np.asarray(a, dtype=float) for a in (p, v))
+    o = ofertas.astype(float)
+    denominador = np.asarray(v0, dtype=float)[..., None] + (v[..., None, :] * o).sum(axis=-1)
+    return (o @ (p * v)[..., None])[..., 0] / denominador, (o @ v[..., None])[..., 0] / denominador
+
+
+def eficientes(p, v, v0, ofertas=None):
+    """Conjuntos eficientes: la envolvente superior de los puntos (Q(S), R(S)).
+
+    Partiendo del conjunto vacío se elige cada vez el conjunto con la mayor pendiente
+    (R - R_k) / (Q - Q_k); ningún otro conjunto conviene para ningún costo de
+    oportunidad. Devuelve las ofertas (K, n), R, Q y las pendientes, que decrecen.
+    """
+    ofertas = conjuntos(len(p)) if ofertas is None else ofertas
+    R, Q = ingreso_y_venta(p, v, v0, ofertas)
+    elegidos, pendientes = [], []
+    R_k = Q_k = 0.0
+    while True:
+        dQ = Q - Q_k
+        pendiente = np.where(dQ > 1e-12, (R - R_k) / np.where(dQ > 1e-12, dQ, 1.0), -np.inf)
+        mejor = pendiente.max()
+        if mejor <= 0:
+            break
+        # Entre pendientes empatadas se salta directo al conjunto que vende más
+        empatados = np.flatnonzero(pendiente >= mejor - 1e-12)
+        i = empatados[np.argmax(Q[empatados])]
+        elegidos.append(i)
+        pendientes.append(mejor)
+        R_k, Q_k = R[i], Q[i]
+    elegidos = np.array(elegidos, dtype=int)
+    return {"ofertas": ofertas[elegidos], "R": R[elegidos], "Q": Q[elegidos], "pendientes": np.array(pendientes)}
+
+
+def tarifas_transformadas(p, v, v0):
+    """Tarifas y probabilidades de venta equivalentes de los conjuntos eficientes.
+
+    Con los conjuntos eficientes S_1 ⊂ ... ⊂ S_K, max_k R_k - Q_k * dV es igual a
+    sum_k dQ_k * max(p̂_k - dV, 0) con p̂_k la pendiente de la envolvente. El problema
+    con elección se convierte así en uno de clases independientes con tarifas p̂_k y
+    probabilidades dQ_k (transformación de tarifas).
+    """
+    e = eficientes(p, v, v0)
+    return e["pendientes"], np.diff(e["Q"], prepend=0.0), e
+
+
+def resolver_eleccion(p, v, v0, llegadas, C):
+    """DP basada en elección: en cada periodo llega un cliente con probabilidad llegadas[t].
+
+    Devuelve lo mismo que dinamica.resolver, con umbrales por conjunto eficiente: en
+    el periodo t, con x lugares, se ofrece el conjunto eficiente más grande k con
+    x > umbrales[t, k].
+    """
+    p_hat, dQ, e = tarifas_transformadas(p, v, v0)
+    r = resolver(p_hat, np.asarray(llegadas, dtype=float)[:, None] * dQ, C)
+    r["eficientes"] = e
+    return r
+
+
+def protecciones_heuristicas(p, v, v0, clientes):
+    """EMSR-b sobre las tarifas transformadas, con `clientes` llegadas esperadas.
+
+    La demanda de cada nivel eficiente es Poisson con media clientes * dQ_k. Devuelve
+    los niveles de protección de los conjuntos 1..k frente al k+1.
+    """
+    p_hat, dQ, e = tarifas_transformadas(p, v, v0)
+    mu = clientes * dQ
+    return emsr_b(mu, np.sqrt(mu), p_hat), e
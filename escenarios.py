@@ -0,0 +1,163 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from modelo import emsr_a, emsr_b
+
+
+# Biblioteca de estructuras de tarifas con nombre. Los parámetros de cada clase se
+# guardan como blobs float64 y hay índices por nombre y por número de clases, así que
+# buscar (por el inicio del nombre) y cargar miles de escenarios no recorre la tabla. Son datos del usuario,
+# no caché: viven en ASIGNA_DATOS_DIR y no expiran.
+DIRECTORIO = os.environ.get("ASIGNA_DATOS_DIR", str(Path(__file__).resolve().parent / ".datos"))
+LOTE_SQL = 5000  # ids por consulta, por debajo del límite de parámetros de SQLite
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS escenarios (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL UNIQUE,
+    n_clases INTEGER NOT NULL,
+    mu BLOB NOT NULL,
+    sigma BLOB NOT NULL,
+    p BLOB NOT NULL,
+    creado REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS escenarios_clases ON escenarios (n_clases, nombre);
+-- LIKE no distingue mayúsculas: solo usa un índice con la misma intercalación
+CREATE INDEX IF NOT EXISTS escenarios_nombre ON escenarios (nombre COLLATE NOCASE);
+"""
+
+
+def _blob(v):
+    return np.ascontiguousarray(v, dtype=np.float64).tobytes()
+
+
+class BibliotecaEscenarios:
+    def __init__(self, ruta):
+        self.ruta = Path(ruta)
+        self._lock = threading.Lock()
+        self._conexion = None
+
+    def _db(self):
+        if self._conexion is None:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            con = sqlite3.connect(self.ruta, timeout=30, check_same_thread=False)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(ESQUEMA)
+            self._conexion = con
+        return self._conexion
+
+    def guardar_varios(self, escenarios):
+        """Inserta o reemplaza (nombre, mu, sigma, p) en una sola transacción."""
+        filas = []
+        for nombre, mu, sigma, p in escenarios:
+            mu, sigma, p = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (mu, sigma, p)))
+            if mu.ndim != 1 or mu.size < 2:
+                raise ValueError(f"El escenario {nombre!r} debe tener al menos dos clases")
+            filas.append((nombre, mu.size, _blob(mu), _blob(sigma), _blob(p), time.time()))
+        with self._lock, self._db() as db:
+            db.executemany(
+                "INSERT INTO escenarios (nombre, n_clases, mu, sigma, p, creado) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (nombre) DO UPDATE SET n_clases = excluded.n_clases, mu = excluded.mu, "
+                "sigma = excluded.sigma, p = excluded.p, creado = excluded.creado",
+                filas,
+            )
+
+    def guardar(self, nombre, mu, sigma, p):
+        self.guardar_varios([(nombre, mu, sigma, p)])
+
+    def eliminar(self, ids):
+        with self._lock, self._db() as db:
+            db.executemany("DELETE FROM escenarios WHERE id = ?", [(int(i),) for i in ids])
+
+    def contar(self):
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM escenarios").fetchone()[0]
+
+    def buscar(self, texto="", n_clases=None, limite=None):
+        """(id, nombre, n_clases) de los escenarios cuyo nombre empieza con `texto`, por nombre.
+
+        La búsqueda es por prefijo (sin distinguir mayúsculas) para que la resuelva el
+        índice por nombre; buscar un texto en medio del nombre recorrería toda la tabla.
+        """
+        condiciones, parametros = [], []
+        if texto:
+            condiciones.append("nombre LIKE ? ESCAPE '\\'")
+            escapado = texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            parametros.append(f"{escapado}%")
+        if n_clases is not None:
+            condiciones.append("n_clases = ?")
+            parametros.append(int(n_clases))
+        sql = "SELECT id, nombre, n_clases FROM escenarios"
+        if condiciones:
+            sql += " WHERE " + " AND ".join(condiciones)
+        sql += " ORDER BY nombre COLLATE NOCASE"
+        if limite is not None:
+            sql += " LIMIT ?"
+            parametros.append(int(limite))
+        with self._lock:
+            return self._db().execute(sql, parametros).fetchall()
+
+    def cargar_nombres(self, ids):
+        ids = [int(i) for i in ids]
+        with self._lock:
+            return self._db().execute(
+                f"SELECT id, nombre, n_clases FROM escenarios WHERE id IN ({','.join('?' * len(ids))})", ids
+            ).fetchall()
+
+    def cargar(self, ids):
+        """Agrupa los escenarios por número de clases: {n: (ids, nombres, mu, sigma, p)}.
+
+        mu, sigma y p tienen forma (m, n), listos para resolver el grupo de una vez.
+        """
+        ids = [int(i) for i in ids]
+        filas = []
+        with self._lock:
+            db = self._db()
+            for k in range(0, len(ids), LOTE_SQL):
+                lote = ids[k:k + LOTE_SQL]
+                filas += db.execute(
+                    "SELECT id, nombre, n_clases, mu, sigma, p FROM escenarios "
+                    f"WHERE id IN ({','.join('?' * len(lote))})",
+                    lote,
+                ).fetchall()
+
+        orden = {i: k for k, i in enumerate(ids)}
+        filas.sort(key=lambda f: orden[f[0]])
+        grupos = {}
+        for fila in filas:
+            grupos.setdefault(fila[2], []).append(fila)
+        return {
+            n: (
+                [f[0] for f in g],
+                [f[1] for f in g],
+                *(np.frombuffer(b"".join(f[c] for f in g), dtype=np.float64).reshape(len(g), n)
+                  for c in (3, 4, 5)),
+            )
+            for n, g in grupos.items()
+        }
+
+
+def comparar(grupos):
+    """Tabla de comparación: EMSR-a y EMSR-b de cada escenario, resueltos por grupo."""
+    tabla = {"id": [], "Escenario": [], "Clases": [], "EMSR-a": [], "EMSR-b": [],
+             "Diferencia": [], "Niveles EMSR-b": []}
+    for n, (ids, nombres, mu, sigma, p) in grupos.items():
+        # Un solo cálculo vectorizado por número de clases
+        y_a = emsr_a(mu, sigma, p)
+        y_b = emsr_b(mu, sigma, p)
+        tabla["id"] += ids
+        tabla["Escenario"] += nombres
+        tabla["Clases"] += [n] * len(ids)
+        tabla["EMSR-a"] += np.round(y_a[:, -1]).tolist()
+        tabla["EMSR-b"] += np.round(y_b[:, -1]).tolist()
+        tabla["Diferencia"] += np.round(y_a[:, -1] - y_b[:, -1]).tolist()
+        tabla["Niveles EMSR-b"] += [" / ".join(f"{v:.0f}" for v in fila) for fila in y_b]
+    return tabla
+
+
+BIBLIOTECA = BibliotecaEscenarios(Path(DIRECTORIO) / "escenarios.sqlite")
@@ -0,0 +1,154 @@
+"""Exportación por bloques de resultados a CSV y Parquet.
+
+Los resultados se producen como un iterable de bloques ({columna: arreglo}) y cada
+escritor los vuelca en cuanto llegan, sin armar la tabla completa en memoria. Uso
+desde un trabajo por lotes:
+
+    with escritor("curvas.parquet", "parquet") as e:
+        for bloque in bloques_curva_ingreso(10**6, 400_000, 80_000, 5.0, 600_000, 80_000, 2.0):
+            e.escribir(bloque)
+"""
+import csv
+import io
+import tempfile
+
+import numpy as np
+from scipy.stats import norm
+
+from modelo import emsr_a, emsr_b, incremento_ingreso
+from nucleos import acumular
+
+FILAS_POR_BLOQUE = 65536
+# MIME y extensión de cada formato
+FORMATOS = {"csv": ("text/csv", ".csv"), "parquet": ("application/vnd.apache.parquet", ".parquet")}
+
+
+class _Escritor:
+    def __init__(self, destino):
+        # destino: ruta o archivo binario abierto (que sigue siendo de quien lo pasó)
+        self._propio = isinstance(destino, (str, bytes)) or hasattr(destino, "__fspath__")
+        self._archivo = open(destino, "wb") if self._propio else destino
+        self.filas = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        if self._propio:
+            self._archivo.close()
+
+
+class EscritorCSV(_Escritor):
+    def __init__(self, destino):
+        super().__init__(destino)
+        self._texto = io.TextIOWrapper(self._archivo, encoding="utf-8", newline="")
+        self._csv = csv.writer(self._texto)
+        self._columnas = None
+
+    def escribir(self, bloque):
+        if self._columnas is None:
+            self._columnas = list(bloque)
+            self._csv.writerow(self._columnas)
+        columnas = [np.asarray(bloque[c]).tolist() for c in self._columnas]
+        self._csv.writerows(zip(*columnas))
+        self.filas += len(columnas[0])
+
+    def cerrar(self):
+        self._texto.flush()
+        # Se suelta el archivo para que TextIOWrapper no lo cierre si no es nuestro
+        self._texto.detach()
+        super().cerrar()
+
+
+class EscritorParquet(_Escritor):
+    def __init__(self, destino):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("La exportación a Parquet requiere pyarrow (pip install pyarrow)") from e
+        super().__init__(destino)
+        self._pa, self._pq = pa, pq
+        self._escritor = None
+
+    def escribir(self, bloque):
+        # Cada bloque se vuelve un row group del archivo
+        tabla = self._pa.Table.from_pydict({c: np.asarray(v) for c, v in bloque.items()})
+        if self._escritor is None:
+            self._escritor = self._pq.ParquetWriter(self._archivo, tabla.schema, compression="zstd")
+        self._escritor.write_table(tabla)
+        self.filas += tabla.num_rows
+
+    def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+        super().cerrar()
+
+
+def escritor(destino, formato):
+    return {"csv": EscritorCSV, "parquet": EscritorParquet}[formato](destino)
+
+
+def exportar(bloques, destino, formato):
+    """Escribe todos los bloques en `destino`; devuelve el número de filas."""
+    with escritor(destino, formato) as e:
+        for bloque in bloques:
+            e.escribir(bloque)
+    return e.filas
+
+
+def archivo_temporal(bloques, formato, max_memoria=16 * 2**20):
+    """Exporta a un archivo temporal (en memoria hasta `max_memoria`, luego en disco) y lo rebobina."""
+    archivo = tempfile.SpooledTemporaryFile(max_size=max_memoria)
+    exportar(bloques, archivo, formato)
+    archivo.seek(0)
+    return archivo
+
+
+def bloques_curva_ingreso(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B, filas=FILAS_POR_BLOQUE):
+    """Curva de ingreso exacta en b = 0, 1, ..., C con las probabilidades de desbordamiento."""
+    # Mismo punto de partida y mismos incrementos que modelo.curva_ingreso, acumulados por bloque
+    acumulado = p_A * (C * norm.cdf((C - mu_A) / sigma_A))
+    args = (C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B)
+    for inicio in range(0, C + 1, filas):
+        b = np.arange(inicio, min(inicio + filas, C + 1))
+        incremento = np.where(b > 0, incremento_ingreso(b, *args), 0.0)
+        ingreso = acumular(acumulado, incremento)
+        acumulado = ingreso[-1]
+        yield {
+            "b": b,
+            "y": C - b,
+            "ingreso_esperado": ingreso,
+            "p_desborde_B": norm.sf(b, mu_B, sigma_B),
+            "p_desborde_A": norm.sf(C - b, mu_A, sigma_A),
+        }
+
+
+def bloques_protecciones(grupos, C=None, filas=FILAS_POR_BLOQUE):
+    """Niveles de protección EMSR-a/EMSR-b por escenario y clase, con límites de reserva si se da C.
+
+    `grupos` tiene el formato de BibliotecaEscenarios.cargar: {n: (ids, nombres, mu, sigma, p)}.
+    Hay una fila por escenario y nivel j: y_j protege a las clases 1..j frente a la j+1.
+    """
+    for n, (_, nombres, mu, sigma, p) in grupos.items():
+        paso = max(1, filas // (n - 1))
+        for k in range(0, len(nombres), paso):
+            lote = slice(k, k + paso)
+            y_a = emsr_a(mu[lote], sigma[lote], p[lote])
+            y_b = emsr_b(mu[lote], sigma[lote], p[lote])
+            m = y_a.shape[0]
+            bloque = {
+                "escenario": np.repeat(np.asarray(nombres[lote], dtype=object), n - 1),
+                "n_clases": np.full(m * (n - 1), n),
+                "nivel": np.tile(np.arange(1, n), m),
+                "y_emsr_a": y_a.ravel(),
+                "y_emsr_b": y_b.ravel(),
+            }
+            if C is not None:
+                # Límite de reserva de la clase j+1: lo que queda después de proteger y_j
+                bloque["limite_emsr_a"] = np.clip(C - y_a.ravel(), 0, C)
+                bloque["limite_emsr_b"] = np.clip(C - y_b.ravel(), 0, C)
+            yield bloque
@@ -0,0 +1,325 @@
+import numpy as np
+from matplotlib.figure import Figure
+from scipy.stats import norm
+
+
+# Las figuras se crean con Figure y no con pyplot: pyplot guarda un registro global de
+# figuras que no es seguro entre sesiones concurrentes (Streamlit llama a
+# plt.close("all") al terminar cada rerun de cualquier sesión).
+#
+# Cada gráfica se puede construir con dos backends:
+# - "matplotlib": figura que Streamlit rasteriza a PNG en el servidor (st.pyplot).
+# - "vega-lite": especificación con las series numéricas que el navegador dibuja
+#   (st.vega_lite_chart); el zoom y el hover no provocan un rerun.
+BACKENDS = ("matplotlib", "vega-lite")
+
+ETIQUETA_B = "Límite de reserva para clase B (b)"
+ETIQUETA_Y = "Nivel de protección para clase A (y)"
+
+
+def _compacto(v, cifras):
+    return [float(f"{x:.{cifras}g}") for x in np.asarray(v, dtype=float)]
+
+
+def _filas(x, series):
+    # Series en formato ancho con claves cortas: una fila por punto de x y una columna por serie
+    columnas = {"b": _compacto(x, 7)}
+    columnas.update({f"s{k}": _compacto(v, 4) for k, v in enumerate(series)})
+    return [dict(zip(columnas, fila)) for fila in zip(*columnas.values())]
+
+
+def _eje_doble(C, filas, capas, titulo, eje_superior=True, alto=320):
+    # El eje inferior es b (izquierda a derecha); el superior es y = C - b (derecha a izquierda).
+    # Las series se envían una sola vez como dataset con nombre y todas las capas lo referencian.
+    principal = {"layer": capas}
+    spec = {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "title": titulo,
+        "width": "container",
+        "height": alto,
+        "datasets": {"curvas": filas},
+        "encoding": {
+            "x": {"field": "b", "type": "quantitative", "title": ETIQUETA_B,
+                  "scale": {"domain": [0, C], "nice": False}},
+        },
+    }
+    if not eje_superior:
+        spec.update(principal)
+        return spec
+
+    superior = {
+        "data": {"values": [{"y": 0}, {"y": C}]},
+        "mark": {"type": "point", "opacity": 0},
+        "encoding": {
+            "x": {"field": "y", "type": "quantitative", "title": ETIQUETA_Y,
+                  "scale": {"domain": [0, C], "reverse": True, "nice": False},
+                  "axis": {"orient": "top"}},
+        },
+    }
+    spec["layer"] = [principal, superior]
+    spec["resolve"] = {"scale": {"x": "independent"}}
+    return spec
+
+
+def _lineas(colores, titulo_y):
+    # colores: {etiqueta: color} en el mismo orden que las series de _filas
+    claves = [f"s{k}" for k in range(len(colores))]
+    etiquetas = ", ".join(f"'{c}': '{e}'" for c, e in zip(claves, colores))
+    return {
+        "data": {"name": "curvas"},
+        "transform": [
+            {"fold": claves, "as": ["serie", "valor"]},
+            {"calculate": f"{{{etiquetas}}}[datum.serie]", "as": "serie"},
+        ],
+        "mark": {"type": "line", "clip": True},
+        "encoding": {
+            "y": {"field": "valor", "type": "quantitative", "title": titulo_y,
+                  "scale": {"zero": False}},
+            "color": {"field": "serie", "type": "nominal", "title": None,
+                      "scale": {"domain": list(colores), "range": list(colores.values())},
+                      "legend": {"orient": "top-right"}},
+            "tooltip": [{"field": "b", "type": "quantitative", "format": ".1f"},
+                        {"field": "serie", "type": "nominal"},
+                        {"field": "valor", "type": "quantitative", "format": ".4f"}],
+        },
+    }
+
+
+def _regla(x, color, dash=(4, 4)):
+    return {
+        "data": {"values": [{"b": float(x)}]},
+        "mark": {"type": "rule", "color": color, "strokeDash": list(dash)},
+    }
+
+
+def _punto(x, valor, color, texto=None, dx=0):
+    capa = {
+        "data": {"values": [{"b": float(x), "valor": float(valor)}]},
+        "mark": {"type": "point", "filled": True, "color": color, "size": 60},
+        "encoding": {"y": {"field": "valor", "type": "quantitative"}},
+    }
+    if texto is None:
+        return [capa]
+    etiqueta = {
+        "data": capa["data"],
+        "mark": {"type": "text", "color": color, "dx": dx, "dy": -10,
+                 "align": "left" if dx >= 0 else "right"},
+        "encoding": {"y": {"field": "valor", "type": "quantitative"}, "text": {"value": texto}},
+    }
+    return [capa, etiqueta]
+
+
+def grafica_demandas(C, x_b, pdf_B, pdf_A, mu_A, sigma_A, mu_B, sigma_B, backend="matplotlib"):
+    if backend == "vega-lite":
+        colores = {"Demanda Clase B": "steelblue", "Demanda Clase A": "darkred"}
+        capas = [
+            _lineas(colores, "Densidad de probabilidad"),
+            _regla(mu_B, "steelblue"),
+            _regla(C - mu_A, "darkred"),
+        ]
+        return _eje_doble(C, _filas(x_b, (pdf_B, pdf_A)), capas, "Distribuciones de demanda por segmento")
+
+    fig = Figure(figsize=(10, 5))
+    ax1 = fig.subplots()
+    ax1.plot(x_b, pdf_B, label="Demanda Clase B", color='steelblue')
+    ax1.plot(x_b, pdf_A, label="Demanda Clase A", color='darkred')
+
+    # Anotar medias
+    ax1.axvline(mu_B, color='steelblue', linestyle='--', linewidth=1)
+    ax1.text(mu_B + C * 0.01, norm.pdf(mu_B, mu_B, sigma_B) * 1.02, r"$\mu_B$", color='steelblue')
+
+    b_mu_A = C - mu_A
+    ax1.axvline(b_mu_A, color='darkred', linestyle='--', linewidth=1)
+    ax1.text(b_mu_A - C * 0.08, norm.pdf(mu_A, mu_A, sigma_A) * 1.02, r"$\mu_A$", color='darkred')
+
+    # Ejes
+    ax2 = ax1.twiny()
+    ax2.set_xlim(ax1.get_xlim()[::-1])
+
+    ax1.set_ylabel("Densidad de probabilidad")
+    ax1.set_title("Distribuciones de demanda por segmento")
+    ax1.legend()
+    ax1.grid(True, linestyle='--', alpha=0.5)
+    return fig
+
+
+def grafica_densidades(C, b, x_b, pdf_B, pdf_A, backend="matplotlib"):
+    if backend == "vega-lite":
+        colores = {"Demanda Clase B": "steelblue", "Demanda Clase A": "darkred"}
+        sombra = [
+            {
+                "data": {"name": "curvas"},
+                "transform": [{"filter": f"datum.b {condicion} {b}"}],
+                "mark": {"type": "area", "color": color, "opacity": 0.3},
+                "encoding": {"y": {"field": serie, "type": "quantitative"}},
+            }
+            for serie, color, condicion in (("s0", "steelblue", ">="), ("s1", "darkred", "<="))
+        ]
+        capas = sombra + [_lineas(colores, "Densidad de probabilidad"), _regla(b, "gray")]
+        return _eje_doble(C, _filas(x_b, (pdf_B, pdf_A)), capas,
+                          "Distribuciones de probabilidad y áreas P(D > b) y P(D > y)")
+
+    fig = Figure(figsize=(10, 5))
+    ax1 = fig.subplots()
+
+    # Curvas de densidad
+    ax1.plot(x_b, pdf_B, label="Demanda Clase B", color='steelblue')
+    ax1.plot(x_b, pdf_A, label="Demanda Clase A", color='darkred')
+
+    # Sombrear colas relevantes
+    ax1.fill_between(x_b, 0, pdf_B, where=(x_b >= b), color='steelblue', alpha=0.3)
+    ax1.fill_between(x_b, 0, pdf_A, where=(x_b <= b), color='darkred', alpha=0.3)
+
+    # Línea de umbral
+    ax1.axvline(b, linestyle='--', color='gray', label=f"Límite b = {b}")
+
+    # Eje superior invertido para y
+    ax2 = ax1.twiny()
+    ax2.set_xlim(ax1.get_xlim()[::-1])
+    ax2.set_xlabel("Nivel de protección para clase A ($y$)")
+
+    # Eje inferior
+    ax1.set_xlabel("Límite de reserva para clase B ($b$)")
+    ax1.set_ylabel("Densidad de probabilidad")
+    ax1.set_title("Distribuciones de probabilidad y áreas correspondientes a $P(D > b)$ y $P(D > y)$")
+    ax1.legend()
+    ax1.grid(True, linestyle='--', alpha=0.5)
+    return fig
+
+
+def grafica_desbordamiento(C, b, x_b, fb, fa, prob_b, prob_a, detalle=True, backend="matplotlib"):
+    # detalle=True: versión de pagina_probabilidades (etiquetas y título con b, y)
+    y = C - b
+    titulo = (f"Probabilidades de desbordamiento para b = {b} y y = {y}" if detalle
+              else "Probabilidades de desbordamiento para cada clase")
+
+    if backend == "vega-lite":
+        colores = {"P(D_B > b)": "steelblue", "P(D_A > y)": "darkred"}
+        capas = [_lineas(colores, "Probabilidad de desbordamiento"), _regla(b, "gray")]
+        capas += _punto(b, prob_b, "steelblue", f"P(D_B>{b})={prob_b:.2f}" if detalle else None, dx=6)
+        capas += _punto(b, prob_a, "darkred", f"P(D_A>{y})={prob_a:.2f}" if detalle else None, dx=-6)
+        return _eje_doble(C, _filas(x_b, (fb, fa)), capas, titulo, alto=320 if detalle else 260)
+
+    fig = Figure(figsize=(10, 5) if detalle else (10, 4))
+    ax1 = fig.subplots()
+    ax1.plot(x_b, fb, label=r"$P(D_B > b)$", color='steelblue')
+    ax1.plot(x_b, fa, label=r"$P(D_A > y)$", color='darkred')
+
+    ax1.axvline(b, linestyle='--', color='gray')
+    ax1.plot(b, prob_b, 'o', color='steelblue')
+    ax1.plot(b, prob_a, 'o', color='darkred')
+
+    if detalle:
+        ax1.text(b + C * 0.01, prob_b + 0.02, f"$P(D_B>{b})={prob_b:.2f}$", color='steelblue')
+        ax1.text(b - C * 0.35, prob_a + 0.02, f"$P(D_A>{y})={prob_a:.2f}$", color='darkred')
+
+    # Eje superior para y
+    ax2 = ax1.twiny()
+    ax2.set_xlim(ax1.get_xlim()[::-1])
+    ax2.set_xlabel("Nivel de protección para clase A ($y$)")
+
+    # Estética
+    ax1.set_xlabel("Límite de reserva para clase B ($b$)")
+    ax1.set_ylabel("Probabilidad de desbordamiento")
+    ax1.set_title(f"Probabilidades de desbordamiento para $b = {b}$ y $y = {y}$" if detalle else titulo)
+    ax1.grid(True, linestyle='--', alpha=0.5)
+    ax1.legend()
+    return fig
+
+
+def grafica_ingreso(C, b, b_vals, ingresos, ingreso_actual, backend="matplotlib"):
+    if backend == "vega-lite":
+        capas = [
+            _lineas({"Ingreso esperado": "mediumblue"}, "Ingreso esperado"),
+            _regla(b, "gray"),
+        ] + _punto(b, ingreso_actual, "mediumblue")
+        return _eje_doble(C, _filas(b_vals, (ingresos,)), capas, "Ingreso esperado en función de b",
+                          eje_superior=False, alto=260)
+
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    ax.plot(b_vals, ingresos, label="Ingreso esperado", color='mediumblue')
+    ax.axvline(b, linestyle='--', color='gray', label=f"b = {b}")
+    ax.plot(b, ingreso_actual, 'o', color='mediumblue')
+    ax.set_xlabel("Límite de reserva para clase B ($b$)")
+    ax.set_ylabel("Ingreso esperado")
+    ax.set_title("Ingreso esperado en función de $b$")
+    ax.grid(True, linestyle='--', alpha=0.5)
+    ax.legend()
+    return fig
+
+
+def grafica_riesgo(C, b, d, b_optimo, backend="matplotlib"):
+    # d: resultado de riesgo.distribucion_ingreso
+    inferior, superior = d["media"] - d["desviacion"], d["media"] + d["desviacion"]
+    if backend == "vega-lite":
+        banda = {
+            "data": {"name": "curvas"},
+            "mark": {"type": "area", "color": "mediumblue", "opacity": 0.15},
+            "encoding": {"y": {"field": "s3", "type": "quantitative", "scale": {"zero": False}},
+                         "y2": {"field": "s4"}},
+        }
+        capas = [
+            banda,
+            _lineas({"Ingreso medio por vuelo": "mediumblue", "Percentil 5": "darkorange", "CVaR 5%": "firebrick"},
+                    "Ingreso"),
+            _regla(b, "gray"),
+            _regla(b_optimo, "green", dash=(2, 2)),
+        ]
+        filas = _filas(d["b"], (d["media"], d["cuantil"], d["cvar"], inferior, superior))
+        return _eje_doble(C, filas, capas, "Distribución del ingreso en función de b", eje_superior=False)
+
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    ax.fill_between(d["b"], inferior, superior, color='mediumblue', alpha=0.15, label="Media ± desviación estándar")
+    ax.plot(d["b"], d["media"], label="Ingreso medio por vuelo", color='mediumblue')
+    ax.plot(d["b"], d["cuantil"], label="Percentil 5", color='darkorange')
+    ax.plot(d["b"], d["cvar"], label="CVaR 5%", color='firebrick')
+    ax.axvline(b, linestyle='--', color='gray', label=f"b = {b}")
+    ax.axvline(b_optimo, linestyle=':', color='green', label=f"b ajustado por riesgo = {b_optimo:.0f}")
+    ax.set_xlabel("Límite de reserva para clase B ($b$)")
+    ax.set_ylabel("Ingreso")
+    ax.set_title("Distribución del ingreso en función de $b$")
+    ax.grid(True, linestyle='--', alpha=0.5)
+    ax.legend()
+    return fig
+
+
+def grafica_optimo_correlacion(rhos, optimos, rho, b_rho, backend="matplotlib"):
+    if backend == "vega-lite":
+        filas = [{"rho": float(r), "b": float(o)} for r, o in zip(rhos, optimos)]
+        return {
+            "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+            "title": "Límite de reserva óptimo según la correlación",
+            "width": "container",
+            "height": 260,
+            "layer": [
+                {
+                    "data": {"values": filas},
+                    "mark": {"type": "line", "point": True, "color": "mediumblue"},
+                    "encoding": {
+                        "x": {"field": "rho", "type": "quantitative", "title": "Correlación entre D_A y D_B (ρ)"},
+                        "y": {"field": "b", "type": "quantitative", "title": "b óptimo", "scale": {"zero": False}},
+                        "tooltip": [{"field": "rho", "type": "quantitative", "format": ".2f"},
+                                    {"field": "b", "type": "quantitative", "format": ".0f"}],
+                    },
+                },
+                {
+                    "data": {"values": [{"rho": float(rho), "b": float(b_rho)}]},
+                    "mark": {"type": "point", "filled": True, "color": "firebrick", "size": 80},
+                    "encoding": {"x": {"field": "rho", "type": "quantitative"},
+                                 "y": {"field": "b", "type": "quantitative"}},
+                },
+            ],
+        }
+
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    ax.plot(rhos, optimos, 'o-', color='mediumblue', label="b óptimo")
+    ax.plot(rho, b_rho, 'o', color='firebrick', markersize=9, label=f"ρ = {rho:.2f}: b = {b_rho:.0f}")
+    ax.set_xlabel("Correlación entre $D_A$ y $D_B$ ($\\rho$)")
+    ax.set_ylabel("b óptimo")
+    ax.set_title("Límite de reserva óptimo según la correlación")
+    ax.grid(True, linestyle='--', alpha=0.5)
+    ax.legend()
+    return fig
@@ -0,0 +1,271 @@
+import numpy as np
+from scipy import signal
+from scipy.stats import norm
+from concurrent.futures import ProcessPoolExecutor
+
+from nucleos import acumular
+from recursos import compartido
+
+
+# Las clases se ordenan de mayor a menor precio: p[..., 0] > p[..., 1] > ... > p[..., n-1].
+# Todas las funciones aceptan dimensiones extra al inicio (remuestras, mercados, ...)
+# y devuelven los niveles de protección y_1, ..., y_{n-1}, donde y_j protege a las
+# clases 1..j frente a la clase j+1.
+
+
+def _cuantil(q, mu, sigma):
+    # Littlewood: si la clase que abre paga igual o más (q <= 0) no se protege nada
+    q = np.asarray(q, dtype=float)
+    valido = q > 0
+    # mu + sigma * z admite sigma = 0 (una remuestra con observaciones idénticas)
+    y = mu + sigma * norm.ppf(np.where(valido, q, 0.5))
+    return np.where(valido, y, 0.0)
+
+
+def emsr_a(mu, sigma, p):
+    mu, sigma, p = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (mu, sigma, p)))
+    n = p.shape[-1]
+
+    # Matriz (k, j): regla de Littlewood entre la clase superior k y la clase j+1 que abre
+    razon = p[..., None, 1:] / p[..., :-1, None]
+    y_kj = _cuantil(1 - razon, mu[..., :-1, None], sigma[..., :-1, None])
+    superiores = np.triu(np.ones((n - 1, n - 1), dtype=bool))
+    return np.where(superiores, y_kj, 0.0).sum(axis=-2)
+
+
+def _clase_ficticia(mu, sigma, p):
+    # Clase ficticia que agrupa a las clases 1..j
+    mu_fict = np.cumsum(mu, axis=-1)[..., :-1]
+    sigma_fict = np.sqrt(np.cumsum(sigma**2, axis=-1))[..., :-1]
+    p_fict = np.cumsum(p * mu, axis=-1)[..., :-1] / mu_fict
+    return mu_fict, sigma_fict, p_fict
+
+
+def emsr_b(mu, sigma, p):
+    mu, sigma, p = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (mu, sigma, p)))
+    mu_fict, sigma_fict, p_fict = _clase_ficticia(mu, sigma, p)
+    return _cuantil(1 - p[..., 1:] / p_fict, mu_fict, sigma_fict)
+
+
+def emsr_b_ascenso(mu, sigma, p, ascenso):
+    """EMSR-b cuando los clientes rechazados compran una clase superior.
+
+    ascenso[..., j-1] = s_j es la probabilidad de que un cliente de la clase j+1 compre
+    en las clases 1..j si la suya está cerrada. Cerrarla ya no pierde la venta completa:
+
+        P(S_j > y_j) = (p_{j+1} - s_j p̄_j) / ((1 - s_j) p̄_j)
+
+    Con s_j = 0 es EMSR-b. Si s_j p̄_j >= p_{j+1} conviene cerrar la clase j+1 siempre
+    y el nivel de protección es infinito.
+    """
+    mu, sigma, p = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (mu, sigma, p)))
+    s = np.asarray(ascenso, dtype=float)
+    mu_fict, sigma_fict, p_fict = _clase_ficticia(mu, sigma, p)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = (p[..., 1:] - s * p_fict) / ((1 - s) * p_fict)
+    cerrar = s * p_fict >= p[..., 1:]
+    return np.where(cerrar, np.inf, _cuantil(1 - np.where(cerrar, 0.5, q), mu_fict, sigma_fict))
+
+
+@compartido(disco=True)
+def niveles_proteccion(mu, sigma, p):
+    """Reglas de Littlewood de cada clase frente a la última, EMSR-a y EMSR-b."""
+    mu, sigma, p = (np.asarray(v, dtype=float) for v in (mu, sigma, p))
+    return {
+        "littlewood": _cuantil(1 - p[..., -1:] / p[..., :-1], mu[..., :-1], sigma[..., :-1]),
+        "emsr_a": emsr_a(mu, sigma, p),
+        "emsr_b": emsr_b(mu, sigma, p),
+    }
+
+
+def _remuestrear_parametros(mu, sigma, n_obs, n_remuestras, rng):
+    # Bootstrap paramétrico: distribución muestral de la media y la desviación estándar
+    # estimadas con n_obs observaciones normales
+    forma = (n_remuestras,) + mu.shape
+    mu_r = mu + sigma / np.sqrt(n_obs) * rng.standard_normal(forma)
+    sigma_r = sigma * np.sqrt(rng.chisquare(n_obs - 1, forma) / (n_obs - 1))
+    return mu_r, sigma_r
+
+
+def _remuestrear_historia(historia, n_remuestras, rng):
+    # Bootstrap no paramétrico: se remuestrea con reemplazo el historial de cada clase
+    mu_r, sigma_r = [], []
+    for obs in historia:
+        obs = np.asarray(obs, dtype=float)
+        muestra = obs[rng.integers(0, obs.size, (n_remuestras, obs.size))]
+        mu_r.append(muestra.mean(axis=1))
+        sigma_r.append(muestra.std(axis=1, ddof=1))
+    return np.stack(mu_r, axis=-1), np.stack(sigma_r, axis=-1)
+
+
+def _bandas(mu, sigma, p, n_obs, n_remuestras, percentiles, semilla, historia=None):
+    rng = np.random.default_rng(semilla)
+    if historia is None:
+        mu_r, sigma_r = _remuestrear_parametros(mu, sigma, n_obs, n_remuestras, rng)
+    else:
+        mu_r, sigma_r = _remuestrear_historia(historia, n_remuestras, rng)
+
+    # Todas las remuestras se resuelven en una sola operación vectorizada
+    return {
+        "emsr_a": np.percentile(emsr_a(mu_r, sigma_r, p), percentiles, axis=0),
+        "emsr_b": np.percentile(emsr_b(mu_r, sigma_r, p), percentiles, axis=0),
+    }
+
+
+def bootstrap_protecciones(mu, sigma, p, n_obs=30, n_remuestras=2000,
+                           percentiles=(5, 50, 95), historia=None,
+                           semilla=None, procesos=None):
+    """Bandas de percentiles de los niveles de protección EMSR-a y EMSR-b.
+
+    `mu`, `sigma` y `p` tienen forma (n,) para un mercado o (m, n) para m mercados.
+    Si se da `historia` (una secuencia de observaciones por clase) se remuestrea el
+    historial en lugar de los parámetros. Con `procesos` los mercados se reparten
+    entre un pool de procesos. Devuelve arreglos de forma (len(percentiles), ..., n-1).
+    """
+    mu, sigma, p = (np.asarray(v, dtype=float) for v in (mu, sigma, p))
+    percentiles = np.asarray(percentiles, dtype=float)
+
+    if historia is not None or not procesos or mu.ndim == 1:
+        return _bandas(mu, sigma, p, n_obs, n_remuestras, percentiles, semilla, historia)
+
+    # Un bloque de mercados por proceso, cada uno con su propia semilla independiente
+    bloques = np.array_split(np.arange(mu.shape[0]), procesos)
+    bloques = [idx for idx in bloques if idx.size]
+    semillas = np.random.SeedSequence(semilla).spawn(len(bloques))
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = [
+            pool.submit(_bandas, mu[idx], sigma[idx], p[idx] if p.ndim > 1 else p,
+                        n_obs, n_remuestras, percentiles, s)
+            for idx, s in zip(bloques, semillas)
+        ]
+        partes = [f.result() for f in futuros]
+    return {k: np.concatenate([parte[k] for parte in partes], axis=1) for k in partes[0]}
+
+
+# Con semilla fija el bootstrap es determinista y se puede compartir entre sesiones
+bootstrap_compartido = compartido(bootstrap_protecciones, disco=True)
+
+
+def malla_adaptativa(C, centros=(), escalas=(), incluir=(), n=1000, enteros=False):
+    """Puntos en [0, C] densos cerca de `centros` y dispersos en las colas planas.
+
+    El número de puntos es aproximadamente `n` sin importar el tamaño de C.
+    """
+    n_local = n // (2 * (len(centros) + 1))
+    partes = [np.linspace(0, C, n - n_local * len(centros))]
+    for c, s in zip(centros, escalas):
+        partes.append(c + max(s, C / n) * np.linspace(-4, 4, n_local))
+    partes.append(np.asarray(incluir, dtype=float))
+
+    x = np.clip(np.concatenate(partes), 0, C)
+    if enteros:
+        x = np.rint(x)
+    return np.unique(x)
+
+
+def centros_malla(C, b, mu_A, sigma_A, mu_B, sigma_B):
+    # Zonas donde cambian las curvas de dos clases: las medias y el límite b actual
+    return (mu_B, C - mu_A, b), (sigma_B, sigma_A, min(sigma_A, sigma_B))
+
+
+@compartido
+def curvas_dos_clases(C, b, mu_A, sigma_A, mu_B, sigma_B):
+    """Mallas en b y densidades y probabilidades de desbordamiento de las dos clases.
+
+    Son las curvas que dibujan las páginas de dos clases; como dependen solo de los
+    parámetros, todas las sesiones con los mismos valores comparten los arreglos.
+    """
+    centros, escalas = centros_malla(C, b, mu_A, sigma_A, mu_B, sigma_B)
+    # Malla adaptativa en b (el eje y = C - b va reflejado): densa en las medias y en b
+    x_b = malla_adaptativa(C, centros, escalas, incluir=(b,))
+    return {
+        "x_b": x_b,
+        "pdf_A": norm.pdf(C - x_b, mu_A, sigma_A),
+        "pdf_B": norm.pdf(x_b, mu_B, sigma_B),
+        "sf_A": norm.sf(C - x_b, mu_A, sigma_A),  # P(D_A > y)
+        "sf_B": norm.sf(x_b, mu_B, sigma_B),  # P(D_B > b)
+        "b_vals": malla_adaptativa(C, centros, escalas, incluir=(0, b, C), enteros=True),
+    }
+
+
+def incremento_ingreso(b, C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B):
+    # Ingreso marginal esperado al aumentar b en una unidad
+    sf_B = norm.sf(b, mu_B, sigma_B)
+    sf_A = norm.sf(C - b, mu_A, sigma_A)
+    return p_B * sf_B * (1 - sf_A) + (p_B - p_A) * sf_B * sf_A
+
+
+@compartido(disco=True)
+def curva_ingreso(b, C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B):
+    """Ingreso esperado acumulado en los enteros ordenados `b` (empezando en 0).
+
+    Con b = 0, 1, ..., C es la suma exacta de los incrementos; si hay huecos entre
+    puntos consecutivos la suma del tramo se aproxima con la regla del trapecio.
+    """
+    b = np.asarray(b, dtype=float)
+    anterior = np.concatenate(([0.0], b[:-1]))
+    hueco = b - anterior
+
+    args = (C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B)
+    tramo = hueco * (incremento_ingreso(anterior + 1, *args) + incremento_ingreso(b, *args)) / 2
+    return acumular(p_A * (C * norm.cdf((C - mu_A) / sigma_A)), tramo)
+
+
+@compartido
+def tabla_pmf(mu, sigma, C):
+    """Demanda normal discretizada en 0..C: una fila por clase.
+
+    La masa de D < 0 se asigna a 0 y la de D > C a C, así cada fila suma 1.
+    """
+    mu, sigma = (np.asarray(v, dtype=float)[..., None] for v in (mu, sigma))
+    bordes = np.arange(C + 2) - 0.5
+    bordes[0], bordes[-1] = -np.inf, np.inf
+    return np.diff(norm.cdf(bordes, mu, sigma), axis=-1)
+
+
+@compartido(disco=True)
+def valor_estatico(mu, sigma, p, C, protecciones=None):
+    """Programación dinámica estática de n clases: la más barata llega primero.
+
+    Devuelve el valor marginal dv[x] = V_n(x) - V_n(x-1) para x = 1..C (dv[0] no se
+    usa) y los niveles de protección óptimos y_1, ..., y_{n-1}. Con `protecciones` se
+    evalúa esa política de límites anidados (redondeada a lugares enteros) en lugar
+    de la óptima; su ingreso esperado es dv[1:].sum().
+    """
+    mu, sigma, p = (np.asarray(v, dtype=float) for v in (mu, sigma, p))
+    pmf = tabla_pmf(mu, sigma, C)
+    sf = np.cumsum(pmf[:, ::-1], axis=1)[:, ::-1]  # P(D_j >= d)
+    x = np.arange(C + 1)
+
+    # Para x > y: dv_j(x) = p_j P(D_j >= x - y) + sum_{d < x-y} pmf_j(d) dv_{j-1}(x - d).
+    # Con w = dv_{j-1} anulado en x <= y, la suma truncada es una convolución completa,
+    # así que cada etapa cuesta O(C log C) en lugar de O(C^2).
+    dv = np.zeros(C + 1)
+    niveles = []
+    for j in range(p.size):
+        if not j:
+            y = 0
+        elif protecciones is None:
+            y = int(np.count_nonzero(dv[1:] > p[j]))
+        else:
+            y = int(round(np.clip(protecciones[j - 1], 0, C)))
+        if j:
+            niveles.append(y)
+        arriba = x > y
+        conv = signal.convolve(pmf[j], np.where(arriba, dv, 0.0))[:C + 1]
+        dv = np.where(arriba, p[j] * sf[j, np.maximum(x - y, 0)] + conv, dv)
+    return {"dv": dv, "protecciones": np.array(niveles)}
+
+
+@compartido(disco=True)
+def costo_desplazamiento(mu, sigma, p, C):
+    """Ingreso esperado que se pierde al sacar k lugares de la venta: V(C) - V(C-k), k = 0..C.
+
+    Un grupo de k personas conviene si paga en total más que este costo. Es la suma de
+    los últimos k valores marginales de valor_estatico, así que todas las k salen de
+    una sola suma acumulada.
+    """
+    dv = valor_estatico(mu, sigma, p, C)["dv"]
+    # Con C grande la convolución por FFT deja valores marginales de -1e-17 donde deberían
+    # ser 0: se recortan para que el costo no salga negativo ni baje al crecer k
+    return np.concatenate(([0.0], np.cumsum(np.maximum(dv[:0:-1], 0.0))))
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+
+
+# Núcleos de los ciclos que no se pueden vectorizar del todo: la acumulación del
+# ingreso y el recorrido de eventos del simulador. Si numba está instalado se compilan
+# al importar el primer uso; si no (o con ASIGNA_NUCLEOS=numpy) se usa la versión en
+# NumPy. Ambas hacen las mismas operaciones en el mismo orden, así que los resultados
+# son idénticos bit a bit.
+try:
+    if os.environ.get("ASIGNA_NUCLEOS") == "numpy":
+        raise ImportError
+    from numba import njit
+except ImportError:
+    njit = None
+
+BACKEND = "numba" if njit is not None else "numpy"
+
+
+def _acumular_numpy(base, tramo):
+    return base + np.cumsum(tramo)
+
+
+def _recorrer_eventos_numpy(plano, filas, restante):
+    # filas[k, r]: inicio de la fila de la tabla de aceptación del k-ésimo evento de la réplica r
+    aceptadas = np.zeros(filas.shape, dtype=np.bool_)
+    for k in range(filas.shape[0]):
+        ok = plano[filas[k] + restante]
+        restante -= ok
+        aceptadas[k] = ok
+    return aceptadas
+
+
+def _acumular_numba(base, tramo):
+    salida = np.empty(tramo.size)
+    acumulado = 0.0
+    for i in range(tramo.size):
+        acumulado += tramo[i]
+        salida[i] = base + acumulado
+    return salida
+
+
+def _recorrer_eventos_numba(plano, filas, restante):
+    E, R = filas.shape
+    aceptadas = np.zeros((E, R), dtype=np.bool_)
+    for k in range(E):
+        for r in range(R):
+            if plano[filas[k, r] + restante[r]]:
+                restante[r] -= 1
+                aceptadas[k, r] = True
+    return aceptadas
+
+
+NUCLEOS = {"numpy": {"acumular": _acumular_numpy, "recorrer_eventos": _recorrer_eventos_numpy}}
+if njit is not None:
+    NUCLEOS["numba"] = {
+        "acumular": njit(cache=True)(_acumular_numba),
+        "recorrer_eventos": njit(cache=True)(_recorrer_eventos_numba),
+    }
+
+acumular = NUCLEOS[BACKEND]["acumular"]
+recorrer_eventos = NUCLEOS[BACKEND]["recorrer_eventos"]
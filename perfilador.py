@@ -0,0 +1,123 @@
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import streamlit as st
+
+from recursos import CACHE
+
+
+# Perfilador opcional por sesión. Se activa con ?perfil=1 en la URL o con la variable
+# de entorno ASIGNA_PERFIL=1; sin activarlo, `fase` e `instrumentar` no hacen nada.
+# El panel de la barra lateral se actualiza en el siguiente rerun completo: los reruns
+# de un fragmento no vuelven a dibujar la barra lateral.
+RERUNS_GUARDADOS = 50
+RESTO = "resto (markdown, navegación)"
+
+
+def activo():
+    if "perfilador_activo" not in st.session_state:
+        st.session_state["perfilador_activo"] = (
+            st.query_params.get("perfil") == "1" or os.environ.get("ASIGNA_PERFIL") == "1"
+        )
+    return st.session_state["perfilador_activo"]
+
+
+def historial():
+    # Buffer circular con los últimos reruns de la sesión
+    if "perfil_historial" not in st.session_state:
+        st.session_state["perfil_historial"] = deque(maxlen=RERUNS_GUARDADOS)
+    return st.session_state["perfil_historial"]
+
+
+@contextmanager
+def fase(nombre):
+    registro = st.session_state.get("perfil_actual")
+    if registro is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        fases = registro["fases"]
+        fases[nombre] = fases.get(nombre, 0.0) + time.perf_counter() - inicio
+
+
+def _medir(nombre, funcion, *args, **kwargs):
+    registro = {"pagina": nombre, "marca": time.time(), "fases": {}}
+    st.session_state["perfil_actual"] = registro
+    inicio = time.perf_counter()
+    try:
+        return funcion(*args, **kwargs)
+    finally:
+        registro["total"] = time.perf_counter() - inicio
+        registro["fases"][RESTO] = registro["total"] - sum(registro["fases"].values())
+        del st.session_state["perfil_actual"]
+        historial().append(registro)
+
+
+def instrumentar(pagina):
+    # Conserva __name__ para que st.Page genere la misma URL que con la función original
+    @wraps(pagina)
+    def envoltura():
+        if not activo():
+            return pagina()
+        return _medir(pagina.__name__, pagina)
+
+    return envoltura
+
+
+def fragmento(funcion):
+    """`st.fragment` que registra sus reruns propios como una entrada aparte del historial."""
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        # Dentro de un rerun completo las fases se suman al registro de la página
+        if not activo() or "perfil_actual" in st.session_state:
+            return funcion(*args, **kwargs)
+        pagina = funcion.__qualname__.split(".")[0]
+        return _medir(f"{pagina} (fragmento)", funcion, *args, **kwargs)
+
+    return st.fragment(envoltura)
+
+
+def panel():
+    if not activo() or not historial():
+        return
+
+    ultimo = historial()[-1]
+    with st.sidebar.expander("⏱ Perfilador", expanded=True):
+        st.caption(f"Último rerun: `{ultimo['pagina']}` en {ultimo['total'] * 1000:.1f} ms")
+        st.table({
+            "Fase": list(ultimo["fases"]),
+            "ms": [f"{t * 1000:.1f}" for t in ultimo["fases"].values()],
+            "%": [f"{100 * t / ultimo['total']:.0f}" for t in ultimo["fases"].values()],
+        })
+
+        # Promedio por página sobre los reruns guardados
+        por_pagina = {}
+        for r in historial():
+            por_pagina.setdefault(r["pagina"], []).append(r["total"])
+        st.table({
+            "Página": list(por_pagina),
+            "reruns": [len(v) for v in por_pagina.values()],
+            "ms promedio": [f"{1000 * sum(v) / len(v):.1f}" for v in por_pagina.values()],
+        })
+
+        m = CACHE.metricas()
+        st.caption(
+            f"Caché compartida: {m['entradas']} entradas, "
+            f"{m['bytes'] / 2**20:.1f} de {m['presupuesto_bytes'] / 2**20:.0f} MB, "
+            f"{100 * m['tasa_aciertos']:.0f}% aciertos ({m['aciertos']}/{m['aciertos'] + m['fallos']}), "
+            f"{m['desalojos']} desalojos"
+        )
+
+        st.download_button(
+            "Exportar JSON",
+            json.dumps(list(historial()), indent=1),
+            file_name="perfil_asigna.json",
+            mime="application/json",
+        )
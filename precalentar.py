@@ -0,0 +1,181 @@
+"""Precalienta la caché en disco con una lista de escenarios.
+
+Pensado para correr al arrancar el contenedor, antes de `streamlit run asigna.py`, de
+modo que los primeros usuarios después de un despliegue no paguen el cálculo completo:
+
+    python -m precalentar [escenarios.json]
+
+Cada escenario de "ingreso" calcula la curva de ingreso de pagina_ingreso_exploracion
+para los b de su lista "b" (por defecto, el b inicial de la página): la malla de la curva
+se refina alrededor de b, así que cada b es una entrada distinta en la caché y
+recorrer b = 0..C llenaría la caché con C + 1 curvas que nadie pidió. Cada escenario de "emsr" calcula los niveles de protección
+y las bandas bootstrap por defecto de pagina_practica_emsr. Los argumentos se arman
+igual que en la página para que las claves coincidan.
+
+Además, asigna.py llama a en_segundo_plano(pages) en cada ejecución; la primera del
+proceso (la de la primera sesión que abre la app, porque Streamlit no ejecuta el
+script al arrancar el servidor) lanza un hilo que recorre las páginas registradas con
+sus valores por defecto y registra en el log cuánto tardó cada página.
+"""
+import argparse
+import io
+import json
+import os
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+from streamlit.logger import get_logger
+
+from cache_disco import DISCO
+from ejemplos import valores
+from graficas import grafica_demandas, grafica_densidades, grafica_desbordamiento, grafica_ingreso
+from modelo import bootstrap_compartido, curva_ingreso, curvas_dos_clases, niveles_proteccion
+from sesion import Escenario, por_defecto, rango
+
+ESCENARIOS = Path(__file__).resolve().parent / "escenarios_precalentar.json"
+
+
+def precalentar_ingreso(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B, b=None):
+    limites = [rango("b", C)[2]] if b is None else list(np.atleast_1d(b))
+    for b in limites:
+        b_vals = curvas_dos_clases(C, int(b), mu_A, sigma_A, mu_B, sigma_B)["b_vals"]
+        curva_ingreso(b_vals, C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B)
+    return len(limites)
+
+
+def precalentar_emsr(mu, sigma, p):
+    niveles_proteccion(mu, sigma, p)
+    bootstrap_compartido(mu, sigma, p, n_obs=30, n_remuestras=2000, historia=None, semilla=0)
+    return 2
+
+
+def precalentar(escenarios):
+    """Calcula (o encuentra ya guardados) todos los escenarios; devuelve cuántas consultas hizo."""
+    total = 0
+    for esc in escenarios.get("ingreso", []):
+        total += precalentar_ingreso(**esc)
+    for esc in escenarios.get("emsr", []):
+        total += precalentar_emsr(**esc)
+    return total
+
+
+# Valores por defecto de las páginas (sesion.por_defecto), con los mismos tipos que
+# devuelven sus widgets (enteros en los sliders, flotantes en los precios) para que las
+# claves coincidan. El Escenario de aquí se descarta, pero sus mallas, densidades y
+# curva de ingreso salen de modelo.curvas_dos_clases y modelo.curva_ingreso
+# (@compartido), así que el de la página las encuentra en recursos.CACHE. Las figuras no
+# se guardan: se dibujan una vez para cargar las fuentes y el intérprete de mathtext de
+# matplotlib, que es lo que paga la primera visita.
+_LOG = get_logger(__name__)
+C_DEFECTO = 100
+
+
+def _dibujar(figura):
+    figura.savefig(io.BytesIO(), format="png")
+
+
+def _escenario(C=C_DEFECTO):
+    return Escenario(C, *por_defecto(C))
+
+
+def _supuestos():
+    e = _escenario()
+    _dibujar(grafica_demandas(e.C, e.x_b, e.pdf_B, e.pdf_A, e.mu_A, e.sigma_A, e.mu_B, e.sigma_B))
+
+
+def _distribuciones():
+    e = _escenario()
+    _dibujar(grafica_densidades(e.C, e.b, e.x_b, e.pdf_B, e.pdf_A))
+
+
+def _probabilidades():
+    e = _escenario()
+    _dibujar(grafica_desbordamiento(e.C, e.b, e.x_b, e.sf_B, e.sf_A, e.prob_B, e.prob_A))
+
+
+def _ingreso_exploracion():
+    e = _escenario()
+    _dibujar(grafica_desbordamiento(e.C, e.b, e.x_b, e.sf_B, e.sf_A, e.prob_B, e.prob_A, detalle=False))
+    _dibujar(grafica_ingreso(e.C, e.b, e.b_vals, e.ingresos, e.ingreso_actual))
+
+
+def _practica_emsr():
+    precalentar_emsr([275, 525, 1000], [75, 50, 300], [250.0, 200.0, 100.0])
+
+
+# url_path de cada st.Page (el nombre de la función de la página) -> precalentamiento.
+# Las tres primeras solo llenan la caché en memoria (curvas_dos_clases, nada en disco) y
+# dibujan sus figuras; las de ejemplo llenan la caché de ejemplos._resolver.
+PAGINAS = {
+    "supuestos": _supuestos,
+    "pagina_distribuciones": _distribuciones,
+    "pagina_probabilidades": _probabilidades,
+    "pagina_ingreso_exploracion": _ingreso_exploracion,
+    "pagina_practica_emsr": _practica_emsr,
+    "pagina_ejemplo_resuelto_estatico": partial(valores, "vuelo"),
+    "pagina_ejemplo_editorial": partial(valores, "editorial"),
+    "pagina_ejemplo_emsr": partial(valores, "quidditch"),
+    "pagina_ejemplo_emsr_b": partial(valores, "quidditch"),
+}
+
+
+def precalentar_paginas(paginas):
+    """Precalienta en orden las páginas de la lista que calculan algo; devuelve {página: segundos}."""
+    tiempos = {}
+    for pagina in paginas:
+        funcion = PAGINAS.get(pagina.url_path)
+        if funcion is None:
+            continue
+        inicio = time.perf_counter()
+        try:
+            funcion()
+        except Exception:
+            _LOG.exception("No se pudo precalentar la página %s", pagina.url_path)
+            continue
+        tiempos[pagina.url_path] = time.perf_counter() - inicio
+        _LOG.info("Página %s precalentada en %.2f s", pagina.url_path, tiempos[pagina.url_path])
+    _LOG.info("Precalentamiento terminado: %d páginas en %.2f s", len(tiempos), sum(tiempos.values()))
+    return tiempos
+
+
+_arranque = threading.Lock()
+_iniciado = False
+
+
+def en_segundo_plano(paginas):
+    """Lanza precalentar_paginas en un hilo, solo la primera vez en el proceso.
+
+    Esa primera vez es el primer rerun de la primera sesión, no el arranque del
+    servidor. Cada rerun vuelve a ejecutar asigna.py; las siguientes llamadas no hacen
+    nada.
+    ASIGNA_PRECALENTAR=0 lo desactiva.
+    """
+    global _iniciado
+    with _arranque:
+        if _iniciado or os.environ.get("ASIGNA_PRECALENTAR") == "0":
+            return
+        _iniciado = True
+    threading.Thread(target=precalentar_paginas, args=(list(paginas),), name="precalentar", daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("escenarios", nargs="?", default=ESCENARIOS, type=Path)
+    args = parser.parse_args()
+
+    if DISCO is None:
+        parser.error("la caché en disco está desactivada (ASIGNA_CACHE_DIR vacío)")
+
+    inicio = time.perf_counter()
+    entradas = precalentar(json.loads(args.escenarios.read_text(encoding="utf-8")))
+    m = DISCO.metricas()
+    print(f"{entradas} consultas en {time.perf_counter() - inicio:.1f} s "
+          f"({m['aciertos']} ya estaban en disco, {m['fallos']} calculados)  "
+          f"disco: {m['entradas']} entradas, {m['bytes'] / 2**20:.1f} MB en {DISCO.ruta}")
+
+
+if __name__ == "__main__":
+    main()
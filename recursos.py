@@ -0,0 +1,162 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+
+from cache_disco import DISCO
+
+
+# Caché de arreglos de solo lectura compartida por todas las sesiones del proceso.
+# Streamlit vuelve a ejecutar asigna.py en cada rerun, pero los módulos importados
+# viven mientras vive el servidor, así que CACHE es único por proceso.
+PRESUPUESTO_MB = int(os.environ.get("ASIGNA_CACHE_MB", "256"))
+
+
+def clave_canonica(*args, **kwargs):
+    """Hash estable de los argumentos: 60, 60.0 y np.float64(60) dan la misma clave."""
+    h = hashlib.sha256()
+
+    def agregar(v):
+        if isinstance(v, np.ndarray):
+            v = np.ascontiguousarray(v)
+            h.update(f"a{v.dtype.str}{v.shape}".encode())
+            h.update(v.tobytes())
+        elif isinstance(v, (bool, np.bool_)) or v is None or isinstance(v, str):
+            h.update(f"{type(v).__name__}:{v};".encode())
+        elif isinstance(v, (int, float, np.integer, np.floating)):
+            h.update(f"n:{float(v)!r};".encode())
+        elif isinstance(v, (list, tuple)):
+            h.update(f"s{len(v)}(".encode())
+            for x in v:
+                agregar(x)
+            h.update(b")")
+        elif isinstance(v, dict):
+            h.update(f"d{len(v)}(".encode())
+            for k in sorted(v):
+                agregar(k)
+                agregar(v[k])
+            h.update(b")")
+        else:
+            raise TypeError(f"No se puede generar una clave para {type(v).__name__}")
+
+    agregar(args)
+    agregar(kwargs)
+    return h.hexdigest()
+
+
+def _congelar(valor):
+    # Los resultados se comparten entre sesiones: nadie debe poder modificarlos
+    if isinstance(valor, np.ndarray):
+        valor.setflags(write=False)
+        return valor.nbytes
+    if isinstance(valor, dict):
+        return sum(_congelar(v) for v in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sum(_congelar(v) for v in valor)
+    return 64
+
+
+class CacheRecursos:
+    def __init__(self, presupuesto_bytes):
+        self.presupuesto_bytes = presupuesto_bytes
+        self._datos = OrderedDict()  # clave -> (valor, bytes), en orden de uso (LRU)
+        self._calculando = {}  # clave -> Event, para calcular cada clave una sola vez
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def obtener(self, clave, calcular):
+        while True:
+            with self._lock:
+                if clave in self._datos:
+                    self._datos.move_to_end(clave)
+                    self.aciertos += 1
+                    return self._datos[clave][0]
+                evento = self._calculando.get(clave)
+                if evento is None:
+                    self.fallos += 1
+                    evento = self._calculando[clave] = threading.Event()
+                    break
+            # Otra sesión ya está calculando este valor: se espera en lugar de repetirlo
+            evento.wait()
+            with self._lock:
+                if clave in self._datos:
+                    continue
+            # El cálculo de la otra sesión falló o no cupo en el presupuesto
+            return calcular()
+
+        try:
+            valor = calcular()
+            tam = _congelar(valor)
+            with self._lock:
+                if tam <= self.presupuesto_bytes:
+                    self._datos[clave] = (valor, tam)
+                    self._bytes += tam
+                    while self._bytes > self.presupuesto_bytes:
+                        _, (_, liberado) = self._datos.popitem(last=False)
+                        self._bytes -= liberado
+                        self.desalojos += 1
+            return valor
+        finally:
+            with self._lock:
+                del self._calculando[clave]
+            evento.set()
+
+    def buscar(self, clave, faltante=None):
+        """El valor guardado en `clave`, o `faltante` sin calcular nada."""
+        with self._lock:
+            if clave not in self._datos:
+                return faltante
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return self._datos[clave][0]
+
+    def metricas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._datos),
+                "bytes": self._bytes,
+                "presupuesto_bytes": self.presupuesto_bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            }
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+            self._bytes = 0
+
+
+CACHE = CacheRecursos(PRESUPUESTO_MB * 2**20)
+
+
+def compartido(funcion=None, *, disco=False):
+    """Memoriza `funcion` en CACHE; su resultado debe ser de solo lectura.
+
+    Con disco=True el resultado también se guarda en DISCO y sobrevive a los reinicios:
+    solo para resultados caros de calcular, no para los intermedios baratos.
+    """
+    if funcion is None:
+        return lambda f: compartido(f, disco=disco)
+    prefijo = f"{funcion.__module__}.{funcion.__qualname__}"
+
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        clave = prefijo + ":" + clave_canonica(*args, **kwargs)
+
+        def calcular():
+            if not disco or DISCO is None:
+                return funcion(*args, **kwargs)
+            return DISCO.obtener(clave, lambda: funcion(*args, **kwargs))
+
+        return CACHE.obtener(clave, calcular)
+
+    return envoltura
@@ -0,0 +1,90 @@
+import numpy as np
+from scipy.stats import norm
+
+from recursos import compartido
+
+
+# Distribución del ingreso del modelo de dos clases (B llega antes que A) para cada
+# límite de reserva b:
+#
+#     R(b) = p_B * S_B + p_A * min(D_A, C - S_B),    S_B = min(D_B, b)
+#
+# Se integra numéricamente sobre las dos demandas normales discretizadas. Condicionado
+# a S_B = s todo depende de la demanda de A, así que para cada s se calculan los
+# momentos y la función de distribución condicionales y el promedio sobre s con los
+# pesos de cada b es una suma acumulada: todos los b salen de una sola pasada.
+
+
+def _pmf(mu, sigma, K, paso):
+    # Demanda normal en 0, paso, ..., K * paso; las colas se asignan a los extremos
+    bordes = (np.arange(K + 2) - 0.5) * paso
+    bordes[0], bordes[-1] = -np.inf, np.inf
+    return np.diff(norm.cdf(bordes, mu, sigma))
+
+
+def _promedio_truncado(pmf_B, sf_B, h):
+    # E[h(S_B)] para S_B = min(D_B, b) con b = 0..K: sum_{s<b} pmf(s) h(s) + P(D_B >= b) h(b)
+    acumulado = np.cumsum(pmf_B[:, None] * h, axis=0) - pmf_B[:, None] * h
+    return acumulado + sf_B[:, None] * h
+
+
+@compartido(disco=True)
+def distribucion_ingreso(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B, alfa=0.05, puntos=1000, niveles=1024):
+    """Media, desviación estándar, cuantil alfa y CVaR alfa del ingreso para cada b.
+
+    Las demandas se discretizan en a lo más `puntos` + 1 valores (pasos de C / puntos
+    lugares; exacto para C <= puntos) y la función de distribución se evalúa en
+    `niveles` valores de ingreso. El CVaR es el ingreso promedio del peor alfa de los
+    casos. Devuelve arreglos alineados con "b".
+    """
+    K = min(C, puntos)
+    paso = C / K
+    x = np.arange(K + 1) * paso
+    pmf_A, pmf_B = _pmf(mu_A, sigma_A, K, paso), _pmf(mu_B, sigma_B, K, paso)
+    sf_A = np.cumsum(pmf_A[::-1])[::-1]  # P(D >= d)
+    sf_B = np.cumsum(pmf_B[::-1])[::-1]
+
+    # Ventas de A con r lugares libres: E[min(D_A, r)] y E[min(D_A, r)^2] para r = 0..K
+    i = np.arange(1, K + 1)
+    g1 = np.concatenate(([0.0], np.cumsum(sf_A[1:]))) * paso
+    g2 = np.concatenate(([0.0], np.cumsum((2 * i - 1) * sf_A[1:]))) * paso**2
+
+    # Momentos condicionados a S_B = x[k] (quedan K - k lugares para A)
+    libres = K - np.arange(K + 1)
+    m1 = p_B * x + p_A * g1[libres]
+    m2 = (p_B * x) ** 2 + 2 * p_B * p_A * x * g1[libres] + p_A**2 * g2[libres]
+    momentos = _promedio_truncado(pmf_B, sf_B, np.stack([m1, m2], axis=1))
+    media = momentos[:, 0]
+    desviacion = np.sqrt(np.maximum(momentos[:, 1] - media**2, 0.0))
+
+    # Distribución condicional: P(p_B x + p_A min(D_A, r) <= z) en una malla de ingresos
+    z = np.linspace(0.0, max(p_A, p_B) * C, niveles)
+    cdf_A = np.cumsum(pmf_A)
+    u = np.floor((z[None, :] - p_B * x[:, None]) / (p_A * paso) + 1e-9).astype(np.int64)
+    G = np.where(u >= libres[:, None], 1.0, np.where(u < 0, 0.0, cdf_A[np.clip(u, 0, K)]))
+    F = _promedio_truncado(pmf_B, sf_B, G)
+
+    # Cuantil: primer nivel con F >= alfa, interpolando con el nivel anterior
+    j = np.argmax(F >= alfa - 1e-12, axis=1)
+    filas = np.arange(K + 1)
+    anterior = np.maximum(j - 1, 0)
+    F0, F1 = F[filas, anterior], F[filas, j]
+    fraccion = np.where(F1 > F0, (alfa - F0) / np.where(F1 > F0, F1 - F0, 1.0), 0.0)
+    cuantil = z[anterior] + np.clip(fraccion, 0, 1) * (z[j] - z[anterior])
+
+    # CVaR = q - (1/alfa) * integral_0^q F(z) dz (el ingreso nunca es negativo)
+    dz = z[1] - z[0]
+    integral = np.concatenate((np.zeros((K + 1, 1)), np.cumsum((F[:, 1:] + F[:, :-1]) * dz / 2, axis=1)), axis=1)
+    parcial = (F0 + (cuantil - z[anterior]) / dz * (F1 - F0) / 2) * (cuantil - z[anterior])
+    cvar = cuantil - (integral[filas, anterior] + parcial) / alfa
+    return {"b": x, "media": media, "desviacion": desviacion, "cuantil": cuantil, "cvar": cvar}
+
+
+def optimo_ajustado(distribucion, aversion):
+    """Índice del b que maximiza (1 - aversion) * media + aversion * CVaR.
+
+    Con aversion = 0 es el óptimo en valor esperado; con aversion = 1, el b que mejor
+    protege el peor alfa de los casos.
+    """
+    objetivo = (1 - aversion) * distribucion["media"] + aversion * distribucion["cvar"]
+    return int(np.argmax(objetivo))
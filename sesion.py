@@ -0,0 +1,154 @@
+from functools import cached_property
+
+import streamlit as st
+from scipy.stats import norm
+
+from modelo import curva_ingreso, curvas_dos_clases
+from tablas import responder
+
+
+# Parámetros del modelo de dos clases que comparten las páginas de supuestos,
+# distribuciones, probabilidades y exploración del ingreso. Cada uno tiene un solo
+# rango y un solo valor por defecto; su valor vive en st.session_state, así que lo que
+# se ajusta en una página sigue ahí al pasar a la siguiente. La capacidad C también se
+# guarda: al cambiarla, b y las demandas guardadas se reescalan con ella (un escenario
+# con C = 100 y μ_A = 25 pasa a C = 1000 con μ_A = 250); los precios no cambian.
+#
+# (mínimo, máximo, valor por defecto), pensados para C = 100 y escalados con la capacidad
+DEMANDA = {"mu_A": (5, 80, 25), "sigma_A": (1, 30, 8), "mu_B": (5, 150, 60), "sigma_B": (1, 30, 8)}
+PRECIOS = {"p_A": (1.0, 100.0, 5.0), "p_B": (1.0, 100.0, 2.0)}  # sin escalar
+FRACCION_B = 0.65  # b por defecto, como fracción de C
+CAPACIDAD = (10, 10**6, 100)
+ESCALADOS = ("b", *DEMANDA)  # se reescalan al cambiar C
+ORDEN = ("b", "mu_A", "sigma_A", "p_A", "mu_B", "sigma_B", "p_B")
+
+
+def rango_escalado(C, minimo, maximo, valor):
+    # Los rangos de los sliders están pensados para C = 100; se escalan con la capacidad
+    f = C / 100
+    return max(1, round(minimo * f)), max(2, round(maximo * f)), max(1, round(valor * f))
+
+
+def rango(nombre, C):
+    """(mínimo, máximo, valor por defecto) del parámetro con capacidad C."""
+    if nombre == "b":
+        return 0, C, int(C * FRACCION_B)
+    if nombre in PRECIOS:
+        return PRECIOS[nombre]
+    return rango_escalado(C, *DEMANDA[nombre])
+
+
+def valor(nombre, C):
+    """Valor del parámetro en la sesión, o el de por defecto si ninguna página lo ha fijado."""
+    minimo, maximo, defecto = rango(nombre, C)
+    # Se recorta al rango actual: al cambiar C los rangos de los sliders cambian
+    return min(max(st.session_state.get(f"parametro_{nombre}", defecto), minimo), maximo)
+
+
+def guardar(nombre, v):
+    st.session_state[f"parametro_{nombre}"] = v
+
+
+def capacidad():
+    """C de la sesión, o la de por defecto."""
+    return st.session_state.get("parametro_C", CAPACIDAD[2])
+
+
+def cambiar_capacidad(C):
+    """Guarda la nueva C y reescala a ella b y las demandas que la sesión ya fijó."""
+    anterior = capacidad()
+    guardar("C", C)
+    if C == anterior:
+        return
+    for nombre in ESCALADOS:
+        clave = f"parametro_{nombre}"
+        if clave in st.session_state:
+            minimo, maximo, _ = rango(nombre, C)
+            st.session_state[clave] = min(max(round(st.session_state[clave] * C / anterior), minimo), maximo)
+
+
+def por_defecto(C):
+    """Valores por defecto en el orden de ORDEN (los argumentos de Escenario después de C)."""
+    return tuple(rango(n, C)[2] for n in ORDEN)
+
+
+class Escenario:
+    """Parámetros de dos clases y las curvas que se derivan de ellos.
+
+    Cada curva se calcula la primera vez que una página la pide y queda guardada en el
+    objeto; las demás páginas de la sesión la reutilizan mientras no cambien los
+    parámetros (ver escenario_sesion). Las mallas, densidades y la curva de ingreso
+    vienen de funciones @compartido, así que también las comparten otras sesiones y el
+    precalentamiento con los mismos parámetros.
+    """
+
+    def __init__(self, C, b, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B):
+        self.parametros = (C, b, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B)
+        self.C, self.b = C, b
+        self.mu_A, self.sigma_A, self.p_A = mu_A, sigma_A, p_A
+        self.mu_B, self.sigma_B, self.p_B = mu_B, sigma_B, p_B
+        self.y = C - b
+
+    @property
+    def _modelo(self):
+        return self.C, self.mu_A, self.sigma_A, self.p_A, self.mu_B, self.sigma_B, self.p_B
+
+    @cached_property
+    def _curvas(self):
+        return curvas_dos_clases(self.C, self.b, self.mu_A, self.sigma_A, self.mu_B, self.sigma_B)
+
+    @property
+    def x_b(self):
+        return self._curvas["x_b"]
+
+    @property
+    def pdf_A(self):
+        return self._curvas["pdf_A"]
+
+    @property
+    def pdf_B(self):
+        return self._curvas["pdf_B"]
+
+    @property
+    def sf_A(self):
+        return self._curvas["sf_A"]
+
+    @property
+    def sf_B(self):
+        return self._curvas["sf_B"]
+
+    @cached_property
+    def prob_A(self):
+        return norm.sf(self.y, self.mu_A, self.sigma_A)
+
+    @cached_property
+    def prob_B(self):
+        return norm.sf(self.b, self.mu_B, self.sigma_B)
+
+    @property
+    def b_vals(self):
+        return self._curvas["b_vals"]
+
+    @cached_property
+    def ingresos(self):
+        return curva_ingreso(self.b_vals, *self._modelo)
+
+    @cached_property
+    def ingreso_actual(self):
+        return self.ingresos[self.b_vals.searchsorted(self.b)]
+
+    @cached_property
+    def optimo(self):
+        """b óptimo e ingresos de tablas.responder."""
+        C, *resto = self._modelo
+        return responder(C, self.b, *resto)
+
+
+def escenario_sesion(C):
+    """El Escenario con los parámetros de la sesión: el mismo objeto, con lo ya calculado,
+    mientras no cambien."""
+    parametros = (C,) + tuple(valor(n, C) for n in ORDEN)
+    actual = st.session_state.get("escenario")
+    if actual is None or actual.parametros != parametros:
+        actual = st.session_state["escenario"] = Escenario(*parametros)
+    return actual
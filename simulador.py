@@ -0,0 +1,229 @@
+import numpy as np
+from scipy.stats import nbinom, norm, poisson
+
+from nucleos import recorrer_eventos
+
+
+# Simulador de eventos discretos de solicitudes de reserva. En lugar de una cola de
+# prioridad con un objeto por evento, las llegadas de todas las réplicas se guardan en
+# arreglos y se ordenan por (réplica, tiempo) con un sort estable; el resultado es el
+# mismo orden en que una cola de prioridad las entregaría. Después se recorren los
+# eventos k = 0, 1, ... de todas las réplicas a la vez: la única dependencia secuencial
+# es la capacidad restante de cada réplica.
+#
+# Las clases se ordenan de mayor a menor precio, como en modelo.py. La política es una
+# tabla booleana acepta[clase, capacidad_restante]; límites de reserva y precio oferta
+# son dos formas de llenarla.
+
+
+def _conteos(mu, sigma, replicas, rng, correlacion=None):
+    # Poisson con media mu; si sigma^2 > mu la tasa se mezcla con una gamma (binomial
+    # negativa) para reproducir la varianza del modelo normal
+    tasa = np.broadcast_to(mu, (replicas, mu.size))
+    exceso = np.zeros(mu.shape)
+    if sigma is not None:
+        exceso = np.broadcast_to(np.asarray(sigma, dtype=float), mu.shape) ** 2 - mu
+    mezcla = (exceso > 0) & (mu > 0)
+    if correlacion is not None:
+        return _conteos_correlacionados(mu, exceso, mezcla, replicas, rng, correlacion)
+    if mezcla.any():
+        forma = mu[mezcla] ** 2 / exceso[mezcla]
+        tasa = tasa.copy()
+        tasa[:, mezcla] = rng.gamma(forma, mu[mezcla] / forma, (replicas, forma.size))
+    return rng.poisson(tasa)
+
+
+def _conteos_correlacionados(mu, exceso, mezcla, replicas, rng, correlacion):
+    # Cópula gaussiana: normales con la matriz de correlación dada, llevadas a uniformes
+    # y de ahí a las mismas marginales (Poisson o binomial negativa) con la inversa
+    z = rng.standard_normal((replicas, mu.size)) @ np.linalg.cholesky(correlacion).T
+    u = np.clip(norm.cdf(z), 1e-12, 1 - 1e-12)
+    forma = np.where(mezcla, mu**2 / np.where(mezcla, exceso, 1.0), 1.0)
+    conteos = np.where(mezcla, nbinom.ppf(u, forma, forma / (forma + mu)), poisson.ppf(u, mu))
+    return conteos.astype(np.int64)
+
+
+def ventanas_secuenciales(n):
+    """Una franja del horizonte [0, 1] por clase: la más barata llega primero."""
+    bordes = np.linspace(0, 1, n + 1)
+    return np.stack([bordes[::-1][1:], bordes[::-1][:-1]], axis=1)
+
+
+def ventanas_intercaladas(n):
+    """Todas las clases llegan a lo largo de todo el horizonte."""
+    return np.tile([0.0, 1.0], (n, 1))
+
+
+def generar_llegadas(mu, sigma=None, ventanas=None, replicas=1, semilla=None, correlacion=None):
+    """Solicitudes con tiempo y clase de `replicas` réplicas independientes.
+
+    Cada clase j llega como un proceso de Poisson homogéneo dentro de ventanas[j]
+    (fracciones del horizonte). Devuelve (clases, tiempos) de forma (E, replicas): el
+    k-ésimo evento de cada réplica en orden de llegada, con clase -1 y tiempo inf
+    como relleno cuando una réplica tiene menos de E eventos. Admite hasta 2**20
+    réplicas por llamada; para más, usar simular_politica, que trabaja por lotes.
+    Con `correlacion` (matriz n × n) los conteos de las clases de cada réplica quedan
+    correlacionados mediante una cópula gaussiana, con las mismas marginales.
+    """
+    rng = np.random.default_rng(semilla)
+    mu = np.asarray(mu, dtype=float)
+    n = mu.size
+    ventanas = ventanas_intercaladas(n) if ventanas is None else np.asarray(ventanas, dtype=float)
+
+    conteos = _conteos(mu, sigma, replicas, rng, correlacion)  # (replicas, n)
+    total = conteos.sum()
+    clase = np.repeat(np.tile(np.arange(n), replicas), conteos.ravel())
+    inicio, fin = ventanas[clase, 0], ventanas[clase, 1]
+    tiempo = inicio + (fin - inicio) * rng.random(total)
+
+    # Cola de eventos: (réplica, tiempo, clase) se empaqueta sin pérdida en un float64
+    # cuyo orden es el orden de llegada; ordenar valores es mucho más rápido que argsort
+    bits = 50 - int(np.ceil(np.log2(replicas + 1)))
+    pasos = float(2**bits // n)  # resolución del tiempo dentro de la réplica
+    por_replica = conteos.sum(axis=1)
+    clave = (np.floor(tiempo * pasos) * n + clase) / 2.0**bits
+    clave += np.repeat(np.arange(replicas, dtype=float), por_replica)
+    clave.sort()
+
+    replica = np.floor(clave)
+    codigo = (clave - replica) * 2.0**bits
+    replica = replica.astype(np.int64)
+    clase = (codigo % n).astype(np.int8)
+    tiempo = (codigo // n) / pasos
+
+    posicion = np.arange(total) - np.repeat(np.cumsum(por_replica) - por_replica, por_replica)
+    E = int(por_replica.max(initial=0))
+    clases = np.full((E, replicas), -1, dtype=np.int8)
+    tiempos = np.full((E, replicas), np.inf, dtype=np.float32)
+    clases[posicion, replica] = clase
+    tiempos[posicion, replica] = tiempo
+    return clases, tiempos
+
+
+def tabla_limites(protecciones, C):
+    """Política de límites de reserva anidados.
+
+    protecciones[j-1] = y_j protege a las clases 1..j; la clase j+1 se acepta mientras
+    la capacidad restante sea mayor que y_j. La clase 1 se acepta mientras quede lugar.
+    """
+    y = np.concatenate(([0.0], np.asarray(protecciones, dtype=float)))
+    restante = np.arange(C + 1)
+    return restante[None, :] > y[:, None]
+
+
+def tabla_precio_oferta(p, precio_oferta, C):
+    """Política de precio oferta: se acepta si el precio cubre el costo de oportunidad.
+
+    `precio_oferta` es un escalar o un arreglo de longitud C+1 indexado por la
+    capacidad restante (se ignora la posición 0: sin capacidad no se vende nada).
+    """
+    umbral = np.broadcast_to(np.asarray(precio_oferta, dtype=float), (C + 1,))
+    acepta = np.asarray(p, dtype=float)[:, None] >= umbral[None, :]
+    acepta[:, 0] = False
+    return acepta
+
+
+def simular(acepta, p, clases):
+    """Aplica la política a las llegadas de generar_llegadas.
+
+    Devuelve ingreso (replicas,), vendidos y rechazados (replicas, n) y la capacidad
+    restante al final de cada réplica.
+    """
+    p = np.asarray(p, dtype=float)
+    n, capacidad = acepta.shape[0], acepta.shape[1] - 1
+    replicas = clases.shape[1]
+    restante = np.full(replicas, capacidad, dtype=np.int64)
+
+    # Índice plano en la tabla: clase * (C+1) + restante; el relleno apunta a una fila de rechazo
+    plano = np.concatenate((acepta, np.zeros((1, capacidad + 1), dtype=bool))).ravel()
+    filas = np.where(clases < 0, n, clases).astype(np.int64) * (capacidad + 1)
+    aceptadas = recorrer_eventos(plano, filas, restante)
+
+    llegadas = np.stack([(clases == j).sum(axis=0) for j in range(n)], axis=1)
+    vendidos = np.stack([((clases == j) & aceptadas).sum(axis=0) for j in range(n)], axis=1)
+    return {
+        "ingreso": vendidos @ p,
+        "vendidos": vendidos,
+        "rechazados": llegadas - vendidos,
+        "restante": restante,
+    }
+
+
+def presupuesto_eventos(mu, eventos, replicas, minimo=1):
+    """Réplicas (entre `minimo` y `replicas`) cuyas llegadas esperadas suman a lo más
+    `eventos`: el costo de una simulación crece con la demanda, no con las réplicas."""
+    por_replica = max(float(np.sum(mu)), 1.0)
+    return int(min(replicas, max(minimo, eventos // por_replica)))
+
+
+def simular_politica(acepta, p, mu, sigma=None, ventanas=None, replicas=10000, semilla=None, lote=1000,
+                     correlacion=None):
+    """generar_llegadas + simular por lotes de réplicas: acota la memoria y mantiene
+    los arreglos de cada lote en caché (unos 7 M de eventos por segundo en un núcleo).
+
+    Para demandas grandes conviene un `lote` menor (ver presupuesto_eventos): la
+    memoria de un lote es proporcional a lote × llegadas por réplica.
+    """
+    semillas = np.random.SeedSequence(semilla).spawn(-(-replicas // lote))
+    partes = []
+    for k, s in enumerate(semillas):
+        clases, _ = generar_llegadas(mu, sigma, ventanas, min(lote, replicas - k * lote), s, correlacion)
+        partes.append(simular(acepta, p, clases))
+    return {c: np.concatenate([r[c] for r in partes]) for c in partes[0]}
+
+
+def simular_ascenso(protecciones, p, mu, sigma, ascenso, C, replicas=10000, semilla=None, correlacion=None):
+    """Límites anidados con llegadas secuenciales (la clase más barata primero) y ascenso.
+
+    Un cliente rechazado de la clase j+1 intenta la clase j con probabilidad
+    ascenso[j-1], y así sucesivamente mientras lo sigan rechazando. Con llegadas
+    secuenciales basta con los conteos de cada réplica: no hace falta recorrer eventos.
+    """
+    rng = np.random.default_rng(semilla)
+    p, mu = np.asarray(p, dtype=float), np.asarray(mu, dtype=float)
+    s = np.asarray(ascenso, dtype=float)
+    y = np.concatenate(([0.0], np.asarray(protecciones, dtype=float)))
+    n = p.size
+
+    demanda = _conteos(mu, sigma, replicas, rng, correlacion)
+    vendidos = np.zeros((replicas, n), dtype=np.int64)
+    restante = np.full(replicas, C, dtype=np.int64)
+
+    def vender(j, solicitudes):
+        # La clase j se vende mientras queden más de y_j lugares (la regla de tabla_limites):
+        # con y_j fraccionario quedan floor(y_j) lugares protegidos
+        cupo = np.clip(restante - np.floor(y[j]), 0, None).astype(np.int64)
+        venta = np.minimum(solicitudes, cupo)
+        restante[:] -= venta
+        vendidos[:, j] += venta
+        return solicitudes - venta
+
+    for j in range(n - 1, -1, -1):
+        rechazo = vender(j, demanda[:, j])
+        for k in range(j, 0, -1):
+            rechazo = vender(k - 1, rng.binomial(rechazo, s[k - 1]))
+    return {
+        "ingreso": vendidos @ p,
+        "vendidos": vendidos,
+        "rechazados": demanda - vendidos,
+        "restante": restante,
+    }
+
+
+def comparar_ascenso(politicas, p, mu, sigma, ascenso, C, replicas, semilla=0, correlacion=None, bloque=5000,
+                     progreso=None):
+    """simular_ascenso para cada política de `politicas` ({nombre: protecciones}), por bloques de réplicas.
+
+    El bloque k usa la semilla (semilla, k) en todas las políticas, así que comparten
+    la demanda simulada. `progreso`, si se da, se llama con la fracción hecha después
+    de cada bloque. Devuelve {nombre: ingreso por réplica}.
+    """
+    tamanos = [min(bloque, replicas - inicio) for inicio in range(0, replicas, bloque)]
+    partes = {nombre: [] for nombre in politicas}
+    for k, n in enumerate(tamanos):
+        for nombre, y in politicas.items():
+            partes[nombre].append(simular_ascenso(y, p, mu, sigma, ascenso, C, n, semilla=(semilla, k),
+                                                  correlacion=correlacion)["ingreso"])
+        if progreso is not None:
+            progreso((k + 1) / len(tamanos))
+    return {nombre: np.concatenate(v) for nombre, v in partes.items()}
@@ -0,0 +1,168 @@
+"""Tabla precalculada de pagina_ingreso_exploracion para C = 100.
+
+Con C = 100 los sliders de la página recorren un dominio entero pequeño (μ_A 5-80,
+σ_A 1-30, μ_B 5-150, σ_B 1-30, b 0-100). El paso de construcción guarda en archivos
+.npy float32 que se abren como memmap:
+
+- sf_A[μ_A, σ_A, b] = P(D_A > C - b) y sf_B[μ_B, σ_B, b] = P(D_B > b),
+- acum_B[μ_B, σ_B, b] = sum_{k=1}^{b} P(D_B > k) y base_A[μ_A, σ_A] = C Φ((C - μ_A) / σ_A).
+
+El ingreso esperado de la página es lineal en los precios,
+
+    I(b) = p_A (base_A - sum_{k<=b} sf_B(k) sf_A(C-k)) + p_B acum_B(b),
+
+así que una consulta son dos filas de la tabla y un producto punto de a lo más 101
+términos, para cualquier par de precios. La tabla completa por (μ_A, σ_A, μ_B, σ_B, b)
+tendría unos 10^9 valores por par de precios; factorizada ocupa unos 4 MB. El b
+óptimo es la regla de Littlewood: el mayor b con P(D_A > C - b) <= p_B / p_A.
+
+    python -m tablas [directorio]
+
+construye la tabla y muestra el reporte de tamaño y latencia de consulta.
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy.stats import norm
+
+from modelo import curva_ingreso
+
+DIRECTORIO = os.environ.get("ASIGNA_TABLAS_DIR", str(Path(__file__).resolve().parent / ".datos" / "tablas"))
+C = 100
+# Los mismos rangos que los sliders de la página con C = 100 (sesion.DEMANDA)
+DOMINIO = {"mu_A": (5, 80), "sigma_A": (1, 30), "mu_B": (5, 150), "sigma_B": (1, 30)}
+
+
+def _malla(nombre):
+    inicio, fin = DOMINIO[nombre]
+    return np.arange(inicio, fin + 1, dtype=float)
+
+
+def _guardar(directorio, nombre, valores):
+    destino = np.lib.format.open_memmap(directorio / f"{nombre}.npy", mode="w+", dtype=np.float32,
+                                        shape=valores.shape)
+    destino[:] = valores
+    destino.flush()
+
+
+def construir(directorio=DIRECTORIO):
+    """Calcula y guarda las cuatro tablas; devuelve el total de bytes escritos."""
+    directorio = Path(directorio)
+    directorio.mkdir(parents=True, exist_ok=True)
+    b = np.arange(C + 1, dtype=float)
+
+    mu_A, sigma_A = np.meshgrid(_malla("mu_A"), _malla("sigma_A"), indexing="ij")
+    _guardar(directorio, "sf_A", norm.sf(C - b, mu_A[..., None], sigma_A[..., None]))
+    _guardar(directorio, "base_A", C * norm.cdf((C - mu_A) / sigma_A))
+
+    mu_B, sigma_B = np.meshgrid(_malla("mu_B"), _malla("sigma_B"), indexing="ij")
+    sf_B = norm.sf(b, mu_B[..., None], sigma_B[..., None])
+    _guardar(directorio, "sf_B", sf_B)
+    # Suma acumulada en float64 antes de bajar a float32
+    _guardar(directorio, "acum_B", np.concatenate((np.zeros(sf_B.shape[:2] + (1,)),
+                                                   np.cumsum(sf_B[..., 1:], axis=-1)), axis=-1))
+    return sum(f.stat().st_size for f in directorio.glob("*.npy"))
+
+
+class TablaExploracion:
+    def __init__(self, directorio=DIRECTORIO):
+        directorio = Path(directorio)
+        # Memmap de solo lectura: el sistema operativo carga y comparte las páginas
+        self._t = {n: np.load(directorio / f"{n}.npy", mmap_mode="r")
+                   for n in ("sf_A", "base_A", "sf_B", "acum_B")}
+
+    @classmethod
+    def abrir(cls, directorio=DIRECTORIO):
+        """La tabla ya construida o None si falta algún archivo."""
+        try:
+            return cls(directorio)
+        except FileNotFoundError:
+            return None
+
+    def contiene(self, C_consulta, mu_A, sigma_A, mu_B, sigma_B):
+        valores = {"mu_A": mu_A, "sigma_A": sigma_A, "mu_B": mu_B, "sigma_B": sigma_B}
+        return C_consulta == C and all(
+            float(v).is_integer() and DOMINIO[n][0] <= v <= DOMINIO[n][1] for n, v in valores.items()
+        )
+
+    def consultar(self, b, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B):
+        """b óptimo, ingreso en b y en el óptimo, y probabilidades de desbordamiento en b."""
+        i_A = (int(mu_A) - DOMINIO["mu_A"][0], int(sigma_A) - DOMINIO["sigma_A"][0])
+        i_B = (int(mu_B) - DOMINIO["mu_B"][0], int(sigma_B) - DOMINIO["sigma_B"][0])
+        return _respuesta(b, self._t["sf_A"][i_A], self._t["sf_B"][i_B], float(self._t["base_A"][i_A]),
+                          self._t["acum_B"][i_B], p_A, p_B)
+
+
+def _respuesta(b, sf_A, sf_B, base, acum, p_A, p_B):
+    def ingreso(k):
+        cruce = np.dot(sf_B[1:k + 1].astype(np.float64), sf_A[1:k + 1])
+        return p_A * (base - cruce) + p_B * float(acum[k])
+
+    # sf_A(C - k) crece con k: el óptimo es cuántos k = 1..C cumplen sf_A <= p_B / p_A
+    b_optimo = int(np.searchsorted(sf_A[1:], p_B / p_A, side="right"))
+    return {
+        "b_optimo": b_optimo,
+        "ingreso": ingreso(b),
+        "ingreso_optimo": ingreso(b_optimo),
+        "prob_B": float(sf_B[b]),
+        "prob_A": float(sf_A[b]),
+    }
+
+
+TABLA = TablaExploracion.abrir()
+
+
+def responder(C_consulta, b, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B):
+    """Lo mismo que TablaExploracion.consultar: por índice si la tabla cubre la consulta,
+    si no con las mismas fórmulas en O(C)."""
+    if TABLA is not None and TABLA.contiene(C_consulta, mu_A, sigma_A, mu_B, sigma_B):
+        return TABLA.consultar(b, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B)
+    k = np.arange(C_consulta + 1)
+    sf_B = norm.sf(k, mu_B, sigma_B)
+    acum = np.concatenate(([0.0], np.cumsum(sf_B[1:])))
+    base = C_consulta * norm.cdf((C_consulta - mu_A) / sigma_A)
+    return _respuesta(b, norm.sf(C_consulta - k, mu_A, sigma_A), sf_B, base, acum, p_A, p_B)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye la tabla precalculada de la página de exploración")
+    parser.add_argument("directorio", nargs="?", default=DIRECTORIO)
+    parser.add_argument("--consultas", type=int, default=10000)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    total = construir(args.directorio)
+    print(f"Construcción: {time.perf_counter() - inicio:.2f} s, {total / 2**20:.2f} MB en {args.directorio}")
+
+    tabla = TablaExploracion(args.directorio)
+    for nombre, arreglo in tabla._t.items():
+        print(f"  {nombre:<7} {str(arreglo.shape):<16} {arreglo.nbytes / 2**20:6.2f} MB")
+
+    rng = np.random.default_rng(0)
+    consultas = []
+    for _ in range(args.consultas):
+        mu_A, sigma_A, mu_B, sigma_B = (float(rng.integers(a, f + 1)) for a, f in DOMINIO.values())
+        p_A, p_B = (float(v) for v in rng.integers(1, 101, 2))
+        consultas.append((int(rng.integers(0, C + 1)), mu_A, sigma_A, p_A, mu_B, sigma_B, p_B))
+    inicio = time.perf_counter()
+    for q in consultas:
+        tabla.consultar(*q)
+    latencia = (time.perf_counter() - inicio) / len(consultas)
+    print(f"Latencia de consulta: {1e6 * latencia:.1f} µs en promedio ({len(consultas)} consultas)")
+
+    # Contraste con la curva exacta de la página (b = 0..C) en algunas consultas
+    error, optimos = 0.0, 0
+    for b, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B in consultas[:200]:
+        curva = curva_ingreso.__wrapped__(np.arange(C + 1), C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B)
+        r = tabla.consultar(b, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B)
+        error = max(error, abs(r["ingreso"] - curva[b]) / max(abs(curva[b]), 1.0))
+        optimos += abs(r["ingreso_optimo"] - curva.max()) <= 1e-5 * max(abs(curva.max()), 1.0)
+    print(f"Error relativo máximo del ingreso frente a modelo.curva_ingreso: {error:.1e}")
+    print(f"b óptimo con el ingreso máximo de la curva: {optimos} de 200")
+
+
+if __name__ == "__main__":
+    main()
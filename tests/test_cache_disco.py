@@ -0,0 +1,18 @@
+from cache_disco import CacheDisco
+
+
+def test_none_es_un_resultado(tmp_path):
+    disco = CacheDisco(tmp_path / "c.sqlite", 2**20, 3600)
+    llamadas = []
+    for _ in range(2):
+        assert disco.obtener("k", lambda: llamadas.append(1)) is None
+    assert len(llamadas) == 1
+
+
+def test_otra_version_no_sirve_resultados_viejos(tmp_path):
+    ruta = tmp_path / "c.sqlite"
+    CacheDisco(ruta, 2**20, 3600, version="v1").escribir("k", 1.0)
+    assert CacheDisco(ruta, 2**20, 3600, version="v1").leer("k") == 1.0
+    nueva = CacheDisco(ruta, 2**20, 3600, version="v2")
+    assert nueva.leer("k") is None
+    assert nueva.metricas()["entradas"] == 0
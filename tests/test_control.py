@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from control import MotorReservas
+from simulador import tabla_limites
+
+
+def test_mismos_limites_que_el_simulador():
+    protecciones, C = [33.4, 70.0], 100
+    acepta = tabla_limites(protecciones, C)
+    motor = MotorReservas([C], protecciones)
+    for clase in range(3):
+        # Lugares que la política vende a la clase empezando con la salida vacía
+        assert motor.disponibles(0)[clase] == np.count_nonzero(acepta[clase])
+
+
+def test_nivel_infinito_cierra_la_clase():
+    motor = MotorReservas([50], [10.0, np.inf])
+    assert motor.disponibles(0) == [50, 40, 0]
+    assert not motor.solicitar(0, 2)
+
+
+def test_validacion():
+    motor = MotorReservas([10], [3.0])
+    with pytest.raises(ValueError):
+        motor.solicitar(0, 1, personas=0)
+    assert motor.solicitar(0, 1, personas=2)
+    with pytest.raises(ValueError):
+        motor.cancelar(0, personas=3)
+    motor.cancelar(0, personas=2)
+    assert motor.restante(0) == 10
+
+
+def test_indices_fuera_de_rango():
+    motor = MotorReservas([10, 20], [3.0])
+    for salida in (-1, 2):
+        with pytest.raises(IndexError):
+            motor.solicitar(salida, 0)
+        with pytest.raises(IndexError):
+            motor.cancelar(salida)
+        with pytest.raises(IndexError):
+            motor.disponibles(salida)
+    for clase in (-1, 2):
+        with pytest.raises(IndexError):
+            motor.solicitar(0, clase)
+    assert motor.restante(0) == 10 and motor.restante(1) == 20
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from scipy import integrate
+from scipy.stats import norm
+
+from correlacion import ingreso_correlacionado, matriz_correlacion
+
+C, MU_A, SIGMA_A, P_A, MU_B, SIGMA_B, P_B = 100, 25.0, 8.0, 5.0, 60.0, 8.0, 2.0
+
+
+def _vendidos(r, mu, sigma):
+    # E[min(max(D, 0), r)] = integral_0^r P(D > t) dt
+    return integrate.quad(lambda t: norm.sf(t, mu, sigma), 0, r)[0] if r > 0 else 0.0
+
+
+def _independientes(b):
+    # Con rho = 0: se condiciona en las ventas de B, S_B = min(max(D_B, 0), b)
+    def ingreso(s):
+        return P_B * s + P_A * _vendidos(C - s, MU_A, SIGMA_A)
+    interior = integrate.quad(lambda s: norm.pdf(s, MU_B, SIGMA_B) * ingreso(s), 0, b)[0]
+    return interior + norm.cdf(0, MU_B, SIGMA_B) * ingreso(0) + norm.sf(b, MU_B, SIGMA_B) * ingreso(b)
+
+
+def test_sin_correlacion_igual_a_la_integral():
+    b, ingreso = ingreso_correlacionado.__wrapped__(C, MU_A, SIGMA_A, P_A, MU_B, SIGMA_B, P_B, 0.0)
+    for i in (20, 50, 65, 90):
+        assert ingreso[i] == pytest.approx(_independientes(b[i]), rel=1e-4)
+
+
+@pytest.mark.parametrize("rho", [-0.4, 0.6])
+def test_con_correlacion_igual_a_monte_carlo(rho):
+    b, ingreso = ingreso_correlacionado.__wrapped__(C, MU_A, SIGMA_A, P_A, MU_B, SIGMA_B, P_B, rho)
+    rng = np.random.default_rng(0)
+    d_A, d_B = np.maximum(rng.multivariate_normal(
+        [MU_A, MU_B], np.outer([SIGMA_A, SIGMA_B], [SIGMA_A, SIGMA_B]) * matriz_correlacion(rho), 1_000_000
+    ), 0.0).T
+    for i in (20, 65, 90):
+        vendidos_B = np.minimum(d_B, b[i])
+        r = P_B * vendidos_B + P_A * np.minimum(d_A, C - vendidos_B)
+        assert abs(ingreso[i] - r.mean()) < 4 * r.std() / np.sqrt(r.size)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from dinamica import resolver, tasas_por_ventanas
+from modelo import valor_estatico
+from simulador import ventanas_secuenciales
+
+MU, P = [20.0, 40.0, 60.0], [300.0, 150.0, 80.0]
+
+
+def _fuerza_bruta(p, tasas, C):
+    # V_t(x) estado por estado: en cada llegada se acepta solo si conviene
+    valor = np.zeros(C + 1)
+    for t in range(len(tasas) - 1, -1, -1):
+        nuevo = valor.copy()
+        for x in range(1, C + 1):
+            for j, lam in enumerate(tasas[t]):
+                nuevo[x] += lam * max(p[j] + valor[x - 1] - valor[x], 0.0)
+        valor = nuevo
+    return valor
+
+
+def test_igual_a_la_recursion_estado_por_estado():
+    rng = np.random.default_rng(0)
+    tasas = rng.dirichlet(np.ones(4), 60)[:, :3]  # la cuarta columna es "no llega nadie"
+    r = resolver(P, tasas, 15)
+    np.testing.assert_allclose(r["valor"], _fuerza_bruta(P, tasas, 15), rtol=1e-12)
+    # Umbral: se acepta la clase j con x lugares si x > umbral, es decir si p_j >= dV(x)
+    dv = np.diff(_fuerza_bruta(P, tasas[1:], 15))
+    for j in range(3):
+        assert r["umbrales"][0, j] == np.count_nonzero(dv > P[j])
+
+
+def test_llegadas_secuenciales_dan_los_niveles_estaticos():
+    C, T = 80, 2000
+    umbrales = resolver(P, tasas_por_ventanas(MU, T, ventanas_secuenciales(3)), C)["umbrales"]
+    # Al inicio de la venta de cada clase (la más barata llega primero) el umbral es su nivel
+    y_1, y_2 = valor_estatico.__wrapped__(MU, np.sqrt(MU), P, C)["protecciones"]
+    assert abs(umbrales[0, 2] - y_2) <= 1
+    assert abs(umbrales[T // 3, 1] - y_1) <= 1
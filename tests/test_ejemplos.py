@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from ejemplos import EJEMPLOS, _resolver, rellenar, valores
+
+
+@pytest.mark.parametrize("nombre", EJEMPLOS)
+def test_resultados_esperados(nombre):
+    # Sin caché: el motor actual, no un resultado guardado
+    e = EJEMPLOS[nombre]
+    r = _resolver.__wrapped__(e["mu"], e["sigma"], e["p"])
+    for clave, esperado in e["esperado"].items():
+        assert np.round(r[clave]).astype(int).tolist() == esperado, clave
+
+
+def test_mismo_formato_en_todo_el_texto():
+    # Con dos clases el nivel de Littlewood y el de EMSR-a son el mismo número
+    v = valores("editorial")
+    assert v["y1"] == v["y_emsr_a"] == "7,620"
+    assert rellenar("«y1» y «y_emsr_a»", "editorial") == "7,620 y 7,620"
@@ -0,0 +1,29 @@
+import numpy as np
+
+from eleccion import conjuntos, eficientes, ingreso_y_venta, resolver_eleccion
+
+P, V, V0 = [400.0, 300.0, 220.0, 150.0], [0.4, 0.8, 1.1, 1.6], 1.0
+
+
+def _fuerza_bruta(p, v, v0, llegadas, C):
+    # DP con elección sobre los 2^n conjuntos de oferta, sin conjuntos eficientes
+    R, Q = ingreso_y_venta(p, v, v0, conjuntos(len(p)))
+    valor = np.zeros(C + 1)
+    for lam in llegadas[::-1]:
+        dv = np.diff(valor)
+        # Con x >= 1 lugares se elige el mejor conjunto; sin lugares no se vende (R = Q = 0)
+        valor[1:] = valor[1:] + lam * np.max(R[None, :] - Q[None, :] * dv[:, None], axis=1)
+    return valor
+
+
+def test_dp_con_eleccion_igual_a_fuerza_bruta():
+    llegadas = np.full(200, 0.3)
+    r = resolver_eleccion(P, V, V0, llegadas, 25)
+    np.testing.assert_allclose(r["valor"], _fuerza_bruta(P, V, V0, llegadas, 25), rtol=1e-10)
+
+
+def test_eficientes_alcanzan_el_maximo_de_todos_los_conjuntos():
+    R, Q = ingreso_y_venta(P, V, V0, conjuntos(len(P)))
+    e = eficientes(P, V, V0)
+    for costo in np.linspace(0, 450, 46):
+        assert np.max(e["R"] - e["Q"] * costo, initial=0.0) >= np.max(R - Q * costo) - 1e-12
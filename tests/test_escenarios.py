@@ -0,0 +1,19 @@
+from escenarios import BibliotecaEscenarios
+
+
+def test_buscar_por_prefijo_con_indice(tmp_path):
+    biblioteca = BibliotecaEscenarios(tmp_path / "escenarios.sqlite")
+    biblioteca.guardar_varios([
+        (nombre, [30, 100], [10, 20], [1.0, 0.4])
+        for nombre in ("Vuelo 100%", "vuelo 200", "Editorial vuelo", "Vuelo_3")
+    ])
+    assert [f[1] for f in biblioteca.buscar("vuelo")] == ["Vuelo 100%", "vuelo 200", "Vuelo_3"]
+    assert [f[1] for f in biblioteca.buscar("Vuelo 100%")] == ["Vuelo 100%"]
+    assert [f[1] for f in biblioteca.buscar("vuelo_")] == ["Vuelo_3"]
+    assert len(biblioteca.buscar("", limite=2)) == 2
+
+    plan = biblioteca._db().execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM escenarios WHERE nombre LIKE ? ESCAPE '\\' "
+        "ORDER BY nombre COLLATE NOCASE", ("vu%",)
+    ).fetchall()
+    assert "escenarios_nombre" in str(plan) and "SEARCH" in str(plan)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from modelo import costo_desplazamiento, tabla_pmf, valor_estatico
+
+MU, SIGMA, P = [30.0, 60.0, 120.0], [10.0, 15.0, 30.0], [300.0, 150.0, 80.0]
+
+
+def _valor(C):
+    return valor_estatico.__wrapped__(MU, SIGMA, P, C)["dv"][1:].sum()
+
+
+def test_costo_desplazamiento_es_diferencia_de_valores():
+    C = 150
+    costo = costo_desplazamiento.__wrapped__(MU, SIGMA, P, C)
+    esperado = [_valor(C) - _valor(C - k) if k < C else _valor(C) for k in range(C + 1)]
+    np.testing.assert_allclose(costo, esperado, atol=1e-8)
+
+
+@pytest.mark.parametrize("C", [150, 20_000])
+def test_costo_desplazamiento_no_negativo_ni_decreciente(C):
+    # Con C = 20000 la demanda cabe de sobra y los valores marginales son ruido de la FFT
+    costo = costo_desplazamiento.__wrapped__(MU, SIGMA, P, C)
+    assert costo[0] == 0.0
+    assert (costo >= 0).all() and (np.diff(costo) >= 0).all()
+
+
+def _fuerza_bruta(mu, sigma, p, C, protecciones=None):
+    # V_j(x) probando cada nivel de protección y (o el dado) con la demanda discretizada
+    pmf = tabla_pmf.__wrapped__(mu, sigma, C)
+    valor, niveles = np.zeros(C + 1), []
+    for j in range(len(p)):
+        nuevo, mejores = np.zeros(C + 1), []
+        for x in range(C + 1):
+            candidatos = range(x + 1) if j and protecciones is None else [min(protecciones[j - 1], x) if j else 0]
+            v = [sum(pmf[j, d] * (p[j] * min(d, x - y) + valor[x - min(d, x - y)]) for d in range(C + 1))
+                 for y in candidatos]
+            nuevo[x] = max(v)
+            mejores.append(candidatos[int(np.argmax(v))])
+        if j:
+            niveles.append(mejores[C])
+        valor = nuevo
+    return valor, niveles
+
+
+def test_valor_estatico_igual_a_fuerza_bruta():
+    # Demanda total cerca de la capacidad: ningún nivel queda en 0 ni en C
+    mu, sigma, p, C = [10.0, 20.0, 40.0], [4.0, 6.0, 10.0], [300.0, 150.0, 80.0], 50
+    r = valor_estatico.__wrapped__(mu, sigma, p, C)
+    valor, niveles = _fuerza_bruta(mu, sigma, p, C)
+    assert all(0 < y < C for y in niveles)
+    np.testing.assert_allclose(np.concatenate(([0.0], np.cumsum(r["dv"][1:]))), valor, atol=1e-8)
+    assert r["protecciones"].tolist() == niveles
+
+    # Con niveles dados evalúa esa política
+    r = valor_estatico.__wrapped__(mu, sigma, p, C, protecciones=[5, 20])
+    np.testing.assert_allclose(r["dv"][1:].sum(), _fuerza_bruta(mu, sigma, p, C, [5, 20])[0][C], atol=1e-8)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from riesgo import distribucion_ingreso, optimo_ajustado
+
+
+def _monte_carlo(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B, b, n=400_000, semilla=0):
+    # Demandas normales redondeadas y recortadas a [0, C], como la discretización del motor
+    rng = np.random.default_rng(semilla)
+    d_A = np.clip(np.rint(rng.normal(mu_A, sigma_A, n)), 0, C)
+    d_B = np.clip(np.rint(rng.normal(mu_B, sigma_B, n)), 0, C)
+    vendidos_B = np.minimum(d_B, b)
+    return np.sort(p_B * vendidos_B + p_A * np.minimum(d_A, C - vendidos_B))
+
+
+@pytest.mark.parametrize("escala", [1, 20])  # con C = 2000 la malla de demanda va en pasos de 2
+@pytest.mark.parametrize("fraccion_b", [0.3, 0.65, 0.9])
+def test_igual_a_monte_carlo(escala, fraccion_b):
+    C, mu_A, sigma_A, mu_B, sigma_B = (escala * v for v in (100, 25, 8, 60, 8))
+    p_A, p_B = 5.0, 2.0
+    d = distribucion_ingreso.__wrapped__(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B)
+    i = int(round(fraccion_b * (d["b"].size - 1)))
+    r = _monte_carlo(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B, d["b"][i])
+
+    error = r.std() / np.sqrt(r.size)
+    assert abs(d["media"][i] - r.mean()) < 4 * error
+    assert d["desviacion"][i] == pytest.approx(r.std(), rel=5e-3)
+    # El cuantil y el CVaR se leen de una malla de ingresos: se tolera un par de pasos
+    tolerancia = 2 * p_A * C / 1023
+    assert abs(d["cuantil"][i] - np.quantile(r, 0.05)) < tolerancia
+    assert abs(d["cvar"][i] - r[:r.size // 20].mean()) < tolerancia
+
+
+def test_optimo_ajustado():
+    d = distribucion_ingreso.__wrapped__(100, 25, 8, 5.0, 60, 8, 2.0)
+    assert optimo_ajustado(d, 0.0) == np.argmax(d["media"])
+    assert optimo_ajustado(d, 1.0) == np.argmax(d["cvar"])
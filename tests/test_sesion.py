@@ -0,0 +1,45 @@
+import json
+
+import streamlit as st
+
+import precalentar
+import sesion
+import tablas
+from recursos import CACHE
+from sesion import DEMANDA, Escenario, ORDEN, por_defecto
+
+
+def test_escenarios_comparten_las_curvas():
+    # El precalentamiento arma su propio Escenario; las páginas deben encontrar sus arreglos
+    a, b = Escenario(100, *por_defecto(100)), Escenario(100, *por_defecto(100))
+    assert a.x_b is b.x_b and a.sf_A is b.sf_A and a.ingresos is b.ingresos
+
+
+def test_valores_por_defecto_al_dia():
+    assert tablas.DOMINIO == {n: v[:2] for n, v in DEMANDA.items()}
+    (ingreso,) = json.loads(precalentar.ESCENARIOS.read_text(encoding="utf-8"))["ingreso"]
+    defecto = dict(zip(ORDEN, por_defecto(ingreso["C"])))
+    assert ingreso == {"C": ingreso["C"], **{n: v for n, v in defecto.items() if n != "b"}}
+
+
+def test_cambiar_capacidad_reescala():
+    st.session_state.clear()
+    sesion.guardar("mu_A", 30)
+    sesion.guardar("p_A", 7.0)
+    sesion.cambiar_capacidad(1000)
+    assert sesion.capacidad() == 1000
+    # b no se había fijado: sigue siendo el de por defecto de la nueva C
+    assert [sesion.valor(n, 1000) for n in ("mu_A", "p_A", "b")] == [300, 7.0, 650]
+    sesion.cambiar_capacidad(10)
+    assert sesion.valor("mu_A", 10) == 3
+    st.session_state.clear()
+
+
+def test_precalentar_ingreso_llena_lo_que_pide_la_pagina():
+    C, b, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B = (100,) + por_defecto(100)
+    CACHE.limpiar()
+    # Una curva por escenario, no una por cada b = 0..C
+    assert precalentar.precalentar_ingreso(C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B) == 1
+    fallos = CACHE.fallos
+    Escenario(C, b, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B).ingresos
+    assert CACHE.fallos == fallos
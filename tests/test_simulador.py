@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from modelo import emsr_b
+from simulador import (
+    generar_llegadas, presupuesto_eventos, simular, simular_ascenso, tabla_limites, ventanas_secuenciales,
+)
+
+MU, SIGMA, P = [275.0, 525.0, 1000.0], [75.0, 50.0, 300.0], [250.0, 200.0, 100.0]
+
+
+@pytest.mark.parametrize("protecciones", [emsr_b(MU, SIGMA, P), [294.0, 809.0], [33.4, 66.6]])
+def test_ascenso_sin_ascenso_es_la_politica_de_limites(protecciones):
+    # Con la misma semilla las dos funciones sacan los mismos conteos de demanda
+    C, replicas = 1000, 500
+    r = simular_ascenso(protecciones, P, MU, SIGMA, [0.0, 0.0], C, replicas, semilla=3)
+    clases, _ = generar_llegadas(MU, SIGMA, ventanas_secuenciales(3), replicas, semilla=3)
+    esperado = simular(tabla_limites(protecciones, C), P, clases)
+    np.testing.assert_array_equal(r["vendidos"], esperado["vendidos"])
+
+
+def test_nivel_fraccionario_protege_floor():
+    r = simular_ascenso([33.4], [1.0, 0.4], [0.0, 200.0], None, [0.0], 100, 1, semilla=0)
+    assert r["vendidos"][0, 1] == np.count_nonzero(tabla_limites([33.4], 100)[1]) == 67
+
+
+def test_presupuesto_eventos():
+    assert presupuesto_eventos([25, 60], 4_000_000, 2000, 20) == 2000
+    assert presupuesto_eventos([250_000, 600_000], 4_000_000, 2000, 20) == 20
+    assert presupuesto_eventos([2500, 6000], 4_000_000, 2000, 20) == 470
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import tablas
+from modelo import curva_ingreso
+
+
+def _consultas(n, C, semilla=0):
+    rng = np.random.default_rng(semilla)
+    for _ in range(n):
+        mu_A, sigma_A, mu_B, sigma_B = (float(rng.integers(a, f + 1)) for a, f in tablas.DOMINIO.values())
+        p_B, p_A = (float(v) for v in np.sort(rng.integers(1, 101, 2)))
+        yield int(rng.integers(0, C + 1)), mu_A, sigma_A, p_A, mu_B, sigma_B, p_B
+
+
+def _revisar(r, C, b, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B, rel):
+    curva = curva_ingreso.__wrapped__(np.arange(C + 1), C, mu_A, sigma_A, p_A, mu_B, sigma_B, p_B)
+    assert r["ingreso"] == pytest.approx(curva[b], rel=rel, abs=rel)
+    # El b óptimo de la regla de Littlewood da el máximo de la curva
+    assert r["ingreso_optimo"] == pytest.approx(curva.max(), rel=rel, abs=rel)
+
+
+@pytest.fixture(scope="module")
+def tabla(tmp_path_factory):
+    directorio = tmp_path_factory.mktemp("tablas")
+    tablas.construir(directorio)
+    return tablas.TablaExploracion(directorio)
+
+
+def test_consulta_igual_a_la_curva(tabla):
+    for q in _consultas(200, tablas.C):
+        assert tabla.contiene(tablas.C, *q[1:3], *q[4:6])
+        # Las tablas van en float32
+        _revisar(tabla.consultar(*q), tablas.C, *q, rel=1e-5)
+
+
+def test_formulas_sin_tabla_igual_a_la_curva():
+    # C = 150 no está en la tabla: responde con las mismas fórmulas en O(C)
+    for q in _consultas(50, 150, semilla=1):
+        _revisar(tablas.responder(150, *q), 150, *q, rel=1e-9)
@@ -0,0 +1,40 @@
+import gc
+import time
+
+import pytest
+import streamlit as st
+
+import trabajos
+
+
+def lento(n, progreso):
+    for i in range(n):
+        progreso(i / n)
+        time.sleep(0.01)
+    return n
+
+
+@pytest.fixture(autouse=True)
+def sesion_limpia():
+    st.session_state.clear()
+    yield
+    st.session_state.clear()
+
+
+def test_soltar_cancela_una_sola_vez():
+    trabajo = trabajos.lanzar("x", lento, 100)
+    trabajos.soltar("x")
+    trabajos.soltar("x")
+    assert trabajo.cancelado.is_set()
+    # Volver a pedir lo mismo empieza un trabajo nuevo que sí termina
+    nuevo = trabajos.lanzar("x", lento, 100)
+    assert nuevo is not trabajo
+    assert nuevo.esperar(30) and nuevo.resultado() == 100
+
+
+def test_sesion_cerrada_cancela():
+    trabajo = trabajos.lanzar("x", lento, 501)
+    st.session_state.clear()  # Streamlit descarta la sesión sin llamar a soltar
+    gc.collect()
+    with pytest.raises(trabajos.Cancelado):
+        trabajo.futuro.result(timeout=30)
@@ -0,0 +1,149 @@
+import os
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import streamlit as st
+
+from recursos import CACHE, clave_canonica
+
+
+# Trabajos en segundo plano para los cálculos largos de las páginas (simulaciones,
+# programación dinámica, barridos). El hilo del script solo lanza el trabajo y dibuja
+# su avance; el cálculo corre en un pool de hilos compartido por todas las sesiones
+# (numpy y scipy sueltan el GIL en los cálculos pesados).
+#
+# - Un trabajo se identifica por la función y sus argumentos. Si un rerun u otra sesión
+#   pide lo mismo mientras corre, se une al trabajo en curso; al terminar, el resultado
+#   queda en recursos.CACHE y volver a pedirlo es un acierto de caché.
+# - Cada sesión tiene a lo más un trabajo por nombre en st.session_state. Si los
+#   argumentos cambian (se movió un slider) o la página lo suelta (soltar), el trabajo
+#   anterior se abandona y, si ninguna otra sesión lo espera, se cancela: no empieza si
+#   seguía en la cola, y si ya corría se detiene en su siguiente llamada a `progreso`.
+# - El trabajo guarda referencias débiles a las sesiones que lo esperan: si se cierra la
+#   pestaña, Streamlit descarta la sesión sin avisar y el trabajo se cancela igual.
+HILOS = int(os.environ.get("ASIGNA_TRABAJOS_HILOS", min(4, os.cpu_count() or 1)))
+ESPERA_S = 0.3  # lo que un rerun espera al trabajo antes de mostrar la barra de avance
+_FALTA = object()
+
+
+class Cancelado(Exception):
+    """El trabajo ya no tiene ninguna sesión esperándolo."""
+
+
+class Trabajo:
+    def __init__(self, clave):
+        self.clave = clave
+        self.avance = 0.0
+        self.sesiones = weakref.WeakSet()  # sesiones que esperan el resultado
+        self.cancelado = threading.Event()
+        self.futuro = Future()
+
+    def progreso(self, fraccion):
+        # La función del trabajo lo llama entre bloques: anota el avance y corta si ya nadie lo espera
+        with _lock:
+            if not self.sesiones:
+                self.cancelado.set()
+        if self.cancelado.is_set():
+            raise Cancelado
+        self.avance = min(max(float(fraccion), 0.0), 1.0)
+
+    def listo(self):
+        return self.futuro.done()
+
+    def esperar(self, segundos):
+        """Espera a lo más `segundos` a que termine; los trabajos cortos no llegan a mostrar la barra."""
+        wait([self.futuro], timeout=segundos)
+        return self.listo()
+
+    def resultado(self):
+        return self.futuro.result()
+
+
+_POOL = ThreadPoolExecutor(HILOS, thread_name_prefix="trabajo")
+_lock = threading.Lock()
+_en_curso = {}  # clave -> Trabajo que todavía no termina
+
+
+class _Sesion:
+    """Marca de una sesión: vive en su st.session_state y muere con ella."""
+
+
+def _sesion():
+    return st.session_state.setdefault("trabajos_sesion", _Sesion())
+
+
+def _ejecutar(trabajo, funcion, args, kwargs):
+    try:
+        trabajo.progreso(0.0)  # no empieza si lo abandonaron mientras esperaba en la cola
+        return CACHE.obtener(trabajo.clave, lambda: funcion(*args, progreso=trabajo.progreso, **kwargs))
+    finally:
+        trabajo.avance = 1.0
+        with _lock:
+            if _en_curso.get(trabajo.clave) is trabajo:
+                del _en_curso[trabajo.clave]
+
+
+def _soltar(trabajo, sesion):
+    with _lock:
+        # Soltar dos veces no cuenta doble: la sesión sale del conjunto una sola vez
+        trabajo.sesiones.discard(sesion)
+        if trabajo.sesiones or trabajo.futuro.done():
+            return
+        trabajo.cancelado.set()
+        trabajo.futuro.cancel()
+        # Quien vuelva a pedir estos argumentos empieza un trabajo nuevo
+        if _en_curso.get(trabajo.clave) is trabajo:
+            del _en_curso[trabajo.clave]
+
+
+def lanzar(nombre, funcion, *args, **kwargs):
+    """Trabajo `nombre` de la sesión para funcion(*args, **kwargs), en segundo plano.
+
+    `funcion` recibe además `progreso`, que debe llamar con la fracción hecha (0 a 1)
+    entre bloques de trabajo. Los argumentos forman la clave del trabajo (como en
+    @compartido). Si la sesión ya tenía un trabajo `nombre` con otros argumentos, se
+    abandona. La sesión lo espera hasta que llame a soltar(nombre) o se cierre.
+    """
+    clave = f"trabajo:{funcion.__module__}.{funcion.__qualname__}:" + clave_canonica(*args, **kwargs)
+    sesion = _sesion()
+    anterior = st.session_state.get(f"trabajo_{nombre}")
+    if anterior is not None and anterior.clave == clave and not anterior.cancelado.is_set():
+        return anterior
+    if anterior is not None:
+        _soltar(anterior, sesion)
+
+    with _lock:
+        trabajo = _en_curso.get(clave)
+        if trabajo is None or trabajo.cancelado.is_set():
+            trabajo = Trabajo(clave)
+            valor = CACHE.buscar(clave, _FALTA)
+            if valor is _FALTA:
+                _en_curso[clave] = trabajo
+                trabajo.futuro = _POOL.submit(_ejecutar, trabajo, funcion, args, kwargs)
+            else:
+                trabajo.avance = 1.0
+                trabajo.futuro.set_result(valor)
+        trabajo.sesiones.add(sesion)
+    st.session_state[f"trabajo_{nombre}"] = trabajo
+    return trabajo
+
+
+def soltar(nombre):
+    """La sesión deja de esperar su trabajo `nombre` (se apagó el control o se cambió de
+    página); si nadie más lo espera, se cancela."""
+    trabajo = st.session_state.pop(f"trabajo_{nombre}", None)
+    if trabajo is not None:
+        _soltar(trabajo, _sesion())
+
+
+def mostrar_avance(trabajo, texto, cada=0.5):
+    """Barra de avance que se actualiza cada `cada` segundos; al terminar el trabajo
+    vuelve a ejecutar la página para que dibuje el resultado."""
+    @st.fragment(run_every=cada)
+    def avance():
+        if trabajo.listo():
+            st.rerun()
+        st.progress(trabajo.avance, text=texto)
+
+    avance()